@@ -15,17 +15,15 @@ For new developers:
 
 import os
 import json
-from anthropic import Anthropic
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
 
-# MCP imports are optional - only needed if using MCP server
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-    MCP_AVAILABLE = True
-except ImportError:
-    MCP_AVAILABLE = False
-    print("⚠ MCP not available. Install with: pip install mcp")
+# The anthropic and mcp packages are slow to import, so they are imported
+# where they are used: create_llm_client() and agent/mcp_client.py (only
+# when AGENT_TOOL_BACKEND=mcp). MCP is optional: pip install mcp
 
 
 # ============================================================================
@@ -61,8 +59,15 @@ def load_config():
 # ============================================================================
 
 def create_llm_client(api_key):
-    """Create a client to communicate with Claude LLM."""
-    return Anthropic(api_key=api_key)
+    """
+    Create a client to communicate with Claude LLM.
+    
+    Set LLM_BASE_URL to talk to another endpoint, e.g. the local stand-in
+    batch server (python -m uvicorn api.fake_batch_server:app --port 5010).
+    """
+    from anthropic import Anthropic
+    
+    return Anthropic(api_key=api_key, base_url=os.environ.get("LLM_BASE_URL") or None)
 
 
 # ============================================================================
@@ -74,92 +79,512 @@ async def get_tools_from_mcp_server():
     Connect to the MCP server and get the list of available tools.
     
     The MCP server runs as a separate process and exposes tools that
-    the LLM can use to answer questions.
-    """
-    # Path to the MCP server script
-    server_path = os.path.join(os.path.dirname(__file__), "..", "mcp_server", "server.py")
-    
-    # Configure how to start the MCP server
-    server_params = StdioServerParameters(
-        command="python",
-        args=[server_path],
-        env=None
-    )
-    
-    # Connect to the server and get tools
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            
-            # Get the list of tools from the server
-            tools_response = await session.list_tools()
-            
-            # Convert MCP tools to Claude-compatible format
-            tools = []
-            for tool in tools_response.tools:
-                tools.append({
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema
-                })
-            
-            return tools, session
+    the LLM can use to answer questions. The process and its session are
+    kept open by a shared MCPClientManager (see agent/mcp_client.py), so
+    repeated calls reuse the same warm server and cached tool list.
+    
+    Returns:
+        tuple: (list of Claude-format tool definitions, the MCPClientManager;
+               its call_tool() can be used as the tool handler)
+    """
+    from agent.mcp_client import get_shared_mcp_manager
+    
+    # Starting the server blocks, so keep it off the caller's event loop
+    manager = await asyncio.to_thread(get_shared_mcp_manager)
+    return manager.get_tools(), manager
 
 
 # ============================================================================
 # STEP 4: Run the Agent (Talk to User)
 # ============================================================================
 
-def run_agent_conversation(llm_client, model, tools, user_message, tool_handler=None):
+# How many tool calls from one turn may run at the same time, and how long
+# (seconds) a single call may take before Claude is told it timed out
+MAX_PARALLEL_TOOLS = int(os.environ.get("AGENT_MAX_PARALLEL_TOOLS", 8))
+TOOL_TIMEOUT = float(os.environ.get("AGENT_TOOL_TIMEOUT", 30))
+
+
+def _timed_tool_call(tool_handler, tool_name, tool_input):
+    """Run one tool call and return (result, seconds taken, error flag)."""
+    start = time.perf_counter()
+    try:
+        result = tool_handler(tool_name, tool_input)
+        failed = False
+    except Exception as e:
+        result = f"Error executing {tool_name}: {str(e)}"
+        failed = True
+    return result, time.perf_counter() - start, failed
+
+
+def execute_tool_calls(tool_blocks, tool_handler=None, max_workers=MAX_PARALLEL_TOOLS, timeout=TOOL_TIMEOUT,
+                       verbose=True):
     """
-    Main agent loop: Send user message to LLM, handle tool calls, return answer.
+    Execute all tool calls from one assistant turn concurrently.
+    
+    Each call runs on a bounded thread pool, so a question that needs
+    several lookups (e.g. "compare INR, JPY and GBP") waits for the slowest
+    call instead of the sum of all of them.
     
     Args:
-        llm_client: The Anthropic client instance
-        model: Model name to use
-        tools: List of tool definitions
-        user_message: The user's question
+        tool_blocks: The tool_use blocks from Claude's response, in order
         tool_handler: Function to execute tools (optional)
+        max_workers: Maximum number of tools running at the same time
+        timeout: Seconds a single call may take before it is reported as timed out
+        verbose: Print each call and its outcome (batch mode turns this off)
     
-    How it works:
-    1. Send user question to Claude
-    2. Claude decides if it needs to use tools
-    3. If yes, we execute the tools and send results back to Claude
-    4. Claude uses tool results to formulate final answer
-    5. Return answer to user
+    Returns:
+        tuple: (tool_result blocks in the same order as tool_blocks,
+                list of per-call timings)
     """
-    # Start conversation with user's message
-    messages = [{"role": "user", "content": user_message}]
+    if not tool_blocks:
+        return [], []
     
-    print(f"\n{'='*70}")
-    print(f"User: {user_message}")
-    print(f"{'='*70}\n")
+    if verbose:
+        for block in tool_blocks:
+            print(f"🔧 Using tool: {block.name}")
+            print(f"   Input: {json.dumps(block.input, indent=2)}")
+    
+    if tool_handler is None:
+        outcomes = [({"note": "No tool handler provided"}, 0.0, False) for _ in tool_blocks]
+    else:
+        workers = max(1, min(max_workers, len(tool_blocks)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-tool")
+        submitted_at = time.perf_counter()
+        futures = [
+            executor.submit(_timed_tool_call, tool_handler, block.name, block.input)
+            for block in tool_blocks
+        ]
+        
+        outcomes = []
+        for position, (block, future) in enumerate(zip(tool_blocks, futures)):
+            # Calls beyond the pool size start only once earlier ones finish,
+            # so each wave of calls gets its own timeout window
+            deadline = submitted_at + timeout * (position // workers + 1)
+            try:
+                outcomes.append(future.result(timeout=max(0.0, deadline - time.perf_counter())))
+            except FutureTimeoutError:
+                future.cancel()
+                outcomes.append((f"Error executing {block.name}: timed out after {timeout:g}s", timeout, True))
+        
+        # Do not wait for calls that timed out; their threads finish on their own
+        executor.shutdown(wait=False, cancel_futures=True)
     
-    # System prompt tells Claude what it can do (LIMITED TO 2 TOOLS ONLY)
-    system_prompt = """You are a helpful AI assistant with access to ONLY 2 country and currency tools:
+    tool_results = []
+    timings = []
+    for block, (result, seconds, failed) in zip(tool_blocks, outcomes):
+        if verbose:
+            print(f"   {'✗ Failed' if failed else '✓ Done'}: {block.name} ({seconds:.2f}s)")
+        
+        tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": result if isinstance(result, str) else json.dumps(result),
+            **({"is_error": True} if failed else {})
+        })
+        timings.append({
+            "tool_use_id": block.id,
+            "name": block.name,
+            "seconds": round(seconds, 4),
+            "ok": not failed
+        })
+    if verbose:
+        print()
+    
+    return tool_results, timings
+
+
+# System prompt tells Claude what it can do (LIMITED TO 6 TOOLS ONLY)
+SYSTEM_PROMPT = """You are a helpful AI assistant with access to ONLY these country and currency tools:
 
 1. get_currency_by_country - Find what currency a country uses
 2. get_exchange_rate - Get current exchange rate for a currency (relative to USD)
+3. get_exchange_rate_history - Get how a currency's rate moved over a date range
+4. get_currencies_by_countries - Find the currencies of several countries in one call
+5. get_exchange_rates - Get the exchange rates of several currencies in one call
+6. get_country_currency_rates - Get several countries' currencies and their exchange rates in one call
+When a question is about more than one country or currency, use one call of a list tool (4-6)
+instead of one call per item.
 please don't use any other tools or functions.
 focus on only those tools available to you.
 Use these tools to answer questions about:
 - What currency a country uses
 - Current exchange rates
+- Exchange rate trends over time
 
 Be concise, clear, and helpful in your responses."""
+
+
+# Mark the stable prompt prefix (tools + system prompt) and the conversation
+# so far as cacheable, so repeated iterations and questions reuse it.
+# Note the API only caches prefixes above a minimum size (about 1024 tokens
+# for Sonnet); shorter prefixes are simply sent uncached.
+PROMPT_CACHING = os.environ.get("AGENT_PROMPT_CACHING", "1").lower() not in ("0", "false", "no")
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Token usage summed over every request made by this process
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+_session_usage = dict.fromkeys(("requests",) + USAGE_FIELDS, 0)
+_session_usage_lock = threading.Lock()
+
+
+def add_usage(total, usage):
+    """
+    Add the token usage of one response to a running total.
+    
+    Args:
+        total (dict): Running totals keyed by USAGE_FIELDS plus 'requests'
+        usage: The `usage` object of a Claude response, or another dict of totals
+    """
+    if isinstance(usage, dict):
+        requests = usage.get("requests", 0)
+        values = {field: usage.get(field) for field in USAGE_FIELDS}
+    else:
+        requests = 1
+        values = {field: getattr(usage, field, None) for field in USAGE_FIELDS}
+    
+    total["requests"] = total.get("requests", 0) + requests
+    for field, value in values.items():
+        # Cache fields are None when caching was not used
+        total[field] = total.get(field, 0) + (value or 0)
+
+
+def record_usage(total, usage):
+    """
+    Add the token usage of one response to `total` and to the session totals.
+    
+    Args:
+        total (dict): Running totals for one conversation
+        usage: The `usage` object of a Claude response
+    """
+    add_usage(total, usage)
+    with _session_usage_lock:
+        add_usage(_session_usage, usage)
+
+
+def cache_hit_ratio(usage):
+    """
+    Share of input tokens that were read from the prompt cache.
+    
+    Args:
+        usage (dict): Token totals as built by add_usage()
+    
+    Returns:
+        float: cache_read / (cache_read + cache_creation + uncached input), 0.0 if nothing was sent
+    """
+    read = usage.get("cache_read_input_tokens", 0)
+    total_input = read + usage.get("cache_creation_input_tokens", 0) + usage.get("input_tokens", 0)
+    return round(read / total_input, 4) if total_input else 0.0
+
+
+def get_session_usage():
+    """
+    Get token usage and the prompt cache hit ratio for this process.
+    
+    Returns:
+        dict: Requests, token counts per USAGE_FIELDS and 'cache_hit_ratio'
+    """
+    with _session_usage_lock:
+        usage = dict(_session_usage)
+    usage["cache_hit_ratio"] = cache_hit_ratio(usage)
+    return usage
+
+
+def format_usage(usage):
+    """Format token usage as one short line for the console."""
+    return (f"in {usage.get('input_tokens', 0)} "
+            f"(cache read {usage.get('cache_read_input_tokens', 0)}, written {usage.get('cache_creation_input_tokens', 0)})"
+            f" | out {usage.get('output_tokens', 0)} | cache hit ratio {cache_hit_ratio(usage):.0%}")
+
+
+def add_cache_breakpoints(messages):
+    """
+    Copy the conversation with a cache breakpoint on its last content block.
+    
+    Only the newest message carries the marker, so together with the system
+    prompt at most 2 of the 4 allowed breakpoints are used, and each
+    iteration reads the previous iteration's prefix from the cache.
+    """
+    if not messages:
+        return messages
+    
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    else:
+        content = [block if isinstance(block, dict) else block.model_dump(exclude_none=True) for block in content]
+    content[-1] = {**content[-1], "cache_control": CACHE_CONTROL}
+    return messages[:-1] + [{**last, "content": content}]
+
+
+# Token budget for the conversation sent on each iteration. Once the
+# estimate goes over it, older tool results are replaced by short summaries
+# so later iterations do not resend the whole growing transcript.
+HISTORY_TOKEN_BUDGET = int(os.environ.get("AGENT_HISTORY_TOKEN_BUDGET", 8000))
+
+# Ask the token counting endpoint for exact request sizes (one extra API
+# call per iteration); otherwise a local estimate is used
+COUNT_TOKENS = os.environ.get("AGENT_COUNT_TOKENS", "0").lower() in ("1", "true", "yes")
+
+COMPACTED_PREFIX = "[summary of earlier tool result] "
+
+
+def _json_default(value):
+    """Serialize SDK content blocks (pydantic models) for token estimates."""
+    return value.model_dump(exclude_none=True) if hasattr(value, "model_dump") else str(value)
+
+
+def estimate_tokens(value):
+    """
+    Estimate the number of tokens of a prompt part (about 4 characters per token).
+    
+    Args:
+        value: A string, or messages / tools / system blocks
+    
+    Returns:
+        int: Approximate token count
+    """
+    text = value if isinstance(value, str) else json.dumps(value, default=_json_default)
+    return len(text) // 4 + 1
+
+
+def count_request_tokens(llm_client, model, system, tools, messages):
+    """
+    Count the input tokens of a request with the token counting endpoint.
+    
+    Returns:
+        int or None: Exact input token count, or None if the endpoint failed
+    """
+    try:
+        return llm_client.messages.count_tokens(model=model, system=system, tools=tools, messages=messages).input_tokens
+    except Exception:
+        return None
+
+
+def summarize_tool_result(content, max_chars=200):
+    """
+    Shorten a tool result that Claude has already used.
+    
+    JSON objects keep their scalar fields (lists and nested objects such as a
+    rate history's points are dropped); anything else is truncated.
+    
+    Args:
+        content (str): The tool result content
+        max_chars (int): Maximum length of the summary text
+    
+    Returns:
+        str: Summary, marked so it is not compacted again
+    """
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        data = None
+    
+    if isinstance(data, dict):
+        kept = {key: value for key, value in data.items() if not isinstance(value, (list, dict))}
+        omitted = [key for key in data if key not in kept]
+        text = json.dumps(kept)
+        if omitted:
+            text += f" (omitted: {', '.join(omitted)})"
+    else:
+        text = str(content)
+    
+    if len(text) > max_chars:
+        text = text[:max_chars] + "…"
+    return COMPACTED_PREFIX + text
+
+
+def compact_history(messages, budget):
+    """
+    Summarize old tool results, oldest first, until the history fits the budget.
+    
+    The newest message is never compacted, since Claude has not seen those
+    results yet. `messages` is updated in place.
+    
+    Args:
+        messages (list): The conversation so far
+        budget (int): Token budget for the messages
+    
+    Returns:
+        tuple: (number of tool results compacted, new token estimate)
+    """
+    tokens = estimate_tokens(messages)
+    compacted = 0
+    for message in messages[:-1]:
+        if tokens <= budget:
+            break
+        if message["role"] != "user" or not isinstance(message["content"], list):
+            continue
+        
+        content = []
+        for block in message["content"]:
+            if (isinstance(block, dict) and block.get("type") == "tool_result"
+                    and isinstance(block.get("content"), str)
+                    and not block["content"].startswith(COMPACTED_PREFIX)):
+                block = {**block, "content": summarize_tool_result(block["content"])}
+                compacted += 1
+            content.append(block)
+        message["content"] = content
+        tokens = estimate_tokens(messages)
+    
+    return compacted, tokens
+
+
+def _request_message(llm_client, stream, **request):
+    """
+    Send one request to Claude, yielding events as they arrive.
+    
+    This is a generator: when streaming it yields a 'text' event for each
+    piece of text and a 'tool_use' event as soon as a tool call's input is
+    complete (before the rest of the reply), and it returns the complete
+    message once Claude has finished the turn.
+    """
+    if not stream:
+        return llm_client.messages.create(**request)
+    
+    with llm_client.messages.stream(**request) as response_stream:
+        for event in response_stream:
+            if event.type == "text":
+                yield {"type": "text", "text": event.text}
+            elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                block = event.content_block
+                yield {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+        return response_stream.get_final_message()
+
+
+def stream_agent_conversation(llm_client, model, tools, user_message, tool_handler=None, stats=None,
+                              max_parallel_tools=MAX_PARALLEL_TOOLS, tool_timeout=TOOL_TIMEOUT, stream=True,
+                              cache_prompt=PROMPT_CACHING, token_budget=HISTORY_TOKEN_BUDGET,
+                              count_tokens=COUNT_TOKENS, verbose=True):
+    """
+    Agent loop as a stream of events, so callers can show progress live.
+    
+    Args:
+        llm_client: The Anthropic client instance
+        model: Model name to use
+        tools: List of tool definitions
+        user_message: The user's question
+        tool_handler: Function to execute tools (optional)
+        stats: Dict to fill with timing information (optional). Gets
+               'tool_calls' (per-call latency), 'tool_phase_seconds',
+               'ttft_seconds' (time to first token), 'total_seconds',
+               'usage' (token counts, including prompt cache reads/writes)
+               and 'iterations' (input tokens of each request).
+        max_parallel_tools: Maximum number of tool calls run at the same time
+        tool_timeout: Seconds a single tool call may take
+        stream: Stream Claude's text as it is generated (False waits for
+                each complete reply, like messages.create)
+        cache_prompt: Mark the system prompt, tools and conversation so far
+                      as cacheable (prompt caching)
+        token_budget: Input token budget per request; older tool results are
+                      summarized once the estimate goes over it
+        count_tokens: Use the token counting endpoint instead of the local estimate
+        verbose: Print each tool call as it runs
+    
+    Yields:
+        dict: Events, each with a 'type':
+              - 'text': a piece of Claude's reply ('text')
+              - 'tool_use': Claude asked for a tool ('id', 'name', 'input'); when
+                streaming, sent as soon as that call's input is complete
+              - 'tool_result': a tool finished ('id', 'name', 'seconds', 'ok')
+              - 'iteration': one request finished ('iteration', 'input_tokens',
+                'estimated_tokens', 'counted_tokens', 'compacted')
+              - 'done': the final answer ('answer', 'ttft_seconds', 'total_seconds', 'usage')
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("tool_calls", [])
+    stats.setdefault("tool_phase_seconds", 0.0)
+    stats.setdefault("usage", {})
+    stats.setdefault("iterations", [])
+    stats["ttft_seconds"] = None
+    
+    # Tools come before the system prompt in the cached prefix, so one
+    # breakpoint on the system prompt covers both
+    if cache_prompt:
+        system = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}]
+    else:
+        system = SYSTEM_PROMPT
+    
+    # System prompt and tools are the same on every iteration
+    prefix_tokens = estimate_tokens(system) + estimate_tokens(tools)
+    
+    started = time.perf_counter()
+    
+    # Start conversation with user's message
+    messages = [{"role": "user", "content": user_message}]
+    
+    def finish(answer):
+        stats["total_seconds"] = time.perf_counter() - started
+        return {
+            "type": "done",
+            "answer": answer,
+            "ttft_seconds": stats["ttft_seconds"],
+            "total_seconds": stats["total_seconds"],
+            "usage": stats["usage"]
+        }
     
     # Agent loop - keep going until we have a final answer
     max_iterations = 10
     for iteration in range(max_iterations):
         
-        # Send message to Claude
-        response = llm_client.messages.create(
+        # Keep the transcript within the token budget
+        compacted = 0
+        estimated_tokens = prefix_tokens + estimate_tokens(messages)
+        if estimated_tokens > token_budget:
+            compacted, history_tokens = compact_history(messages, token_budget - prefix_tokens)
+            estimated_tokens = prefix_tokens + history_tokens
+        request_messages = add_cache_breakpoints(messages) if cache_prompt else messages
+        counted_tokens = count_request_tokens(llm_client, model, system, tools, request_messages) if count_tokens else None
+        
+        # Send message to Claude, passing text on as soon as it arrives
+        request = _request_message(
+            llm_client,
+            stream,
             model=model,
             max_tokens=4096,
-            system=system_prompt,
+            system=system,
             tools=tools,
-            messages=messages
+            messages=request_messages
         )
+        announced = set()
+        while True:
+            try:
+                event = next(request)
+            except StopIteration as finished:
+                response = finished.value
+                break
+            if event["type"] == "text" and stats["ttft_seconds"] is None:
+                stats["ttft_seconds"] = time.perf_counter() - started
+            elif event["type"] == "tool_use":
+                announced.add(event["id"])
+            yield event
+        
+        # Track token usage, including prompt cache reads and writes
+        input_tokens = None
+        if getattr(response, "usage", None) is not None:
+            record_usage(stats["usage"], response.usage)
+            usage = response.usage
+            input_tokens = ((usage.input_tokens or 0) + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+                            + (getattr(usage, "cache_creation_input_tokens", 0) or 0))
+        
+        iteration_stats = {
+            "iteration": iteration + 1,
+            "input_tokens": input_tokens,
+            "estimated_tokens": estimated_tokens,
+            "counted_tokens": counted_tokens,
+            "compacted": compacted
+        }
+        stats["iterations"].append(iteration_stats)
+        yield {"type": "iteration", **iteration_stats}
+        
+        # Without streaming the whole reply arrives at once
+        if not stream:
+            for block in response.content:
+                if getattr(block, "type", None) == "text":
+                    if stats["ttft_seconds"] is None:
+                        stats["ttft_seconds"] = time.perf_counter() - started
+                    yield {"type": "text", "text": block.text}
         
         # Add Claude's response to conversation history
         messages.append({
@@ -175,37 +600,34 @@ Be concise, clear, and helpful in your responses."""
                 if hasattr(block, "text"):
                     final_answer += block.text
             
-            print(f"🤖 Assistant: {final_answer}\n")
-            print(f"{'='*70}\n")
-            return final_answer
+            yield finish(final_answer)
+            return
         
         # Claude wants to use tools
         if response.stop_reason == "tool_use":
-            tool_results = []
+            # Execute every tool Claude requested in this turn concurrently
+            tool_blocks = [block for block in response.content if block.type == "tool_use"]
+            # Streamed requests announced each call as its block closed
+            for block in tool_blocks:
+                if block.id not in announced:
+                    yield {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
             
-            # Execute each tool Claude requested
-            for block in response.content:
-                if block.type == "tool_use":
-                    tool_name = block.name
-                    tool_input = block.input
-                    
-                    print(f"🔧 Using tool: {tool_name}")
-                    print(f"   Input: {json.dumps(tool_input, indent=2)}")
-                    
-                    # Execute the tool using the provided handler
-                    if tool_handler:
-                        result = tool_handler(tool_name, tool_input)
-                    else:
-                        result = {"note": "No tool handler provided"}
-                    
-                    print(f"   ✓ Done\n")
-                    
-                    # Add tool result to send back to Claude
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result if isinstance(result, str) else json.dumps(result)
-                    })
+            phase_start = time.perf_counter()
+            tool_results, timings = execute_tool_calls(
+                tool_blocks, tool_handler, max_workers=max_parallel_tools, timeout=tool_timeout,
+                verbose=verbose
+            )
+            stats["tool_calls"].extend(timings)
+            stats["tool_phase_seconds"] += time.perf_counter() - phase_start
+            
+            for timing in timings:
+                yield {
+                    "type": "tool_result",
+                    "id": timing["tool_use_id"],
+                    "name": timing["name"],
+                    "seconds": timing["seconds"],
+                    "ok": timing["ok"]
+                }
             
             # Send tool results back to Claude
             messages.append({
@@ -213,7 +635,93 @@ Be concise, clear, and helpful in your responses."""
                 "content": tool_results
             })
     
-    return "Conversation limit reached."
+    yield finish("Conversation limit reached.")
+
+
+def run_agent_conversation(llm_client, model, tools, user_message, tool_handler=None, stats=None,
+                           max_parallel_tools=MAX_PARALLEL_TOOLS, tool_timeout=TOOL_TIMEOUT, stream=False,
+                           cache_prompt=PROMPT_CACHING, token_budget=HISTORY_TOKEN_BUDGET,
+                           count_tokens=COUNT_TOKENS, verbose=True):
+    """
+    Main agent loop: Send user message to LLM, handle tool calls, return answer.
+    
+    Args:
+        llm_client: The Anthropic client instance
+        model: Model name to use
+        tools: List of tool definitions
+        user_message: The user's question
+        tool_handler: Function to execute tools (optional)
+        stats: Dict to fill with timing information (optional), see
+               stream_agent_conversation()
+        max_parallel_tools: Maximum number of tool calls run at the same time
+        tool_timeout: Seconds a single tool call may take
+        stream: Print Claude's reply as it is generated
+        cache_prompt: Use prompt caching for the system prompt, tools and conversation
+        token_budget: Input token budget per request (older tool results get summarized)
+        count_tokens: Use the token counting endpoint instead of the local estimate
+        verbose: Print the question, tool calls, answer and timings (False
+                 prints nothing, for batch workers)
+    
+    How it works:
+    1. Send user question to Claude
+    2. Claude decides if it needs to use tools
+    3. If yes, we execute the tools (in parallel) and send results back to Claude
+    4. Claude uses tool results to formulate final answer
+    5. Return answer to user
+    """
+    events = stream_agent_conversation(llm_client, model, tools, user_message, tool_handler, stats,
+                                       max_parallel_tools, tool_timeout, stream and verbose, cache_prompt,
+                                       token_budget, count_tokens, verbose)
+    if not verbose:
+        final_answer = ""
+        for event in events:
+            if event["type"] == "done":
+                final_answer = event["answer"]
+        return final_answer
+    
+    print(f"\n{'='*70}")
+    print(f"User: {user_message}")
+    print(f"{'='*70}\n")
+    
+    printing = False
+    streamed_answer = False
+    final_answer = ""
+    for event in events:
+        if event["type"] == "text" and stream:
+            if not printing:
+                print("🤖 Assistant: ", end="", flush=True)
+                printing = True
+            print(event["text"], end="", flush=True)
+            streamed_answer = True
+        elif event["type"] == "tool_use":
+            # Text before a tool call is not the final answer
+            streamed_answer = False
+            if printing:
+                # Finish the line Claude was writing before the tool output
+                print("\n")
+                printing = False
+        elif event["type"] == "iteration":
+            if printing:
+                print("\n")
+                printing = False
+            size = f"input {event['input_tokens']} tokens" if event["input_tokens"] is not None else "input n/a"
+            size += f" (estimate {event['estimated_tokens']}"
+            if event["counted_tokens"] is not None:
+                size += f", counted {event['counted_tokens']}"
+            size += ")"
+            if event["compacted"]:
+                size += f", compacted {event['compacted']} old tool result(s)"
+            print(f"📏 Turn {event['iteration']}: {size}")
+        elif event["type"] == "done":
+            final_answer = event["answer"]
+            if not streamed_answer:
+                print(f"🤖 Assistant: {final_answer}\n")
+            ttft = event["ttft_seconds"]
+            print(f"⏱  First token: {f'{ttft:.2f}s' if ttft is not None else 'n/a'} | Total: {event['total_seconds']:.2f}s")
+            print(f"🧠 Tokens: {format_usage(event['usage'])}")
+            print(f"{'='*70}\n")
+    
+    return final_answer
 
 
 # ============================================================================
@@ -251,12 +759,13 @@ def interactive_mode():
                 continue
             
             if user_input.lower() in ['quit', 'exit', 'goodbye']:
+                print(f"\n🧠 Session tokens: {format_usage(get_session_usage())}")
                 print("\n👋 Goodbye!\n")
                 break
             
-            # Get response from agent
-            run_agent_conversation(llm_client, model, tools, user_input)
-            
+            # Get response from agent, printed as it is generated
+            run_agent_conversation(llm_client, model, tools, user_input, stream=True)
+        
         except KeyboardInterrupt:
             print("\n\n👋 Goodbye!\n")
             break
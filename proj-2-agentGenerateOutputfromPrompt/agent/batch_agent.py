@@ -0,0 +1,194 @@
+"""
+Bulk Agent - Runs many conversations through the Message Batches API
+
+For large, non-interactive question sets, cost and throughput matter more
+than latency. Instead of one messages.create() call per turn, this module
+sends the current turn of every open conversation as one message batch
+(batched requests are billed at a discount), waits for the batch to end,
+runs the requested tools locally, and sends the next turns as a follow-up
+batch until every conversation has its final answer.
+
+The agent loop is the same as run_agent_conversation() (same system prompt,
+tools, prompt caching and parallel tool execution), only the transport
+differs. For testing without network access, point the client at the local
+stand-in server in api/fake_batch_server.py (see create_llm_client()).
+"""
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from agent.agent import (
+    SYSTEM_PROMPT, CACHE_CONTROL, PROMPT_CACHING, MAX_PARALLEL_TOOLS, TOOL_TIMEOUT, HISTORY_TOKEN_BUDGET,
+    add_cache_breakpoints, record_usage, execute_tool_calls, estimate_tokens, compact_history
+)
+
+# Seconds between two checks of a running batch
+POLL_INTERVAL = 30
+
+# Largest number of requests sent in one batch (the API allows 100,000)
+MAX_BATCH_REQUESTS = 10000
+
+
+def _to_param(block):
+    """Convert a response content block to a plain dict for the next request."""
+    return block if isinstance(block, dict) else block.model_dump(exclude_none=True)
+
+
+def wait_for_batch(llm_client, batch_id, poll_interval=POLL_INTERVAL, timeout=None):
+    """
+    Poll a message batch until it has ended.
+    
+    Args:
+        llm_client: The Anthropic client instance
+        batch_id: ID of the batch
+        poll_interval: Seconds between checks
+        timeout: Give up after this many seconds (optional)
+    
+    Returns:
+        MessageBatch: The ended batch
+    """
+    started = time.monotonic()
+    while True:
+        batch = llm_client.messages.batches.retrieve(batch_id)
+        if batch.processing_status == "ended":
+            return batch
+        if timeout is not None and time.monotonic() - started > timeout:
+            raise TimeoutError(f"Message batch {batch_id} did not finish within {timeout}s")
+        
+        counts = batch.request_counts
+        print(f"   ⏳ Batch {batch_id}: {counts.processing} processing, {counts.succeeded} succeeded")
+        time.sleep(poll_interval)
+
+
+def run_batch_conversations(llm_client, model, tools, questions, tool_handler=None, poll_interval=POLL_INTERVAL,
+                            max_iterations=10, cache_prompt=PROMPT_CACHING, max_batch_requests=MAX_BATCH_REQUESTS,
+                            tool_workers=MAX_PARALLEL_TOOLS, tool_timeout=TOOL_TIMEOUT, batch_timeout=None,
+                            token_budget=HISTORY_TOKEN_BUDGET):
+    """
+    Answer many questions with the agent loop, one message batch per turn.
+    
+    Args:
+        llm_client: The Anthropic client instance
+        model: Model name to use
+        tools: List of tool definitions
+        questions: List of (id, question) tuples
+        tool_handler: Function to execute tools (optional)
+        poll_interval: Seconds between batch status checks
+        max_iterations: Maximum turns per conversation
+        cache_prompt: Mark the system prompt, tools and conversation as cacheable
+        max_batch_requests: Largest number of requests in one batch
+        tool_workers: Conversations whose tools are executed at the same time
+        tool_timeout: Seconds a single tool call may take
+        batch_timeout: Seconds to wait for one batch before giving up (optional)
+        token_budget: Input token budget per request; older tool results are
+                      summarized once the estimate goes over it
+    
+    Returns:
+        dict: Per question id: 'answer', 'error' ('' on success), 'iterations',
+              'usage' (token counts) and 'seconds' (from the first submission
+              until that conversation had its answer)
+    
+    Raises:
+        ValueError: If two questions have the same id
+    """
+    # Results are keyed by question id, so a repeated id would hide an answer
+    duplicates = [str(question_id) for question_id, count in Counter(q for q, _ in questions).items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate question ids: {', '.join(duplicates)}")
+    
+    started = time.perf_counter()
+    
+    if cache_prompt:
+        system = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}]
+    else:
+        system = SYSTEM_PROMPT
+    prefix_tokens = estimate_tokens(system) + estimate_tokens(tools)
+    
+    # Custom ids must be short and simple, so conversations are numbered
+    conversations = {}
+    for index, (question_id, question) in enumerate(questions):
+        conversations[f"conv-{index}"] = {
+            "id": question_id,
+            "messages": [{"role": "user", "content": question}],
+            "iterations": 0,
+            "usage": {},
+            "done": False,
+        }
+    results = {}
+    
+    def finish(conv, answer, error):
+        conv["done"] = True
+        results[conv["id"]] = {"answer": answer, "error": error, "iterations": conv["iterations"],
+                               "usage": conv["usage"], "seconds": round(time.perf_counter() - started, 3)}
+    
+    for iteration in range(max_iterations):
+        active = [key for key, conv in conversations.items() if not conv["done"]]
+        if not active:
+            break
+        
+        print(f"\n📨 Turn {iteration + 1}: {len(active)} conversation(s) in flight")
+        responses = {}
+        for start in range(0, len(active), max_batch_requests):
+            chunk = active[start:start + max_batch_requests]
+            requests = []
+            for key in chunk:
+                messages = conversations[key]["messages"]
+                if prefix_tokens + estimate_tokens(messages) > token_budget:
+                    compact_history(messages, token_budget - prefix_tokens)
+                requests.append({
+                    "custom_id": key,
+                    "params": {
+                        "model": model,
+                        "max_tokens": 4096,
+                        "system": system,
+                        "tools": tools,
+                        "messages": add_cache_breakpoints(messages) if cache_prompt else messages
+                    }
+                })
+            
+            batch = llm_client.messages.batches.create(requests=requests)
+            print(f"   📦 Submitted batch {batch.id} ({len(requests)} requests)")
+            wait_for_batch(llm_client, batch.id, poll_interval, batch_timeout)
+            
+            for item in llm_client.messages.batches.results(batch.id):
+                responses[item.custom_id] = item.result
+        
+        # Collect answers and the conversations that asked for tools
+        needs_tools = []
+        for key in active:
+            conv = conversations[key]
+            conv["iterations"] += 1
+            result = responses.get(key)
+            
+            if result is None or result.type != "succeeded":
+                reason = "missing from batch results" if result is None else result.type
+                if result is not None and result.type == "errored":
+                    reason = f"errored: {getattr(result.error.error, 'message', result.error)}"
+                finish(conv, "", f"Request {reason}")
+                continue
+            
+            message = result.message
+            record_usage(conv["usage"], message.usage)
+            conv["messages"].append({"role": "assistant", "content": [_to_param(block) for block in message.content]})
+            
+            if message.stop_reason == "tool_use":
+                needs_tools.append((key, [block for block in message.content if block.type == "tool_use"]))
+            else:
+                finish(conv, "".join(block.text for block in message.content if block.type == "text"), "")
+        
+        # Run the requested tools locally, several conversations at a time
+        if needs_tools:
+            with ThreadPoolExecutor(max_workers=max(1, tool_workers), thread_name_prefix="batch-tools") as executor:
+                futures = {
+                    key: executor.submit(execute_tool_calls, blocks, tool_handler, MAX_PARALLEL_TOOLS, tool_timeout, False)
+                    for key, blocks in needs_tools
+                }
+                for key, future in futures.items():
+                    tool_results, _ = future.result()
+                    conversations[key]["messages"].append({"role": "user", "content": tool_results})
+    
+    for conv in conversations.values():
+        if not conv["done"]:
+            finish(conv, "Conversation limit reached.", "iteration limit reached")
+    return results
@@ -0,0 +1,222 @@
+"""
+Fast Path - Answers simple lookups without calling the LLM
+
+Many questions are exactly the examples we show users: "What currency does
+India use?" or "What is the exchange rate for EUR?". Sending those through
+Claude costs at least two round trips (pick the tool, then phrase the
+answer), although the answer is a single tool call.
+
+FastPathRouter matches a question against a few fixed question templates
+and a precomputed index of country names, currency codes and currency
+names. Only when both the template and the country/currency match exactly
+does it answer, by calling the same tool handler the agent would use.
+Anything else returns None so the caller falls back to the full agent.
+"""
+
+import os
+import re
+import threading
+
+from agent.tool_cache import normalize_country
+
+# Set AGENT_FAST_PATH=0 to always go through the LLM
+FAST_PATH_ENABLED = os.environ.get("AGENT_FAST_PATH", "1").lower() not in ("0", "false", "no")
+
+# Labels for the path a response took
+PATH_FAST = "fast_path"
+PATH_AGENT = "agent"
+
+# Other names for currencies that only match one currency in our data
+CURRENCY_ALIASES = {
+    "british pound": "GBP",
+    "pound": "GBP",
+    "pounds": "GBP",
+    "sterling": "GBP",
+    "yen": "JPY",
+    "euro": "EUR",
+    "euros": "EUR",
+    "us dollar": "USD",
+    "us dollars": "USD",
+    "american dollar": "USD",
+}
+
+# Question templates: (tool to answer with, pattern capturing the country/currency)
+_ENTITY = r"(?:the )?(?P<entity>[a-z .'\-]+?)"
+QUESTION_TEMPLATES = [
+    ("currency", rf"(?:what|which) (?:currency|money) (?:does|do) {_ENTITY} use"),
+    ("currency", rf"(?:what|which) (?:currency|money) is used (?:in|by) {_ENTITY}"),
+    ("currency", rf"(?:what is|what's|which is) the (?:currency|official currency) (?:of|in|for) {_ENTITY}"),
+    ("currency", rf"(?:the )?(?:currency|official currency) (?:of|in|for) {_ENTITY}"),
+    ("currency", rf"{_ENTITY}(?:'s)? currency"),
+    ("rate", rf"(?:what is |what's )?(?:the )?(?:current |latest |live |today's )?(?:exchange )?rate (?:for|of) {_ENTITY}"),
+    ("rate", rf"{_ENTITY} (?:exchange )?rate"),
+    ("rate", rf"{_ENTITY} (?:to|vs|/) usd(?: exchange)?(?: rate)?"),
+    ("rate", rf"usd (?:to|vs|/) {_ENTITY}(?: exchange)?(?: rate)?"),
+]
+_COMPILED_TEMPLATES = [(intent, re.compile(rf"^{pattern}$")) for intent, pattern in QUESTION_TEMPLATES]
+
+
+def build_lookup_index(country_records, currency_codes=()):
+    """
+    Precompute the lookup tables used to resolve countries and currencies.
+    
+    Args:
+        country_records (list): Records with country_name, currency_name, currency_code.
+        currency_codes (iterable): Extra currency codes known to the rates API.
+    
+    Returns:
+        dict: 'countries' (lowercase name -> record), 'codes' (set of codes)
+              and 'currency_names' (lowercase name -> code).
+    """
+    countries = {}
+    codes = {str(code).upper() for code in currency_codes}
+    currency_names = {}
+    
+    for record in country_records:
+        name = str(record.get("country_name", "")).strip()
+        code = str(record.get("currency_code", "")).strip().upper()
+        if not name or not code:
+            continue
+        countries[name.lower()] = record
+        codes.add(code)
+        currency_name = str(record.get("currency_name", "")).strip().lower()
+        if currency_name:
+            currency_names[currency_name] = code
+    
+    for alias, code in CURRENCY_ALIASES.items():
+        if code in codes:
+            currency_names.setdefault(alias, code)
+    
+    return {"countries": countries, "codes": codes, "currency_names": currency_names}
+
+
+class FastPathRouter:
+    """
+    Deterministic pre-router that answers template questions through a tool handler.
+    """
+    def __init__(self, index):
+        """
+        Initialize the router with a lookup index.
+        
+        Args:
+            index (dict): Lookup tables from build_lookup_index().
+        """
+        self.index = index
+        self._lock = threading.Lock()
+        self.stats = {PATH_FAST: 0, PATH_AGENT: 0}
+    
+    def country_names(self):
+        """Return the country names of the index, as they appear in the data."""
+        return [record["country_name"] for record in self.index["countries"].values()]
+    
+    def _resolve_country(self, text):
+        """Return the country record for a name or alias, or None."""
+        name = normalize_country(text)
+        return self.index["countries"].get(name.lower())
+    
+    def _resolve_currency(self, text):
+        """Return the currency code for a code, currency name or country, or None."""
+        if text.upper() in self.index["codes"] and len(text) == 3:
+            return text.upper()
+        code = self.index["currency_names"].get(text.lower())
+        if code:
+            return code
+        record = self._resolve_country(text)
+        return record.get("currency_code") if record else None
+    
+    def match(self, question):
+        """
+        Match a question to a single tool call.
+        
+        Args:
+            question (str): The user's question.
+        
+        Returns:
+            tuple: (tool_name, tool_input) when the question matches a
+                   template and names a known country/currency, else None.
+        """
+        text = " ".join(str(question).lower().split()).rstrip("?!. ")
+        
+        for intent, pattern in _COMPILED_TEMPLATES:
+            found = pattern.match(text)
+            if not found:
+                continue
+            entity = found.group("entity").strip(" .'-")
+            
+            if intent == "currency":
+                record = self._resolve_country(entity)
+                if record:
+                    return "get_currency_by_country", {"country": record["country_name"]}
+            else:
+                code = self._resolve_currency(entity)
+                if code:
+                    return "get_exchange_rate", {"currency": code}
+        return None
+    
+    def answer(self, question, tool_handler):
+        """
+        Answer a question directly if it is a simple lookup.
+        
+        Args:
+            question (str): The user's question.
+            tool_handler: The same tool handler the agent uses.
+        
+        Returns:
+            str or None: The tool's answer, or None if the agent should handle it.
+        """
+        matched = self.match(question)
+        if matched is not None:
+            tool_name, tool_input = matched
+            result = tool_handler(tool_name, tool_input)
+            # Only plain successful answers are returned; anything else goes to the agent
+            if isinstance(result, str) and not result.startswith(("Could not", "Error", "Unknown tool")):
+                self.record(PATH_FAST)
+                return result
+        return None
+    
+    def record(self, path):
+        """Count one response answered by `path` (PATH_FAST or PATH_AGENT)."""
+        with self._lock:
+            self.stats[path] = self.stats.get(path, 0) + 1
+    
+    def get_stats(self):
+        """
+        Get how many responses took each path.
+        
+        Returns:
+            dict: Counts per path plus 'llm_avoided_ratio'.
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats[PATH_FAST] + stats[PATH_AGENT]
+        stats["llm_avoided_ratio"] = round(stats[PATH_FAST] / total, 4) if total else 0.0
+        return stats
+
+
+_shared_router = None
+_shared_router_lock = threading.Lock()
+
+
+def get_shared_router(country_currency_tool, currency_rates_tool=None):
+    """
+    Get the process-wide router, building its index on first use.
+    
+    Args:
+        country_currency_tool (CountryCurrencyTool): Source of country/currency records.
+        currency_rates_tool (CurrencyRatesTool): Source of extra currency codes (optional).
+    
+    Returns:
+        FastPathRouter: The shared router. If the country data could not be
+                        loaded its index is empty (every question goes to
+                        the agent) and it is rebuilt on the next call.
+    """
+    global _shared_router
+    with _shared_router_lock:
+        if _shared_router is None or not _shared_router.index["countries"]:
+            records = country_currency_tool.get_all_country_currencies() or []
+            codes = currency_rates_tool.get_available_currencies() if currency_rates_tool else []
+            stats = _shared_router.stats if _shared_router is not None else None
+            _shared_router = FastPathRouter(build_lookup_index(records, codes or []))
+            if stats:
+                _shared_router.stats = stats
+        return _shared_router
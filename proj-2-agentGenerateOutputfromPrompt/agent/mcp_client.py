@@ -0,0 +1,446 @@
+"""
+MCP Client Manager - Keeps MCP server sessions open between tool calls
+
+Opening an MCP session means starting mcp_server/server.py as a new Python
+process, which imports anthropic and the tools and reads the .env file
+before it can answer anything. Doing that for every question (or every
+tool call) costs far more than the tool call itself.
+
+MCPClientManager starts a small pool of server processes once and keeps
+their sessions open on a background event loop:
+- list_tools() is asked once and the Claude-format tool list is cached
+- Tool calls are spread over the live sessions (the least busy one is
+  used; one session also handles several calls at the same time)
+- Sessions are pinged every MCP_HEALTH_INTERVAL seconds; a server that
+  crashed or stopped answering is restarted, and a call that failed on a
+  dead server is retried once on another (or the restarted) server
+- call_tool() is synchronous, so it can be passed as the `tool_handler`
+  of run_agent_conversation() from main.py and app.py
+
+Set AGENT_TOOL_BACKEND=mcp to make main.py and app.py use the MCP server
+instead of calling the tools in-process.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import sys
+import threading
+
+from agent.tool_cache import ERROR_PREFIXES
+
+# Where tool calls go: 'local' (tools in this process) or 'mcp' (MCP server)
+TOOL_BACKEND = os.environ.get("AGENT_TOOL_BACKEND", "local").lower()
+
+SERVER_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "mcp_server", "server.py"))
+
+# Number of server processes kept running
+POOL_SIZE = int(os.environ.get("MCP_POOL_SIZE", 1))
+
+# Seconds: server start-up, a single tool call, a health ping, between health checks
+START_TIMEOUT = float(os.environ.get("MCP_START_TIMEOUT", 30))
+CALL_TIMEOUT = float(os.environ.get("MCP_CALL_TIMEOUT", 30))
+PING_TIMEOUT = 5
+HEALTH_INTERVAL = float(os.environ.get("MCP_HEALTH_INTERVAL", 30))
+
+# Resource of mcp_server/server.py reporting calls in flight and queued
+STATS_URI = "stats://tools"
+
+
+def _result_text(tool_name, result):
+    """
+    Convert an MCP CallToolResult to the plain text the agent expects.
+    
+    The server answers with {"success": ..., "data"/"error": ...} JSON.
+    Failed lookups become "Could not find ..." replies so the tool result
+    cache treats them like the in-process handler's misses.
+    """
+    text = "\n".join(getattr(block, "text", "") for block in (getattr(result, "content", None) or []))
+    # mcp 1.x uses camelCase attribute names, 2.x snake_case
+    if getattr(result, "isError", None) or getattr(result, "is_error", None):
+        return f"Error executing {tool_name}: {text}"
+    
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return text
+    if isinstance(payload, dict) and payload.get("success") is False:
+        error = str(payload.get("error", ""))
+        return error if error.startswith(ERROR_PREFIXES) else f"Could not find a result: {error}"
+    return text
+
+
+class _ServerSlot:
+    """One server process of the pool and its open session."""
+    def __init__(self, index):
+        self.index = index
+        self.session = None
+        self.task = None
+        self.stop = None
+        self.restart_task = None
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.restarts = 0
+        self.last_error = ""
+
+
+class MCPClientManager:
+    """
+    Pool of long-lived MCP server sessions with cached tools and health checks.
+    """
+    def __init__(self, server_path=SERVER_PATH, pool_size=POOL_SIZE, start_timeout=START_TIMEOUT,
+                 call_timeout=CALL_TIMEOUT, health_interval=HEALTH_INTERVAL):
+        """
+        Initialize the manager. Servers are started by start() (or the first call).
+        
+        Args:
+            server_path (str): MCP server script to run.
+            pool_size (int): Number of server processes to keep running.
+            start_timeout (float): Seconds a server may take to start.
+            call_timeout (float): Seconds a single tool call may take.
+            health_interval (float): Seconds between health checks (0 disables them).
+        """
+        self.server_path = server_path
+        self.start_timeout = start_timeout
+        self.call_timeout = call_timeout
+        self.health_interval = health_interval
+        self._slots = [_ServerSlot(index) for index in range(max(1, pool_size))]
+        self._tools = None
+        self._loop = None
+        self._thread = None
+        self._health_task = None
+        self._lock = threading.Lock()
+    
+    # ------------------------------------------------------------------
+    # Synchronous API (any thread)
+    # ------------------------------------------------------------------
+    
+    def start(self):
+        """
+        Start the server processes and load the tool list.
+        
+        Returns:
+            MCPClientManager: self, once at least one server is ready.
+        
+        Raises:
+            RuntimeError: If the mcp package is missing or no server could start.
+        """
+        with self._lock:
+            if self._loop is not None:
+                return self
+            try:
+                import mcp  # noqa: F401
+            except ImportError:
+                raise RuntimeError("MCP not available. Install with: pip install mcp")
+            
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="mcp-client", daemon=True)
+            thread.start()
+            self._loop, self._thread = loop, thread
+        
+        try:
+            self._submit(self._start_all()).result()
+        except Exception:
+            self.close()
+            raise
+        return self
+    
+    def get_tools(self):
+        """
+        Get the server's tools in Claude format (asked once, then cached).
+        
+        Returns:
+            list: Tool definitions with name, description and input_schema.
+        """
+        self.start()
+        return [dict(tool) for tool in self._tools]
+    
+    def call_tool(self, tool_name, tool_input):
+        """
+        Call a tool on one of the live servers.
+        
+        Has the tool_handler signature, so it can be passed to
+        run_agent_conversation() directly.
+        
+        Args:
+            tool_name (str): Name of the tool.
+            tool_input (dict): Arguments for the tool.
+        
+        Returns:
+            str: The tool's reply as text.
+        """
+        self.start()
+        return self._submit(self._call_tool(tool_name, tool_input)).result()
+    
+    def health_check(self):
+        """
+        Ping every server now and restart the ones that do not answer.
+        
+        Returns:
+            list: get_stats() after the check.
+        """
+        self.start()
+        self._submit(self._check_health()).result()
+        return self.get_stats()
+    
+    def get_stats(self):
+        """
+        Get the state of each server in the pool.
+        
+        Returns:
+            list: Per server: index, alive, in_flight, calls, failures,
+                  restarts and last_error.
+        """
+        return [
+            {
+                "index": slot.index,
+                "alive": slot.session is not None,
+                "in_flight": slot.in_flight,
+                "calls": slot.calls,
+                "failures": slot.failures,
+                "restarts": slot.restarts,
+                "last_error": slot.last_error
+            }
+            for slot in self._slots
+        ]
+    
+    def get_server_stats(self):
+        """
+        Ask every live server for its load (the stats://tools resource).
+        
+        Returns:
+            list: Per live server: its index and the server's tool statistics
+                  (calls in flight and queued, per tool and in total).
+        """
+        self.start()
+        return self._submit(self._read_server_stats()).result()
+    
+    def close(self):
+        """Stop every server process and the background event loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(self._stop_all(), loop).result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+    
+    def _submit(self, coroutine):
+        """Schedule a coroutine on the manager's event loop."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+    
+    # ------------------------------------------------------------------
+    # Event loop side
+    # ------------------------------------------------------------------
+    
+    async def _serve(self, slot, ready):
+        """Run one server process and hold its session open until asked to stop."""
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+        
+        # The server needs the same configuration (.env values, URLs) as the agent
+        params = StdioServerParameters(command=sys.executable, args=[self.server_path], env=dict(os.environ))
+        try:
+            async with stdio_client(params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    slot.session = session
+                    if not ready.done():
+                        ready.set_result(None)
+                    await slot.stop.wait()
+        except Exception as e:
+            slot.last_error = f"{type(e).__name__}: {e}"
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            slot.session = None
+    
+    async def _start_slot(self, slot):
+        """Start the server of one slot and wait until its session is ready."""
+        ready = self._loop.create_future()
+        slot.stop = asyncio.Event()
+        slot.task = asyncio.ensure_future(self._serve(slot, ready))
+        try:
+            await asyncio.wait_for(ready, self.start_timeout)
+        except BaseException:
+            slot.task.cancel()
+            raise
+    
+    async def _stop_slot(self, slot):
+        """Close the session of one slot and end its server process."""
+        slot.session = None
+        task = slot.task
+        if task is not None and not task.done():
+            slot.stop.set()
+            try:
+                await asyncio.wait_for(task, 5)
+            except (asyncio.TimeoutError, asyncio.CancelledError, Exception):
+                pass
+    
+    async def _start_all(self):
+        """Start all servers, the health checks, and load the tool list."""
+        results = await asyncio.gather(*(self._start_slot(slot) for slot in self._slots), return_exceptions=True)
+        live = [slot for slot in self._slots if slot.session is not None]
+        if not live:
+            error = next((r for r in results if isinstance(r, BaseException)), None)
+            raise RuntimeError(f"Could not start the MCP server ({self.server_path}): {error!r}")
+        
+        tools_response = await asyncio.wait_for(live[0].session.list_tools(), self.call_timeout)
+        self._tools = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "input_schema": getattr(tool, "inputSchema", None) or getattr(tool, "input_schema", None)
+            }
+            for tool in tools_response.tools
+        ]
+        if self.health_interval > 0:
+            self._health_task = asyncio.ensure_future(self._health_loop())
+    
+    async def _stop_all(self):
+        """Cancel the health checks and stop every server."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+        await asyncio.gather(*(self._stop_slot(slot) for slot in self._slots), return_exceptions=True)
+    
+    async def _ping(self, slot):
+        """Return True if the slot's server answers a ping."""
+        session = slot.session
+        if session is None:
+            return False
+        try:
+            await asyncio.wait_for(session.send_ping(), PING_TIMEOUT)
+            return True
+        except Exception as e:
+            slot.last_error = f"ping failed: {type(e).__name__}: {e}"
+            return False
+    
+    async def _restart_slot(self, slot, reason):
+        """Replace the server of a slot with a new process."""
+        slot.restarts += 1
+        print(f"⚠ MCP server {slot.index} is not healthy ({reason}), restarting it")
+        await self._stop_slot(slot)
+        try:
+            await self._start_slot(slot)
+        except BaseException as e:
+            slot.last_error = f"restart failed: {type(e).__name__}: {e}"
+    
+    def _schedule_restart(self, slot, reason):
+        """Restart a slot in the background (once, however many callers notice)."""
+        slot.session = None
+        if slot.restart_task is None or slot.restart_task.done():
+            slot.restart_task = asyncio.ensure_future(self._restart_slot(slot, reason))
+        return slot.restart_task
+    
+    async def _check_health(self):
+        """Ping every server and restart the ones that do not answer."""
+        restarts = [
+            self._schedule_restart(slot, slot.last_error or "no session")
+            for slot, healthy in zip(self._slots, await asyncio.gather(*(self._ping(s) for s in self._slots)))
+            if not healthy
+        ]
+        if restarts:
+            await asyncio.gather(*restarts, return_exceptions=True)
+    
+    async def _health_loop(self):
+        """Run _check_health() every health_interval seconds."""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self._check_health()
+            except Exception as e:
+                print(f"⚠ MCP health check failed: {e}")
+    
+    async def _read_server_stats(self):
+        """Read the stats resource of every live server."""
+        stats = []
+        for slot in self._slots:
+            session = slot.session
+            if session is None:
+                continue
+            result = await asyncio.wait_for(session.read_resource(STATS_URI), self.call_timeout)
+            stats.append({"index": slot.index, **json.loads(result.contents[0].text)})
+        return stats
+    
+    def _pick_slot(self):
+        """Return the live slot with the fewest calls in flight, or None."""
+        live = [slot for slot in self._slots if slot.session is not None]
+        if not live:
+            return None
+        return min(live, key=lambda slot: (slot.in_flight, slot.calls))
+    
+    async def _call_tool(self, tool_name, tool_input):
+        """Call a tool, retrying once on another server if its server died."""
+        last_error = "no live MCP server"
+        for _ in range(2):
+            slot = self._pick_slot()
+            if slot is None:
+                # Every server is down: wait for (or start) a restart
+                pending = [s.restart_task for s in self._slots if s.restart_task and not s.restart_task.done()]
+                if not pending:
+                    pending = [self._schedule_restart(self._slots[0], last_error)]
+                await asyncio.gather(*pending, return_exceptions=True)
+                slot = self._pick_slot()
+                if slot is None:
+                    break
+            
+            session = slot.session
+            slot.in_flight += 1
+            slot.calls += 1
+            try:
+                result = await asyncio.wait_for(session.call_tool(tool_name, tool_input), self.call_timeout)
+                return _result_text(tool_name, result)
+            except Exception as e:
+                slot.failures += 1
+                last_error = f"{type(e).__name__}: {e}"
+                # A live server means the call itself failed (e.g. a slow
+                # upstream); retrying would only fail the same way
+                if await self._ping(slot):
+                    raise
+                self._schedule_restart(slot, last_error)
+            finally:
+                slot.in_flight -= 1
+        
+        raise RuntimeError(f"MCP call to {tool_name} failed: {last_error}")
+
+
+_shared_manager = None
+_shared_manager_error = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_shared_mcp_manager():
+    """
+    Get the process-wide MCP client manager, starting its servers on first use.
+    
+    main.py and app.py share this instance, so the server processes stay
+    warm across questions. They are stopped when the process exits. If the
+    servers cannot start, later calls fail right away instead of waiting
+    for another start timeout.
+    
+    Returns:
+        MCPClientManager: The started manager.
+    
+    Raises:
+        RuntimeError: If the servers could not be started.
+    """
+    global _shared_manager, _shared_manager_error
+    with _shared_manager_lock:
+        if _shared_manager_error is not None:
+            raise RuntimeError(_shared_manager_error)
+        if _shared_manager is None:
+            try:
+                manager = MCPClientManager().start()
+            except Exception as e:
+                _shared_manager_error = str(e)
+                raise RuntimeError(_shared_manager_error) from e
+            atexit.register(manager.close)
+            _shared_manager = manager
+        return _shared_manager
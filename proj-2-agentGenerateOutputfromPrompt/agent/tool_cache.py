@@ -0,0 +1,385 @@
+"""
+Tool Result Cache - Remembers tool answers between calls
+
+Claude often asks for the same thing more than once: the currency of the
+same country, or the rate for the same code, within one conversation and
+across questions. Each of those calls goes back to the FastAPI service or
+the internet.
+
+ToolResultCache wraps the `tool_handler` passed to run_agent_conversation
+and answers repeated calls from memory:
+- Country names are resolved before the call: aliases ('USA', 'Bharat')
+  and, once the cache knows the country names in the data (see
+  set_country_names()), any spelling that differs only in case or
+  whitespace ('india ', 'INDIA') become the data's name ('India'). Other
+  names are passed on unchanged, so nothing is guessed
+- The cache key also folds currency code case and whitespace, and blank
+  and repeated items of list inputs, so equivalent calls share one entry
+  and different ones never do
+- Each tool has its own TTL: long for the static country -> currency
+  mapping, short for live exchange rates
+- Misses ("Could not find ...") are cached too, for a short time
+- Least recently used entries are evicted once the cache is full
+- Hits and misses are counted per tool (see get_stats())
+"""
+
+import os
+import string
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a successful result stays valid, per tool
+TOOL_TTLS = {
+    "get_currency_by_country": 24 * 3600,
+    "get_exchange_rate": 60,
+    "get_exchange_rate_history": 300,
+    "get_currencies_by_countries": 24 * 3600,
+    "get_exchange_rates": 60,
+    "get_country_currency_rates": 60,
+}
+DEFAULT_TTL = 60
+
+# Seconds a "not found" result stays valid
+NEGATIVE_TTL = int(os.environ.get("TOOL_CACHE_NEGATIVE_TTL", 60))
+
+# Maximum number of cached results (least recently used are evicted first)
+MAX_ENTRIES = int(os.environ.get("TOOL_CACHE_SIZE", 512))
+
+# Other names Claude or users give countries, mapped to the names in the data
+COUNTRY_ALIASES = {
+    "us": "United States",
+    "usa": "United States",
+    "u.s.": "United States",
+    "u.s.a.": "United States",
+    "america": "United States",
+    "united states of america": "United States",
+    "the united states": "United States",
+    "uk": "United Kingdom",
+    "u.k.": "United Kingdom",
+    "gb": "United Kingdom",
+    "britain": "United Kingdom",
+    "great britain": "United Kingdom",
+    "england": "United Kingdom",
+    "the united kingdom": "United Kingdom",
+    "bharat": "India",
+    "republic of india": "India",
+    "jp": "Japan",
+    "nippon": "Japan",
+    "de": "Germany",
+    "deutschland": "Germany",
+    "federal republic of germany": "Germany",
+}
+
+# Handler replies that mean "nothing found" (cached for NEGATIVE_TTL)
+MISS_PREFIXES = ("Could not find", "Could not fetch", "No exchange rate history")
+
+# Handler replies that must never be cached (transient failures)
+ERROR_PREFIXES = ("Error executing", "Unknown tool")
+
+
+def normalize_country(name):
+    """
+    Normalize a country name: trim, collapse whitespace, resolve aliases, title case.
+    
+    Args:
+        name (str): Country name as given (e.g., ' united  states', 'USA').
+    
+    Returns:
+        str: Country name as it appears in the data (e.g., 'United States').
+    """
+    key = " ".join(str(name).split()).lower()
+    return COUNTRY_ALIASES.get(key) or string.capwords(key)
+
+
+def fold_name(name):
+    """Lookup form of a name: whitespace collapsed, lower case."""
+    return " ".join(str(name).split()).lower()
+
+
+def resolve_country(name, known_names=None):
+    """
+    Map a country name to the name used in the data.
+    
+    Args:
+        name (str): Country name as given (e.g., 'USA', 'india ', 'Bosnia and Herzegovina').
+        known_names (dict): Folded name -> name in the data (optional, see fold_name()).
+    
+    Returns:
+        str: The aliased or known name (e.g., 'United States', 'India'),
+             else `name` unchanged.
+    """
+    if not isinstance(name, str):
+        return name
+    key = fold_name(name)
+    if key in COUNTRY_ALIASES:
+        return COUNTRY_ALIASES[key]
+    return known_names.get(key, name) if known_names else name
+
+
+def resolve_tool_input(tool_input, known_names=None):
+    """
+    Build the input passed to the tool handler: the caller's input with
+    country names resolved (list items keep their order and repeats).
+    
+    Args:
+        tool_input (dict): Input Claude sent for the tool.
+        known_names (dict): Folded name -> name in the data (optional).
+    
+    Returns:
+        dict: Copy of the input.
+    """
+    resolved = dict(tool_input or {})
+    for key, value in resolved.items():
+        if key in ("country", "country_name"):
+            resolved[key] = resolve_country(value, known_names)
+        elif key in ("countries", "country_names") and isinstance(value, list):
+            resolved[key] = [resolve_country(item, known_names) for item in value]
+    return resolved
+
+
+def normalize_tool_input(tool_name, tool_input):
+    """
+    Build the cache key form of a (resolved) tool input.
+    
+    Only differences the tools ignore are removed: currency codes are
+    stripped and upper-cased, and blank and repeated items of list inputs
+    are dropped (first occurrence kept, in the caller's order, since
+    replies list the items in that order). Country names are used as
+    resolved: names not in the data are matched exactly by the API, so
+    they are not folded.
+    
+    Args:
+        tool_name (str): Name of the tool.
+        tool_input (dict): Input passed to the handler (see resolve_tool_input()).
+    
+    Returns:
+        dict: Key form of the input.
+    """
+    normalized = {}
+    for key, value in (tool_input or {}).items():
+        if isinstance(value, str) and key in ("currency", "currency_code"):
+            value = value.strip().upper()
+        elif isinstance(value, list) and key in ("countries", "country_names", "currencies", "currency_codes"):
+            items = [str(item).strip() for item in value]
+            if key in ("currencies", "currency_codes"):
+                items = [item.upper() for item in items]
+            value = list(dict.fromkeys(item for item in items if item))
+        normalized[key] = value
+    
+    # Default that the handler would apply anyway
+    if tool_name == "get_exchange_rate_history":
+        normalized["max_points"] = int(normalized.get("max_points") or 20)
+        for key in ("start_date", "end_date"):
+            if not normalized.get(key):
+                normalized.pop(key, None)
+    return normalized
+
+
+def default_is_miss(result):
+    """Return True if a handler result means nothing was found."""
+    if not result:
+        return True
+    return isinstance(result, str) and result.startswith(MISS_PREFIXES)
+
+
+def default_is_error(result):
+    """Return True if a handler result is a transient error that must not be cached."""
+    return isinstance(result, str) and result.startswith(ERROR_PREFIXES)
+
+
+class ToolResultCache:
+    """
+    LRU cache of tool results with per-tool TTLs and negative caching.
+    """
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL, max_entries=MAX_ENTRIES):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            ttls (dict): Seconds a result stays valid, per tool name (optional).
+            default_ttl (int): TTL for tools not listed in `ttls`.
+            negative_ttl (int): TTL for "not found" results.
+            max_entries (int): Maximum number of cached results.
+        """
+        self.ttls = dict(TOOL_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._known_names = {}
+    
+    def set_country_names(self, names):
+        """
+        Tell the cache which country names the data has.
+        
+        Calls naming one of them in another case or spacing are then
+        passed on (and cached) under the data's name.
+        
+        Args:
+            names (iterable): Country names as they appear in the data.
+        """
+        self._known_names = {fold_name(name): name for name in names}
+    
+    def _tool_stats(self, tool_name):
+        """Get (creating if needed) the counters for one tool. Call with the lock held."""
+        stats = self._stats.get(tool_name)
+        if stats is None:
+            stats = {"hits": 0, "negative_hits": 0, "misses": 0, "uncached_errors": 0, "evictions": 0}
+            self._stats[tool_name] = stats
+        return stats
+    
+    @staticmethod
+    def make_key(tool_name, tool_input):
+        """
+        Build the cache key for a (normalized) tool input.
+        
+        Returns:
+            tuple: (tool_name, sorted input items)
+        """
+        return tool_name, tuple(sorted((k, repr(v)) for k, v in tool_input.items()))
+    
+    def get(self, tool_name, tool_input):
+        """
+        Look up a cached result.
+        
+        Args:
+            tool_name (str): Name of the tool.
+            tool_input (dict): Normalized tool input.
+        
+        Returns:
+            tuple: (found, result). `found` is False on a miss or an expired entry.
+        """
+        key = self.make_key(tool_name, tool_input)
+        with self._lock:
+            stats = self._tool_stats(tool_name)
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at, negative = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    stats["negative_hits" if negative else "hits"] += 1
+                    return True, result
+                del self._entries[key]
+            stats["misses"] += 1
+            return False, None
+    
+    def put(self, tool_name, tool_input, result, negative=False):
+        """
+        Store a result, evicting the least recently used entries if full.
+        
+        Args:
+            tool_name (str): Name of the tool.
+            tool_input (dict): Normalized tool input.
+            result: The handler's result.
+            negative (bool): True if the result means "not found".
+        """
+        ttl = self.negative_ttl if negative else self.ttls.get(tool_name, self.default_ttl)
+        if ttl <= 0:
+            return
+        
+        key = self.make_key(tool_name, tool_input)
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + ttl, negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                (evicted_tool, _), _ = self._entries.popitem(last=False)
+                self._tool_stats(evicted_tool)["evictions"] += 1
+    
+    def wrap(self, tool_handler, is_miss=default_is_miss, is_error=default_is_error):
+        """
+        Wrap a tool handler so repeated calls are answered from the cache.
+        
+        Args:
+            tool_handler: Function (tool_name, tool_input) -> result.
+            is_miss: Function telling whether a result means "not found".
+            is_error: Function telling whether a result is an error not to cache.
+        
+        Returns:
+            function: Handler with the same signature as `tool_handler`.
+        """
+        def cached_tool_handler(tool_name, tool_input):
+            resolved = resolve_tool_input(tool_input, self._known_names)
+            normalized = normalize_tool_input(tool_name, resolved)
+            found, result = self.get(tool_name, normalized)
+            if found:
+                return result
+            
+            result = tool_handler(tool_name, resolved)
+            if is_error(result):
+                with self._lock:
+                    self._tool_stats(tool_name)["uncached_errors"] += 1
+            else:
+                self.put(tool_name, normalized, result, negative=is_miss(result))
+            return result
+        
+        return cached_tool_handler
+    
+    def invalidate(self, tool_name=None):
+        """
+        Drop cached results.
+        
+        Args:
+            tool_name (str): Only drop results of this tool (optional, default all).
+        """
+        with self._lock:
+            if tool_name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == tool_name]:
+                    del self._entries[key]
+    
+    def get_stats(self):
+        """
+        Get hit/miss counters per tool.
+        
+        Returns:
+            dict: Per tool name: hits, negative_hits, misses, uncached_errors,
+                  evictions, entries (currently cached) and hit_ratio.
+        """
+        with self._lock:
+            entries = {}
+            for tool_name, _ in self._entries:
+                entries[tool_name] = entries.get(tool_name, 0) + 1
+            
+            stats = {}
+            for tool_name, counters in self._stats.items():
+                lookups = counters["hits"] + counters["negative_hits"] + counters["misses"]
+                stats[tool_name] = {
+                    **counters,
+                    "entries": entries.get(tool_name, 0),
+                    "hit_ratio": round((counters["hits"] + counters["negative_hits"]) / lookups, 4) if lookups else 0.0
+                }
+            return stats
+
+
+def format_cache_stats(stats):
+    """Format per-tool cache counters as console lines."""
+    return [
+        f"{tool_name}: {s['hits']} hits, {s['negative_hits']} negative hits, "
+        f"{s['misses']} misses ({s['hit_ratio']:.0%} hit ratio, {s['entries']} cached)"
+        for tool_name, s in sorted(stats.items())
+    ]
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_tool_cache():
+    """
+    Get the process-wide tool result cache.
+    
+    Entry points (main.py, app.py) share this instance so results are
+    reused across conversations, not only within one.
+    
+    Returns:
+        ToolResultCache: The shared cache.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ToolResultCache()
+        return _shared_cache
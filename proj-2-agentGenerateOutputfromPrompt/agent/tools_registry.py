@@ -0,0 +1,249 @@
+"""
+Tools Registry - Tool definitions shared by the CLI (main.py) and the UI (app.py)
+
+TOOL_SCHEMAS describes the tools Claude can call. create_tools() pairs them
+with a handler that runs the tools in this process; create_backend_tools()
+picks the configured backend (AGENT_TOOL_BACKEND), falling back to the local
+tools when the MCP servers cannot start.
+"""
+
+from agent.mcp_client import TOOL_BACKEND, get_shared_mcp_manager
+
+# Define tools schema for Claude
+TOOL_SCHEMAS = [
+    {
+        "name": "get_currency_by_country",
+        "description": "Get the official currency used by a specific country. Returns currency name and code.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "country": {
+                    "type": "string",
+                    "description": "The country name (e.g., 'India', 'United States', 'Japan')"
+                }
+            },
+            "required": ["country"]
+        }
+    },
+    {
+        "name": "get_exchange_rate",
+        "description": "Get the current live exchange rate for a specific currency relative to USD from the public API.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "currency": {
+                    "type": "string",
+                    "description": "The currency code (e.g., 'EUR', 'INR', 'GBP', 'JPY')"
+                }
+            },
+            "required": ["currency"]
+        }
+    },
+    {
+        "name": "get_exchange_rate_history",
+        "description": "Get how a currency's exchange rate (relative to USD) moved over a date range. Returns first/last/min/max, percent change and a short downsampled series.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "currency": {
+                    "type": "string",
+                    "description": "The currency code (e.g., 'EUR', 'INR', 'GBP', 'JPY')"
+                },
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format (optional, defaults to earliest available)"
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format (optional, defaults to latest available)"
+                },
+                "max_points": {
+                    "type": "integer",
+                    "description": "Maximum number of points in the series (default 20)"
+                }
+            },
+            "required": ["currency"]
+        }
+    },
+    # List variants: one call (and one lookup) for a whole set of
+    # countries or currencies instead of one call per item
+    {
+        "name": "get_currencies_by_countries",
+        "description": "Get the official currency of several countries at once. Use this instead of calling get_currency_by_country once per country.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "countries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Country names (e.g., ['India', 'Japan', 'Germany'])"
+                }
+            },
+            "required": ["countries"]
+        }
+    },
+    {
+        "name": "get_exchange_rates",
+        "description": "Get the current live exchange rates of several currencies relative to USD at once. Use this instead of calling get_exchange_rate once per currency.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "currencies": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Currency codes (e.g., ['EUR', 'INR', 'JPY'])"
+                }
+            },
+            "required": ["currencies"]
+        }
+    },
+    {
+        "name": "get_country_currency_rates",
+        "description": "For several countries at once, get each country's currency and that currency's current exchange rate relative to USD.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "countries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Country names (e.g., ['India', 'Japan', 'Germany'])"
+                }
+            },
+            "required": ["countries"]
+        }
+    }
+]
+
+
+def create_tools(country_currency_tool, currency_rates_tool):
+    """
+    Build the tool definitions for Claude and the handler that executes them.
+    
+    Args:
+        country_currency_tool: CountryCurrencyTool used for currency lookups
+        currency_rates_tool: CurrencyRatesTool used for exchange rates
+    
+    Returns:
+        tuple: (list of tool definitions, tool handler function)
+    """
+    
+    def describe_currency(country, record):
+        return f"The currency of {country} is {record.get('currency_name', 'Unknown')} ({record.get('currency_code', 'N/A')})."
+    
+    def describe_rate(currency_code, result):
+        freshness = f"rates as of {result.get('timestamp', 'Unknown')}, fetched {result.get('age_seconds', 0)}s ago"
+        if result.get('stale'):
+            freshness += ", refresh pending"
+        base = result.get('base', 'USD')
+        return f"The current exchange rate for {currency_code} is 1 {base} = {result['rate']} {currency_code} ({freshness})."
+    
+    def list_input(tool_input, key):
+        values = tool_input.get(key) or []
+        if isinstance(values, str):
+            values = [values]
+        return list(dict.fromkeys(str(value).strip() for value in values if str(value).strip()))
+    
+    # Define tool handler function
+    def tool_handler(tool_name, tool_input):
+        """Execute the requested tool and return results."""
+        try:
+            if tool_name == "get_currency_by_country":
+                country = tool_input.get("country", "")
+                records = country_currency_tool.get_by_country_name(country)
+                if records:
+                    # The API returns a list of matching records
+                    return describe_currency(country, records[0])
+                else:
+                    return f"Could not find currency information for '{country}'. Please check the country name."
+            
+            elif tool_name == "get_exchange_rate":
+                currency_code = tool_input.get("currency", "").upper()
+                result = currency_rates_tool.get_rate(currency_code)
+                if result and 'rate' in result:
+                    return describe_rate(currency_code, result)
+                else:
+                    return f"Could not fetch exchange rate for '{currency_code}'. Please check the currency code."
+            
+            elif tool_name in ("get_currencies_by_countries", "get_country_currency_rates"):
+                countries = list_input(tool_input, "countries")
+                # One request for all countries, one snapshot lookup for all rates
+                records = {record["country_name"]: record for record in country_currency_tool.get_by_country_names(countries)}
+                rates = {}
+                if tool_name == "get_country_currency_rates":
+                    rates = currency_rates_tool.get_multiple_rates({record["currency_code"] for record in records.values()})
+                
+                lines = []
+                for country in countries:
+                    record = records.get(country)
+                    if record is None:
+                        continue
+                    lines.append(describe_currency(country, record))
+                    if tool_name == "get_country_currency_rates":
+                        code = record.get("currency_code", "")
+                        rate = rates.get(code)
+                        lines.append(describe_rate(code, rate) if rate else f"Could not fetch exchange rate for '{code}'.")
+                missing = [country for country in countries if country not in records]
+                if not lines:
+                    return f"Could not find currency information for {', '.join(repr(c) for c in missing)}. Please check the country names."
+                if missing:
+                    lines.append(f"No currency information for: {', '.join(missing)}.")
+                return "\n".join(lines)
+            
+            elif tool_name == "get_exchange_rates":
+                codes = [code.upper() for code in list_input(tool_input, "currencies")]
+                rates = currency_rates_tool.get_multiple_rates(codes)
+                lines = [describe_rate(code, rates[code]) for code in codes if code in rates]
+                missing = [code for code in codes if code not in rates]
+                if not lines:
+                    return f"Could not fetch exchange rates for {', '.join(repr(c) for c in missing)}. Please check the currency codes."
+                if missing:
+                    lines.append(f"No exchange rate for: {', '.join(missing)}.")
+                return "\n".join(lines)
+            
+            elif tool_name == "get_exchange_rate_history":
+                currency_code = tool_input.get("currency", "").upper()
+                result = currency_rates_tool.get_rate_history(
+                    currency_code,
+                    start=tool_input.get("start_date"),
+                    end=tool_input.get("end_date"),
+                    max_points=tool_input.get("max_points") or 20
+                )
+                if result:
+                    return result
+                else:
+                    return f"No exchange rate history available for '{currency_code}' in that date range."
+            
+            else:
+                return f"Unknown tool: {tool_name}"
+        
+        except Exception as e:
+            return f"Error executing {tool_name}: {str(e)}"
+    
+    return list(TOOL_SCHEMAS), tool_handler
+
+
+# Set once the MCP fallback warning has been printed
+_mcp_fallback_warned = False
+
+
+def create_backend_tools(country_currency_tool, currency_rates_tool):
+    """
+    Build the tools and handler for the configured backend (AGENT_TOOL_BACKEND).
+    
+    'local' (default) calls the tools in this process; 'mcp' sends every
+    call to the shared, long-lived MCP server sessions. If the MCP servers
+    cannot start, a warning is printed (once) and the local tools are used.
+    
+    Returns:
+        tuple: (list of tool definitions, tool handler function)
+    """
+    global _mcp_fallback_warned
+    if TOOL_BACKEND == "mcp":
+        try:
+            manager = get_shared_mcp_manager()
+            return manager.get_tools(), manager.call_tool
+        except Exception as e:
+            if not _mcp_fallback_warned:
+                print(f"⚠ MCP tool backend unavailable ({e}); using the local tools")
+                _mcp_fallback_warned = True
+    return create_tools(country_currency_tool, currency_rates_tool)
@@ -1,38 +1,61 @@
-from fastapi import FastAPI, Query
-import pandas as pd
+from fastapi import FastAPI, Query, Request
 import asyncio
 import os
 
+from api.prepared_responses import MAX_PAGE_SIZE, prepare_table, table_response
+from tools.table_reload import TableSource
+
 app = FastAPI(title="Local Country Currency API")
 
-# Load CSV once when server starts
+# Load CSV when server starts, with a hash index per column so filtered
+# lookups do not scan the table, and encode every possible response up
+# front (see api/prepared_responses.py). Edits to the file are picked up
+# in the background without a restart (see tools/table_reload.py).
 csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "country_currency.csv")
-df_country_currency = pd.read_csv(csv_path)
+source = TableSource(csv_path, prepare=prepare_table)
+source.start_watching()
 
 @app.get("/")
 async def get_country_currency(
+    request: Request,
     column: str | None = Query(None, description="Column name to filter"),
-    value: str | None = Query(None, description="Value to filter by")
+    value: list[str] | None = Query(None, description="Value to filter by (repeat to match any of several)"),
+    fields: str | None = Query(None, description="Comma-separated columns to return (default: all)"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; the reply becomes {items, next_cursor}"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="'ndjson' streams one row per line")
 ):
     """
     Returns all country currency data, or filtered by column=value.
     Example: /?column=country_name&value=India
     Example: /?column=currency_code&value=USD
+    Example: /?column=country_name&value=India&value=Japan (several values, one request)
+    
+    Example: /?fields=country_name&limit=100 (first page, then &cursor=<next_cursor>)
+    Example: /?format=ndjson (stream every row, one JSON object per line)
+    
+    Plain replies carry an ETag; send it back in If-None-Match to get an
+    empty 304 while the data is unchanged.
     """
     await asyncio.sleep(0)  # async placeholder, non-blocking
     
-    if column and value:
-        if column not in df_country_currency.columns:
-            return {"error": f"Column '{column}' does not exist"}
-        filtered = df_country_currency[df_country_currency[column] == value]
-        return filtered.to_dict(orient="records")
-    
-    return df_country_currency.to_dict(orient="records")
+    # Read the current table once; a reload swaps in a new one without touching it
+    return table_response(request, source.current, column, value, fields, limit, cursor, format)
+
+
+@app.get("/status")
+async def get_status():
+    """
+    Returns the loaded data version, when and how fast it was (re)loaded,
+    and reload failures.
+    """
+    return source.get_status()
 
 
 # To run this API:
 # conda activate mahi_venv
-# python -m uvicorn api.country_currency:app --reload --port 5003
+# python -m uvicorn api.country_currency:app --port 5003
+# (edits to data/country_currency.csv are served within DATA_RELOAD_INTERVAL seconds, no restart needed)
 # Check on browser: http://127.0.0.1:5003/
 # API docs: http://127.0.0.1:5003/docs
 
@@ -0,0 +1,192 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
+from datetime import datetime, timedelta, timezone
+import csv
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+from agent.fast_path import FastPathRouter, build_lookup_index
+
+app = FastAPI(title="Local Message Batches Stand-in")
+
+# Seconds a batch stays "in_progress" before its results are available
+PROCESSING_DELAY = float(os.environ.get("FAKE_BATCH_DELAY", 1))
+
+# Country data used to decide which tools to call (same CSV as the country currency API)
+csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "country_currency.csv")
+with open(csv_path, encoding="utf-8", newline="") as f:
+    router = FastPathRouter(build_lookup_index(list(csv.DictReader(f))))
+
+batches = {}
+batches_lock = threading.Lock()
+
+
+def _input_key(tools, tool_name, default):
+    """Name of the first required input of a tool (main.py uses 'country', the MCP server 'country_name')."""
+    for tool in tools:
+        if tool.get("name") == tool_name:
+            required = tool.get("input_schema", {}).get("required") or []
+            return required[0] if required else default
+    return None
+
+
+def plan_tool_calls(question, tools):
+    """
+    Decide which tools a question needs, like Claude would for simple questions.
+    
+    Returns:
+        list: (tool_name, tool_input) pairs, empty if no tool applies.
+    """
+    matched = router.match(question)
+    if matched:
+        candidates = [matched]
+    else:
+        # Several codes ("compare INR, JPY and GBP") -> one bulk lookup if
+        # the request offers the list tool, else one rate lookup each
+        codes = [code for code in re.findall(r"\b[A-Za-z]{3}\b", question) if code.upper() in router.index["codes"]]
+        codes = list(dict.fromkeys(code.upper() for code in codes))
+        if len(codes) > 1 and _input_key(tools, "get_exchange_rates", None):
+            candidates = [("get_exchange_rates", {"currencies": codes})]
+        else:
+            candidates = [("get_exchange_rate", {"currency": code}) for code in codes]
+    
+    calls = []
+    for tool_name, tool_input in candidates:
+        key = _input_key(tools, tool_name, next(iter(tool_input)))
+        if key is not None:
+            calls.append((tool_name, {key: next(iter(tool_input.values()))}))
+    return calls
+
+
+def respond(params):
+    """
+    Build a Messages API response for one request.
+    
+    The first turn asks for tools when the question needs them; a turn with
+    tool results answers with the results' text.
+    """
+    last = params["messages"][-1]
+    content = last["content"]
+    blocks = [{"type": "text", "text": content}] if isinstance(content, str) else content
+    
+    tool_results = [block for block in blocks if block.get("type") == "tool_result"]
+    if tool_results:
+        texts = []
+        for block in tool_results:
+            result = block.get("content", "")
+            if isinstance(result, list):
+                result = " ".join(part.get("text", "") for part in result)
+            texts.append(str(result))
+        content_out, stop_reason = [{"type": "text", "text": " ".join(texts)}], "end_turn"
+    else:
+        question = " ".join(block.get("text", "") for block in blocks if block.get("type") == "text")
+        calls = plan_tool_calls(question, params.get("tools") or [])
+        if calls:
+            content_out = [
+                {"type": "tool_use", "id": f"toolu_fake_{uuid.uuid4().hex[:16]}", "name": name, "input": tool_input}
+                for name, tool_input in calls
+            ]
+            stop_reason = "tool_use"
+        else:
+            content_out = [{"type": "text", "text": "I can only help with country currencies and exchange rates."}]
+            stop_reason = "end_turn"
+    
+    # Rough token counts (about 4 characters per token)
+    return {
+        "id": f"msg_fake_{uuid.uuid4().hex[:16]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "fake"),
+        "content": content_out,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": len(json.dumps(params)) // 4,
+            "output_tokens": len(json.dumps(content_out)) // 4,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0
+        }
+    }
+
+
+def _batch_view(batch, base_url):
+    """Batch object as returned by the API, with the status it has right now."""
+    ended = time.time() >= batch["ready_at"]
+    count = len(batch["results"])
+    errored = sum(1 for item in batch["results"] if item["result"]["type"] == "errored")
+    created = datetime.fromtimestamp(batch["created_at"], tz=timezone.utc)
+    return {
+        "id": batch["id"],
+        "type": "message_batch",
+        "processing_status": "ended" if ended else "in_progress",
+        "request_counts": {
+            "processing": 0 if ended else count,
+            "succeeded": count - errored if ended else 0,
+            "errored": errored if ended else 0,
+            "canceled": 0,
+            "expired": 0
+        },
+        "created_at": created.isoformat(),
+        "expires_at": (created + timedelta(hours=24)).isoformat(),
+        "ended_at": datetime.fromtimestamp(batch["ready_at"], tz=timezone.utc).isoformat() if ended else None,
+        "archived_at": None,
+        "cancel_initiated_at": None,
+        "results_url": f"{base_url}v1/messages/batches/{batch['id']}/results" if ended else None
+    }
+
+
+@app.post("/v1/messages")
+async def create_message(request: Request):
+    """Single message (non-streaming only)."""
+    params = await request.json()
+    if params.get("stream"):
+        raise HTTPException(status_code=400, detail="Streaming is not supported by the stand-in server")
+    return respond(params)
+
+
+@app.post("/v1/messages/batches")
+async def create_batch(request: Request):
+    """Create a batch; its results become available after PROCESSING_DELAY seconds."""
+    body = await request.json()
+    results = []
+    for item in body.get("requests", []):
+        try:
+            result = {"type": "succeeded", "message": respond(item["params"])}
+        except Exception as e:
+            result = {"type": "errored", "error": {"type": "error", "error": {"type": "invalid_request_error", "message": str(e)}}}
+        results.append({"custom_id": item.get("custom_id"), "result": result})
+    
+    now = time.time()
+    batch = {"id": f"msgbatch_fake_{uuid.uuid4().hex[:16]}", "created_at": now, "ready_at": now + PROCESSING_DELAY, "results": results}
+    with batches_lock:
+        batches[batch["id"]] = batch
+    return _batch_view(batch, str(request.base_url))
+
+
+@app.get("/v1/messages/batches/{batch_id}")
+async def retrieve_batch(batch_id: str, request: Request):
+    """Current status of a batch."""
+    batch = batches.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return _batch_view(batch, str(request.base_url))
+
+
+@app.get("/v1/messages/batches/{batch_id}/results")
+async def batch_results(batch_id: str):
+    """Results of an ended batch, one JSON object per line."""
+    batch = batches.get(batch_id)
+    if batch is None or time.time() < batch["ready_at"]:
+        raise HTTPException(status_code=404, detail=f"No results for batch {batch_id}")
+    body = "\n".join(json.dumps(item) for item in batch["results"]) + "\n"
+    return Response(content=body, media_type="application/binary")
+
+
+# To run this stand-in server:
+# python -m uvicorn api.fake_batch_server:app --port 5010
+# Then point the agent at it:
+# LLM_BASE_URL=http://127.0.0.1:5010 python main.py --batch questions.txt --bulk
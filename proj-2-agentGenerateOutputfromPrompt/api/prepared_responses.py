@@ -0,0 +1,255 @@
+"""
+Pre-serialized JSON responses with strong ETags for the country APIs.
+
+The table only changes when its CSV does, so every response the services
+can give (the full table and the records for each column value) is
+encoded to JSON bytes once at load time, with an ETag derived from those
+bytes. A request is then a dict lookup plus, when the client already has
+the current version (`If-None-Match`), an empty 304 reply.
+
+Pages (`limit`/`cursor`), column subsets (`fields`) and NDJSON streams
+are built per request by table_response(), which encodes one page or one
+chunk of rows at a time, so the reply never needs a second full copy of
+a large table.
+
+orjson is used for encoding when it is installed (several times faster
+than the json module); otherwise the standard library produces the same
+compact JSON.
+"""
+
+import base64
+import hashlib
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+try:
+    import orjson
+    
+    def dumps(obj):
+        """Encode an object as compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+    
+    def dumps(obj):
+        """Encode an object as compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(body):
+    """Strong ETag for a response body (a quoted content hash)."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class PreparedBody:
+    """Encoded JSON body plus its ETag."""
+    __slots__ = ("body", "etag")
+    
+    def __init__(self, body, etag=None):
+        self.body = body
+        self.etag = etag or make_etag(body)
+
+
+EMPTY_LIST = PreparedBody(b"[]")
+
+
+class PreparedTable:
+    """
+    Encoded responses for an IndexedTable: the full table and one body per
+    (column, value) key.
+    """
+    def __init__(self, table):
+        """
+        Encode every response of the table.
+        
+        Args:
+            table (IndexedTable): The table to serve.
+        """
+        self.table = table
+        self.full = PreparedBody(dumps(table.rows))
+        self.keys = {
+            column: {value: PreparedBody(dumps(records)) for value, records in index.items()}
+            for column, index in table.indexes.items()
+        }
+    
+    def lookup(self, column, values):
+        """
+        Get the encoded records whose `column` equals any of `values`.
+        
+        Same matches and order as IndexedTable.lookup(). Several values are
+        answered by splicing the per-value bodies together.
+        
+        Args:
+            column (str): Column to match (must exist).
+            values (list): Values to match; duplicates are ignored.
+        
+        Returns:
+            PreparedBody: The encoded JSON array.
+        """
+        bodies = self.keys[column]
+        if len(values) == 1:
+            return bodies.get(values[0], EMPTY_LIST)
+        # Each body is '[...]'; join the insides of the non-empty ones
+        parts = [bodies[value].body[1:-1] for value in dict.fromkeys(values) if value in bodies]
+        if not parts:
+            return EMPTY_LIST
+        return PreparedBody(b"[" + b",".join(parts) + b"]")
+
+
+class PreparedMappedTable:
+    """
+    Same interface as PreparedTable for a MappedTable (tools/columnar.py).
+    
+    The compiled file already holds the encoded table and rows, so nothing
+    is encoded up front: the full reply is sent straight from the mapping
+    and lookups splice the matching rows' bytes together.
+    """
+    def __init__(self, table):
+        """
+        Args:
+            table (MappedTable): The mapped table to serve.
+        """
+        self.table = table
+        self.full = PreparedBody(table.full_json(), etag=table.etag)
+    
+    def lookup(self, column, values):
+        """Same as PreparedTable.lookup()."""
+        row_ids = self.table.lookup_ids(column, values)
+        if not row_ids:
+            return EMPTY_LIST
+        return PreparedBody(b"[" + b",".join(self.table.row_json(row_id) for row_id in row_ids) + b"]")
+
+
+def prepare_table(table, data_format):
+    """
+    Build the prepared responses of a freshly loaded table (the prepare
+    step of tools.table_reload.TableSource).
+    
+    Args:
+        table: The loaded IndexedTable or MappedTable.
+        data_format (str): 'csv' or 'columnar', the format it was loaded from.
+    
+    Returns:
+        PreparedTable or PreparedMappedTable: The table with its encoded replies.
+    """
+    return PreparedMappedTable(table) if data_format == "columnar" else PreparedTable(table)
+
+
+def _etag_matches(if_none_match, etag):
+    """Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def json_response(request, prepared):
+    """
+    Reply with a prepared body, or 304 Not Modified if the client has it.
+    
+    Args:
+        request (Request): The incoming request (for If-None-Match).
+        prepared (PreparedBody): Body to send.
+    
+    Returns:
+        Response: 200 with the JSON body, or an empty 304, both carrying the ETag.
+    """
+    # no-cache: clients may keep the body but must revalidate before reuse
+    headers = {"ETag": prepared.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), prepared.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=prepared.body, media_type="application/json", headers=headers)
+
+
+# Largest page a client may ask for, and rows encoded per NDJSON chunk
+MAX_PAGE_SIZE = 1000
+NDJSON_CHUNK_ROWS = 256
+
+
+def encode_cursor(offset):
+    """Opaque cursor for the row position where the next page starts."""
+    return base64.urlsafe_b64encode(f"row:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Row position of a cursor from encode_cursor(); raises ValueError if invalid."""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    prefix, _, offset = text.partition(":")
+    if prefix != "row" or not offset.isdigit():
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return int(offset)
+
+
+def _ndjson_chunks(rows, start, end, fields):
+    """Encode rows[start:end] as NDJSON, a chunk of rows at a time."""
+    for chunk_start in range(start, end, NDJSON_CHUNK_ROWS):
+        chunk = rows[chunk_start:min(chunk_start + NDJSON_CHUNK_ROWS, end)]
+        if fields:
+            chunk = [{field: row[field] for field in fields} for row in chunk]
+        yield b"".join(dumps(row) + b"\n" for row in chunk)
+
+
+def table_response(request, responses, column=None, value=None, fields=None, limit=None, cursor=None, format="json"):
+    """
+    Answer a country API request from a PreparedTable.
+    
+    Without fields, limit, cursor or format the prepared body is sent (with
+    ETag/304 handling). Otherwise the matching rows are:
+    - projected to `fields` (comma-separated column names), and
+    - with `limit` and/or `cursor`, sent one page at a time as
+      {"items": [...], "next_cursor": "..." or null}, or
+    - with format=ndjson, streamed one JSON object per line; the cursor of
+      the next page (if any) is in the X-Next-Cursor header.
+    
+    Args:
+        request (Request): The incoming request.
+        responses (PreparedTable): The table and its prepared bodies.
+        column (str): Column to filter on (optional).
+        value (list): Values to match in `column` (optional).
+        fields (str): Comma-separated columns to return (optional).
+        limit (int): Page size (optional).
+        cursor (str): next_cursor of the previous page (optional).
+        format (str): 'json' or 'ndjson'.
+    
+    Returns:
+        Response or dict: The reply, or {"error": ...} for a bad request.
+    """
+    table = responses.table
+    filtered = bool(column and value)
+    if filtered and not table.has_column(column):
+        return {"error": f"Column '{column}' does not exist"}
+    
+    if not fields and limit is None and cursor is None and format == "json":
+        return json_response(request, responses.lookup(column, value) if filtered else responses.full)
+    
+    names = None
+    if fields:
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if not table.has_column(name)]
+        if unknown:
+            return {"error": f"Field(s) {', '.join(unknown)} do not exist"}
+    
+    rows = table.lookup(column, value) if filtered else table.rows
+    try:
+        start = decode_cursor(cursor) if cursor else 0
+    except ValueError as e:
+        return {"error": str(e)}
+    end = len(rows) if limit is None else min(start + limit, len(rows))
+    next_cursor = encode_cursor(end) if end < len(rows) else None
+    
+    if format == "ndjson":
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return StreamingResponse(_ndjson_chunks(rows, start, end, names), media_type="application/x-ndjson", headers=headers)
+    
+    page = rows[start:end]
+    if names:
+        page = [{name: row[name] for name in names} for row in page]
+    if limit is None and cursor is None:
+        return Response(content=dumps(page), media_type="application/json")
+    return Response(content=dumps({"items": page, "next_cursor": next_cursor}), media_type="application/json")
@@ -2,14 +2,27 @@
 Streamlit UI for Currency & Country Analysis Agent
 
 Run with: streamlit run app.py
+Startup profile (import time per module): python app.py --startup-profile
 """
 
+import sys
+
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    from startup_profile import print_startup_profile
+    print_startup_profile("app")
+    sys.exit(0)
+
 import streamlit as st
 import os
+import time
 from datetime import datetime
 from dotenv import load_dotenv
-from agent.agent import load_config, create_llm_client, run_agent_conversation
-from tools.currency_rates_tool import CurrencyRatesTool
+from agent.agent import load_config, create_llm_client, stream_agent_conversation, add_usage, cache_hit_ratio
+from agent.tool_cache import get_shared_tool_cache, format_cache_stats
+from agent.fast_path import FAST_PATH_ENABLED, PATH_AGENT, PATH_FAST, get_shared_router
+from agent.mcp_client import TOOL_BACKEND, get_shared_mcp_manager
+from agent.tools_registry import create_backend_tools
+from tools.currency_rates_tool import get_shared_rates_tool
 from tools.country_currency_tool import CountryCurrencyTool
 
 # Page configuration
@@ -51,6 +64,8 @@ if 'llm_client' not in st.session_state:
     st.session_state.llm_client = None
 if 'model' not in st.session_state:
     st.session_state.model = None
+if 'token_usage' not in st.session_state:
+    st.session_state.token_usage = {}
 
 
 @st.cache_resource
@@ -63,81 +78,62 @@ def initialize_agent():
         # Create LLM client
         llm_client = create_llm_client(api_key)
         
+        # Start keeping exchange rates warm in the background
+        get_shared_rates_tool()
+        
+        # Start the MCP server once; its sessions are reused by every question
+        if TOOL_BACKEND == "mcp":
+            get_shared_mcp_manager()
+        
         return llm_client, model, None
     except Exception as e:
         return None, None, str(e)
 
 
-def get_agent_response(user_input, llm_client, model):
-    """Get response from the agent."""
-    # Initialize tool instances
-    currency_rates_tool = CurrencyRatesTool()
+def get_agent_response(user_input, llm_client, model, stats=None):
+    """
+    Get response from the agent as a stream of events.
+    
+    Yields the events of stream_agent_conversation(): 'text' pieces as
+    Claude writes them, 'tool_use' / 'tool_result' for each tool call and
+    a final 'done' event with the answer and its timings. The 'done' event
+    also has 'path': 'fast_path' if the question was answered without the
+    LLM, else 'agent'.
+    """
+    started = time.perf_counter()
+    # Initialize tool instances (the rates tool is shared and kept warm in the background)
+    currency_rates_tool = get_shared_rates_tool()
     country_currency_tool = CountryCurrencyTool()
     
-    # Define tools schema for Claude
-    tools = [
-        {
-            "name": "get_currency_by_country",
-            "description": "Get the official currency used by a specific country. Returns currency name and code.",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "country": {
-                        "type": "string",
-                        "description": "The country name (e.g., 'India', 'United States', 'Japan')"
-                    }
-                },
-                "required": ["country"]
-            }
-        },
-        {
-            "name": "get_exchange_rate",
-            "description": "Get the current live exchange rate for a specific currency relative to USD from the public API.",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "currency": {
-                        "type": "string",
-                        "description": "The currency code (e.g., 'EUR', 'INR', 'GBP', 'JPY')"
-                    }
-                },
-                "required": ["currency"]
-            }
-        }
-    ]
+    # Repeated tool calls (within and across questions) are answered from this cache
+    tool_cache = get_shared_tool_cache()
     
-    # Define tool handler function
-    def tool_handler(tool_name, tool_input):
-        """Execute the requested tool and return results."""
-        try:
-            if tool_name == "get_currency_by_country":
-                country = tool_input.get("country", "")
-                result = country_currency_tool.get_by_country_name(country)
-                if result:
-                    return f"The currency of {country} is {result.get('currency_name', 'Unknown')} ({result.get('currency_code', 'N/A')})."
-                else:
-                    return f"Could not find currency information for '{country}'. Please check the country name."
-            
-            elif tool_name == "get_exchange_rate":
-                currency_code = tool_input.get("currency", "").upper()
-                result = currency_rates_tool.get_rate(currency_code)
-                if result and 'rate' in result:
-                    rate = result['rate']
-                    base = result.get('base', 'USD')
-                    return f"The current exchange rate for {currency_code} is 1 {base} = {rate} {currency_code}."
-                else:
-                    return f"Could not fetch exchange rate for '{currency_code}'. Please check the currency code."
-            
-            else:
-                return f"Unknown tool: {tool_name}"
-        
-        except Exception as e:
-            return f"Error executing {tool_name}: {str(e)}"
+    # Same tools and handler as the command line (main.py), for the
+    # configured backend (AGENT_TOOL_BACKEND)
+    tools, tool_handler = create_backend_tools(country_currency_tool, currency_rates_tool)
+    cached_tool_handler = tool_cache.wrap(tool_handler)
+    
+    # The router's index of the local data also tells the cache which country names exist
+    router = get_shared_router(country_currency_tool, currency_rates_tool) if TOOL_BACKEND != "mcp" else None
+    if router is not None:
+        tool_cache.set_country_names(router.country_names())
     
-    # Call the agent conversation function with tools and handler
-    result = run_agent_conversation(llm_client, model, tools, user_input, tool_handler)
+    # Simple lookups are answered straight from the local tools, without any LLM call
+    if FAST_PATH_ENABLED and router is not None:
+        answer = router.answer(user_input, cached_tool_handler)
+        if answer is not None:
+            elapsed = time.perf_counter() - started
+            yield {"type": "text", "text": answer}
+            yield {"type": "done", "answer": answer, "ttft_seconds": elapsed, "total_seconds": elapsed,
+                   "usage": {}, "path": PATH_FAST}
+            return
+        router.record(PATH_AGENT)
     
-    return result
+    # Stream the agent conversation with tools and handler
+    for event in stream_agent_conversation(llm_client, model, tools, user_input, cached_tool_handler, stats):
+        if event["type"] == "done":
+            event["path"] = PATH_AGENT
+        yield event
 
 
 # Main UI
@@ -153,6 +149,7 @@ def main():
         This AI agent can help you with:
         - Currency information by country
         - Live exchange rates (vs USD)
+        - Exchange rate trends over time
         - Country and currency details
         
         **Powered by:**
@@ -168,7 +165,8 @@ def main():
             "What currency does Japan use?",
             "EUR to USD rate",
             "Tell me about German currency",
-            "Exchange rate for British Pound"
+            "Exchange rate for British Pound",
+            "How has INR moved this quarter?"
         ]
         
         for example in examples:
@@ -177,8 +175,25 @@ def main():
         
         st.divider()
         
+        if st.session_state.token_usage:
+            st.header("🧠 Token Usage")
+            usage = st.session_state.token_usage
+            st.caption(
+                f"Input: {usage['input_tokens']} · Output: {usage['output_tokens']}  \n"
+                f"Cache read: {usage['cache_read_input_tokens']} · Cache written: {usage['cache_creation_input_tokens']}  \n"
+                f"Cache hit ratio: {cache_hit_ratio(usage):.0%}"
+            )
+            st.divider()
+        
+        cache_stats = get_shared_tool_cache().get_stats()
+        if cache_stats:
+            st.header("🗃️ Tool Cache")
+            st.caption("  \n".join(format_cache_stats(cache_stats)))
+            st.divider()
+        
         if st.button("🗑️ Clear History", use_container_width=True):
             st.session_state.conversation_history = []
+            st.session_state.token_usage = {}
             st.rerun()
     
     # Initialize agent
@@ -208,7 +223,12 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             
-            st.caption(f"⏰ {entry['timestamp']}")
+            timing = " · ⚡ fast path" if entry.get('path') == PATH_FAST else ""
+            if entry.get('total_seconds') is not None:
+                ttft = entry.get('ttft_seconds')
+                timing += f" · first token {ttft:.2f}s" if ttft is not None else ""
+                timing += f" · ⏱ total {entry['total_seconds']:.2f}s"
+            st.caption(f"⏰ {entry['timestamp']}{timing}")
             st.divider()
     
     # Input area
@@ -232,23 +252,50 @@ def main():
         if 'current_input' in st.session_state:
             del st.session_state.current_input
         
-        with st.spinner("🔄 Processing your request..."):
-            try:
-                # Get agent response
-                response = get_agent_response(user_input, llm_client, model)
-                
-                # Add to conversation history
-                st.session_state.conversation_history.append({
-                    'question': user_input,
-                    'response': response,
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-                
-                # Rerun to display new message
-                st.rerun()
-                
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+        # Show the answer as it is generated instead of behind a spinner
+        status = st.empty()
+        answer_box = st.empty()
+        status.caption("🔄 Processing your request...")
+        try:
+            text = ""
+            tool_lines = []
+            done = None
+            
+            # Get agent response
+            for event in get_agent_response(user_input, llm_client, model):
+                if event["type"] == "text":
+                    text += event["text"]
+                    answer_box.markdown(text + "▌")
+                elif event["type"] == "tool_use":
+                    # Text before a tool call is Claude thinking aloud, not the answer
+                    text = ""
+                    tool_lines.append(f"🔧 {event['name']}")
+                    status.caption("  \n".join(tool_lines))
+                elif event["type"] == "tool_result":
+                    mark = "✓" if event["ok"] else "✗"
+                    tool_lines.append(f"{mark} {event['name']} ({event['seconds']:.2f}s)")
+                    status.caption("  \n".join(tool_lines))
+                elif event["type"] == "done":
+                    done = event
+            
+            # Keep token usage (including prompt cache hits) for this session
+            add_usage(st.session_state.token_usage, done["usage"])
+            
+            # Add to conversation history
+            st.session_state.conversation_history.append({
+                'question': user_input,
+                'response': done["answer"],
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'ttft_seconds': done["ttft_seconds"],
+                'total_seconds': done["total_seconds"],
+                'path': done["path"]
+            })
+            
+            # Rerun to display new message
+            st.rerun()
+        
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
     
     # Show instructions if no history
     if not st.session_state.conversation_history:
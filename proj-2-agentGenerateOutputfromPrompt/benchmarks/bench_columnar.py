@@ -0,0 +1,96 @@
+"""
+Benchmark: loading a reference table from CSV vs the compiled columnar file.
+
+Writes a synthetic country/currency CSV (--rows rows), compiles it with
+tools.columnar, then in fresh processes times how long each format takes to
+become ready for lookups (TableSource load, as the services and the
+embedded tools do) and how much memory the process holds afterwards.
+"anonymous" is memory no other process can share (the parsed table);
+the mapped file's pages are in the OS page cache and shared, so N workers
+pay for them once. Lookup latency is shown for both formats.
+
+Memory figures need Linux (/proc/self/smaps_rollup).
+
+Run with: python benchmarks/bench_columnar.py [--rows N]
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+
+# Add parent directory to path to import the API modules
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+from tools.columnar import compile_table
+
+# Code run in each child process; prints load ms, lookup us, rss and anonymous KB
+CHILD_CODE = """
+import sys, time
+sys.path.insert(0, {project_dir!r})
+from tools.table_reload import TableSource
+prepare = None
+if {prepare!r}:
+    from api.prepared_responses import prepare_table as prepare  # FastAPI import, not part of the load
+
+def memory_kb():
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict((line.split(":")[0], int(line.split()[1])) for line in f if line.split()[-1] == "kB")
+        return fields["Rss"], fields["Anonymous"]
+    except OSError:
+        return 0, 0
+
+rss_before, anonymous_before = memory_kb()
+start = time.perf_counter()
+source = TableSource({csv_path!r}, prepare=prepare, data_format={data_format!r})
+load_ms = (time.perf_counter() - start) * 1000
+
+table = source.current if not {prepare!r} else source.current.table
+start = time.perf_counter()
+for i in range(1000):
+    table.lookup("country_name", ["Country " + str(i * 7919 % {rows})])
+lookup_us = (time.perf_counter() - start) * 1000
+
+rss_after, anonymous_after = memory_kb()
+print(f"{{load_ms:.3f}} {{lookup_us:.3f}} {{rss_after - rss_before}} {{anonymous_after - anonymous_before}}")
+"""
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["country_name", "currency_name", "currency_code", "region", "numeric_code"])
+        for i in range(rows):
+            writer.writerow([f"Country {i}", f"Currency {i // 10}", f"C{i // 10:05d}", f"Region {i % 23}", f"{i:06d}"])
+
+
+def measure(csv_path, rows, data_format, prepare):
+    code = CHILD_CODE.format(project_dir=PROJECT_DIR, csv_path=csv_path, rows=rows, data_format=data_format, prepare=prepare)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    load_ms, lookup_us, rss_kb, anonymous_kb = output.split()
+    return float(load_ms), float(lookup_us), int(rss_kb), int(anonymous_kb)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "reference.csv")
+        write_csv(csv_path, args.rows)
+        out_path = compile_table(csv_path)
+        print(f"{args.rows} rows: CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+              f"compiled {os.path.getsize(out_path) / 1e6:.1f} MB\n")
+        
+        print(" format    | user          | load (ms) | lookup (us) | rss (MB) | anonymous (MB)")
+        print("-" * 80)
+        for prepare, user in ((False, "embedded tool"), (True, "API worker")):
+            for data_format in ("csv", "columnar"):
+                load_ms, lookup_us, rss_kb, anonymous_kb = measure(csv_path, args.rows, data_format, prepare)
+                print(f" {data_format:<9} | {user:<13} | {load_ms:>9.1f} | {lookup_us:>11.2f} | "
+                      f"{rss_kb / 1024:>8.1f} | {anonymous_kb / 1024:>14.1f}")
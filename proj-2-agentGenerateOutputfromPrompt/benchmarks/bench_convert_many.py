@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: scalar CurrencyRatesTool.convert() vs vectorized convert_many().
+
+Uses a synthetic 160-currency rate payload so it runs offline and
+measures only the conversion work, not the network.
+
+Run with: python benchmarks/bench_convert_many.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path to import tools
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.currency_rates_tool import CurrencyRatesTool
+
+
+def make_payload(currency_count=160, seed=42):
+    """Build a fake open.er-api.com payload with random rates."""
+    rng = np.random.default_rng(seed)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    # Three-letter codes like the real ISO 4217 ones: "AAA", "AAB", ...
+    codes = ["USD"] + [
+        letters[i // 676] + letters[(i // 26) % 26] + letters[i % 26]
+        for i in range(currency_count - 1)
+    ]
+    rates = {code: float(rate) for code, rate in zip(codes, rng.uniform(0.01, 20000, currency_count))}
+    rates["USD"] = 1.0
+    now = int(time.time())
+    return {
+        "result": "success",
+        "base_code": "USD",
+        "time_last_update_unix": now,
+        "time_next_update_unix": now + 86400,
+        "time_last_update_utc": "benchmark",
+        "rates": rates
+    }
+
+
+class OfflineRatesTool(CurrencyRatesTool):
+    """CurrencyRatesTool that serves a fixed payload instead of calling the API."""
+    def __init__(self, payload):
+        super().__init__()
+        self.payload = payload
+    
+    def _fetch_data(self):
+        return self.payload
+
+
+def run(rows, tool, rng):
+    codes = np.array(list(tool.get_rates_only().keys()))
+    amounts = np.round(rng.uniform(0, 100000, rows), 2)
+    from_codes = codes[rng.integers(0, len(codes), rows)]
+    to_codes = codes[rng.integers(0, len(codes), rows)]
+    
+    start = time.perf_counter()
+    scalar = [
+        tool.convert(amount, from_code, to_code)["converted_amount"]
+        for amount, from_code, to_code in zip(amounts.tolist(), from_codes.tolist(), to_codes.tolist())
+    ]
+    scalar_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = tool.convert_many(amounts, from_codes, to_codes)
+    batch_seconds = time.perf_counter() - start
+    
+    index = tool.get_currency_index()
+    from_index = np.array([index[c] for c in from_codes.tolist()])
+    to_index = np.array([index[c] for c in to_codes.tolist()])
+    start = time.perf_counter()
+    tool.convert_many(amounts, from_index, to_index)
+    indexed_seconds = time.perf_counter() - start
+    
+    identical = np.array_equal(np.array(scalar), batch["converted_amount"])
+    print(f"{rows:>9,} | {scalar_seconds * 1000:>11.1f} | {batch_seconds * 1000:>10.1f} | "
+          f"{indexed_seconds * 1000:>10.1f} | {scalar_seconds / batch_seconds:>7.1f}x | {identical}")
+
+
+if __name__ == "__main__":
+    tool = OfflineRatesTool(make_payload())
+    rng = np.random.default_rng(0)
+    
+    # The cross-rate matrix is built once per snapshot; keep that out of the timings
+    tool.get_currency_index()
+    
+    print("     rows | scalar (ms) | codes (ms) | index (ms) | speedup | identical")
+    print("-" * 72)
+    for rows in (1_000, 100_000, 1_000_000):
+        run(rows, tool, rng)
@@ -0,0 +1,91 @@
+"""
+Benchmark: per-lookup latency of CountryCurrencyTool, HTTP vs embedded.
+
+Starts api/country_currency.py with uvicorn on a free local port and times
+the same get_by_country_name() lookups through both backends:
+- http: pooled keep-alive request to the local API (repeat lookups are
+  answered with 304 Not Modified, as in normal use);
+- embedded: the same indexed table loaded in this process.
+
+Run with: python benchmarks/bench_data_backend.py [--lookups N]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+# Add parent directory to path to import tools
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+import requests
+
+from tools.country_currency_tool import CountryCurrencyTool
+
+COUNTRIES = ["India", "Japan", "Germany", "United States", "United Kingdom", "Atlantis"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(port):
+    """Start the country currency API and wait until it answers."""
+    env = dict(os.environ, DATA_RELOAD_INTERVAL="0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.country_currency:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_DIR, env=env
+    )
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/status", timeout=1)
+            return process
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("The country currency API did not start")
+
+
+def time_lookups(tool, lookups):
+    """Return per-lookup latencies in microseconds."""
+    latencies = []
+    for i in range(lookups):
+        start = time.perf_counter()
+        tool.get_by_country_name(COUNTRIES[i % len(COUNTRIES)])
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    
+    port = free_port()
+    api = start_api(port)
+    try:
+        http_tool = CountryCurrencyTool(base_url=f"http://127.0.0.1:{port}", backend="http")
+        embedded_tool = CountryCurrencyTool(backend="embedded")
+        for name in COUNTRIES:
+            assert http_tool.get_by_country_name(name) == embedded_tool.get_by_country_name(name)
+        
+        print(f"{args.lookups} get_by_country_name() lookups per backend")
+        print(" backend  |  mean (us) |   p50 (us) |   p95 (us)")
+        print("-" * 48)
+        results = {}
+        for label, tool in (("http", http_tool), ("embedded", embedded_tool)):
+            latencies = sorted(time_lookups(tool, args.lookups))
+            results[label] = statistics.mean(latencies)
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f" {label:<8} | {results[label]:>10.1f} | {statistics.median(latencies):>10.1f} | {p95:>10.1f}")
+        print(f"\nEmbedded lookups are {results['http'] / results['embedded']:.0f}x faster")
+    finally:
+        api.terminate()
+        api.wait()
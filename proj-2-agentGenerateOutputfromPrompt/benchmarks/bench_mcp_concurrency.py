@@ -0,0 +1,99 @@
+"""
+Load test: concurrent tool calls against one MCP server process.
+
+Starts mcp_server/server.py through MCPClientManager (one server, one
+session) and points its country tool at a local stand-in API that takes
+--delay seconds per request, so the timings only depend on how the server
+schedules calls. The same number of get_currency_by_country calls is sent
+one at a time and then all at once; with concurrent tool handling the
+burst finishes in about ceil(calls / limit) * delay instead of
+calls * delay. The server's peak in-flight and queued counts are read
+from its stats://tools resource.
+
+Run with: python benchmarks/bench_mcp_concurrency.py [--calls N] [--delay SECONDS]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Add parent directory to path to import the agent
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.mcp_client import MCPClientManager
+
+
+def start_slow_country_api(delay):
+    """Serve country lookups on a free local port, each taking `delay` seconds."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            value = parse_qs(urlparse(self.path).query).get("value", ["Testland"])[0]
+            body = json.dumps([{"country_name": value, "currency_name": "Test dollar", "currency_code": "TSD"}])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode())
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(manager, calls, concurrency):
+    """Send `calls` tool calls, `concurrency` at a time; return (wall seconds, call latencies)."""
+    def one_call(i):
+        start = time.perf_counter()
+        result = manager.call_tool("get_currency_by_country", {"country_name": f"Country {i}"})
+        if '"success": true' not in result:
+            raise RuntimeError(f"Tool call failed: {result}")
+        return time.perf_counter() - start
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one_call, range(calls)))
+    return time.perf_counter() - start, latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds the stand-in API takes per request")
+    parser.add_argument("--limit", type=int, default=16, help="MCP_TOOL_CONCURRENCY for the server")
+    args = parser.parse_args()
+    
+    api = start_slow_country_api(args.delay)
+    # The server process inherits these settings
+    os.environ["COUNTRY_API_URL"] = f"http://127.0.0.1:{api.server_address[1]}"
+    os.environ["MCP_TOOL_CONCURRENCY"] = str(args.limit)
+    
+    manager = MCPClientManager(pool_size=1, health_interval=0).start()
+    try:
+        # Warm up the server's connection pool
+        run(manager, 1, 1)
+        
+        print(f"{args.calls} calls, {args.delay}s each, per-tool limit {args.limit}")
+        print(" concurrency | wall (s) | p50 call (s) | calls/s")
+        print("-" * 48)
+        for concurrency in (1, args.calls):
+            wall, latencies = run(manager, args.calls, concurrency)
+            print(f"{concurrency:>12} | {wall:>8.2f} | {statistics.median(latencies):>12.3f} | {args.calls / wall:>7.1f}")
+        
+        for server in manager.get_server_stats():
+            tool = server["tools"].get("get_currency_by_country", {})
+            print(f"\nServer {server['index']}: peak {tool.get('max_in_flight')} in flight, "
+                  f"peak {tool.get('max_queued')} queued, {tool.get('timeouts')} timeouts")
+    finally:
+        manager.close()
+        api.shutdown()
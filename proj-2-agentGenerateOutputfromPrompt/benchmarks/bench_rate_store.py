@@ -0,0 +1,89 @@
+"""
+Benchmark: cold start of CurrencyRatesTool with and without the on-disk store.
+
+Each measurement runs in a fresh Python process and times how long it
+takes from creating the tool to answering the first get_rate() call:
+- without a store, the first call waits on the rates API;
+- with a store, the latest saved snapshot is loaded from SQLite.
+
+Run with: python benchmarks/bench_rate_store.py [--api-url URL] [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import tools
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+from tools.currency_rates_tool import CurrencyRatesTool
+from tools.rate_store import RateSnapshotStore
+
+# Code run in each child process; prints the time to first answer in ms
+CHILD_CODE = """
+import sys, time
+sys.path.insert(0, {project_dir!r})
+from tools.currency_rates_tool import CurrencyRatesTool
+from tools.rate_store import RateSnapshotStore
+
+start = time.perf_counter()
+store = RateSnapshotStore({store_path!r}) if {use_store!r} else None
+tool = CurrencyRatesTool(api_url={api_url!r}, store=store)
+if store is not None:
+    tool.start_background_refresh()
+result = tool.get_rate("EUR")
+elapsed = (time.perf_counter() - start) * 1000
+print(f"{{elapsed:.3f}} {{bool(result)}}")
+"""
+
+
+def cold_start(api_url, store_path, use_store):
+    """Run one fresh process and return (milliseconds, answered)."""
+    code = CHILD_CODE.format(project_dir=PROJECT_DIR, store_path=store_path, use_store=use_store, api_url=api_url)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout
+    elapsed, answered = output.strip().splitlines()[-1].split()
+    return float(elapsed), answered == "True"
+
+
+def report(label, samples):
+    times = [ms for ms, _ in samples]
+    answered = sum(1 for _, ok in samples if ok)
+    print(f"{label:<22} median {statistics.median(times):>9.2f} ms | "
+          f"min {min(times):>9.2f} ms | answered {answered}/{len(samples)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-url", default="https://open.er-api.com/v6/latest/USD")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = os.path.join(tmp, "rates_store.sqlite3")
+        
+        # Seed the store with one real fetch
+        seed_tool = CurrencyRatesTool(api_url=args.api_url, store=RateSnapshotStore(store_path))
+        if not seed_tool.get_rate("EUR"):
+            print("Could not fetch rates to seed the store; check --api-url or your connection.")
+            sys.exit(1)
+        
+        # Loader only, in this process
+        store = RateSnapshotStore(store_path)
+        start = time.perf_counter()
+        for _ in range(100):
+            data, fetched_at = store.load_latest()
+            CurrencyRatesTool()._build_snapshot(data, fetched_at=fetched_at)
+        loader_ms = (time.perf_counter() - start) * 10
+        print(f"Store loader: {loader_ms:.3f} ms per snapshot ({len(data['rates'])} currencies)\n")
+        
+        without_store = [cold_start(args.api_url, store_path, False) for _ in range(args.runs)]
+        with_store = [cold_start(args.api_url, store_path, True) for _ in range(args.runs)]
+    
+    print("Time to first get_rate() in a new process:")
+    report("without store (fetch)", without_store)
+    report("with store (load)", with_store)
@@ -0,0 +1,73 @@
+"""
+Benchmark: column lookups in the country APIs, full scan vs hash index.
+
+Builds synthetic country/currency tables from the size of the sample CSV
+(6 rows) up to 100k rows and times one `?column=country_name&value=...`
+lookup both ways:
+- scan: compare every row, as the services did before (the old pandas
+  version also converted the matches to dicts on every request);
+- index: IndexedTable.lookup(), one dict access per value.
+Index build time (paid once at startup) is shown for reference.
+
+Run with: python benchmarks/bench_table_index.py [--sizes 6 1000 100000] [--lookups N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import the API modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.table_index import IndexedTable
+
+COLUMNS = ["country_name", "currency_name", "currency_code"]
+
+
+def make_rows(size):
+    """Synthetic rows; about 10 countries share each currency."""
+    return [
+        {"country_name": f"Country {i}", "currency_name": f"Currency {i // 10}", "currency_code": f"C{i // 10:05d}"}
+        for i in range(size)
+    ]
+
+
+def scan(rows, column, values):
+    """The old lookup: test every row."""
+    values = set(values)
+    return [row for row in rows if row[column] in values]
+
+
+def time_lookups(lookup, queries):
+    """Return microseconds per lookup."""
+    start = time.perf_counter()
+    for values in queries:
+        lookup("country_name", values)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 100, 1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    
+    print("       rows | build (ms) | scan (us) | index (us) | speedup")
+    print("-" * 60)
+    for size in args.sizes:
+        rows = make_rows(size)
+        start = time.perf_counter()
+        table = IndexedTable(COLUMNS, rows)
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        # Single-country lookups, as the tools send them
+        queries = [[f"Country {random.randrange(size)}"] for _ in range(args.lookups)]
+        for values in queries[:5]:
+            assert scan(rows, "country_name", values) == table.lookup("country_name", values)
+        
+        # Fewer scan repetitions on big tables, they are slow
+        scan_us = time_lookups(lambda column, values: scan(rows, column, values), queries[:max(5, args.lookups * 1000 // size)])
+        index_us = time_lookups(table.lookup, queries)
+        print(f"{size:>11} | {build_ms:>10.2f} | {scan_us:>9.1f} | {index_us:>10.2f} | {scan_us / index_us:>6.0f}x")
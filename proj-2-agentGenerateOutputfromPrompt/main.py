@@ -8,6 +8,11 @@ This file is the starting point of the application. It:
 4. Receives the final result
 5. Writes the result to an output file
 
+Batch mode (many questions, one consolidated CSV):
+    python main.py --batch questions.txt
+    cat questions.jsonl | python main.py --batch -
+    python main.py --batch questions.txt --bulk    (Message Batches API)
+
 For new developers:
 - This is where the application starts
 - Keep this file simple and focused on the main flow
@@ -15,13 +20,26 @@ For new developers:
 """
 
 import os
+import sys
+import math
 import json
 import csv
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from dotenv import load_dotenv
-from agent.agent import load_config, create_llm_client, run_agent_conversation
-from tools.currency_rates_tool import CurrencyRatesTool
+from agent.agent import create_llm_client, run_agent_conversation, get_session_usage, format_usage
+from agent.tool_cache import get_shared_tool_cache, format_cache_stats
+from agent.fast_path import FAST_PATH_ENABLED, PATH_AGENT, PATH_FAST, get_shared_router
+from agent.batch_agent import POLL_INTERVAL, run_batch_conversations
+from agent.mcp_client import TOOL_BACKEND, get_shared_mcp_manager
+from agent.tools_registry import create_backend_tools
+from tools.currency_rates_tool import get_shared_rates_tool
 from tools.country_currency_tool import CountryCurrencyTool
+from startup_profile import PROFILE_FLAG, print_startup_profile
 
 
 # ============================================================================
@@ -59,13 +77,14 @@ def setup_environment():
 def get_user_input():
     """Get question/input from the user."""
     print("\n" + "="*70)
-    print("🤖 AI Agent - Country & Currency Assistant (2 Tools Available)")
+    print("🤖 AI Agent - Country & Currency Assistant (6 Tools Available)")
     print("="*70)
     print("\nWhat would you like to know?")
     print("Examples:")
     print("  - What currency does India use?")
     print("  - What is the exchange rate for EUR?")
     print("  - What is the exchange rate for Japanese Yen?")
+    print("  - How has INR moved this quarter?")
     print("\n")
     
     user_input = input("Your question: ").strip()
@@ -81,7 +100,7 @@ def get_user_input():
 # STEP 3: Run Agent (Process the Input)
 # ============================================================================
 
-def run_agent(user_input, llm_client, model):
+def run_agent(user_input, llm_client, model, stream=True, verbose=True):
     """
     Process user input through the AI agent.
     
@@ -89,81 +108,54 @@ def run_agent(user_input, llm_client, model):
         user_input: The user's question
         llm_client: The Claude LLM client
         model: The model name to use
-        
+        stream: Print Claude's answer as it is generated
+        verbose: Print progress, tool calls and cache stats (batch workers
+                 pass False and only report the batch progress)
+    
     Returns:
-        The agent's response
+        tuple: (the agent's response, path taken: 'fast_path' or 'agent')
     """
-    print("\n🔄 Processing your request...\n")
+    if verbose:
+        print("\n🔄 Processing your request...\n")
     
-    # Initialize tool instances
-    currency_rates_tool = CurrencyRatesTool()
+    # Initialize tool instances (the rates tool is shared and kept warm in the background)
+    currency_rates_tool = get_shared_rates_tool()
     country_currency_tool = CountryCurrencyTool()
     
-    # Define tools schema for Claude
-    tools = [
-        {
-            "name": "get_currency_by_country",
-            "description": "Get the official currency used by a specific country. Returns currency name and code.",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "country": {
-                        "type": "string",
-                        "description": "The country name (e.g., 'India', 'United States', 'Japan')"
-                    }
-                },
-                "required": ["country"]
-            }
-        },
-        {
-            "name": "get_exchange_rate",
-            "description": "Get the current live exchange rate for a specific currency relative to USD from the public API.",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "currency": {
-                        "type": "string",
-                        "description": "The currency code (e.g., 'EUR', 'INR', 'GBP', 'JPY')"
-                    }
-                },
-                "required": ["currency"]
-            }
-        }
-    ]
-    
-    # Define tool handler function
-    def tool_handler(tool_name, tool_input):
-        """Execute the requested tool and return results."""
-        try:
-            if tool_name == "get_currency_by_country":
-                country = tool_input.get("country", "")
-                result = country_currency_tool.get_by_country_name(country)
-                if result:
-                    return f"The currency of {country} is {result.get('currency_name', 'Unknown')} ({result.get('currency_code', 'N/A')})."
-                else:
-                    return f"Could not find currency information for '{country}'. Please check the country name."
-            
-            elif tool_name == "get_exchange_rate":
-                currency_code = tool_input.get("currency", "").upper()
-                result = currency_rates_tool.get_rate(currency_code)
-                if result and 'rate' in result:
-                    rate = result['rate']
-                    base = result.get('base', 'USD')
-                    timestamp = result.get('timestamp', 'Unknown')
-                    return f"The current exchange rate for {currency_code} (Indian Rupee) is 1 {base} = {rate} {currency_code}."
-                else:
-                    return f"Could not fetch exchange rate for '{currency_code}'. Please check the currency code."
-            
-            else:
-                return f"Unknown tool: {tool_name}"
-        
-        except Exception as e:
-            return f"Error executing {tool_name}: {str(e)}"
-    
-    # Call the agent conversation function with tools and handler
-    result = run_agent_conversation(llm_client, model, tools, user_input, tool_handler)
-    
-    return result
+    # Repeated tool calls (within and across questions) are answered from this cache
+    tool_cache = get_shared_tool_cache()
+    
+    # Define tools schema for Claude and the handler that executes them
+    tools, tool_handler = create_backend_tools(country_currency_tool, currency_rates_tool)
+    cached_tool_handler = tool_cache.wrap(tool_handler)
+    
+    # The router's index of the local data also tells the cache which
+    # country names exist ('INDIA' and 'india ' share the entry of 'India')
+    router = get_shared_router(country_currency_tool, currency_rates_tool) if TOOL_BACKEND != "mcp" else None
+    if router is not None:
+        tool_cache.set_country_names(router.country_names())
+    
+    # Simple lookups ("What currency does India use?") are answered straight
+    # from the local tools, without any LLM call
+    if FAST_PATH_ENABLED and router is not None:
+        result = router.answer(user_input, cached_tool_handler)
+        if result is not None:
+            if verbose:
+                print(f"⚡ Fast path (no LLM call): {result}\n")
+            return result, PATH_FAST
+        router.record(PATH_AGENT)
+    
+    # Call the agent conversation function with tools and handler,
+    # printing Claude's answer as it is generated
+    result = run_agent_conversation(llm_client, model, tools, user_input, cached_tool_handler,
+                                    stream=stream, verbose=verbose)
+    
+    # Report how often tool calls were answered from the cache
+    if verbose:
+        for line in format_cache_stats(tool_cache.get_stats()):
+            print(f"🗃  Tool cache - {line}")
+    
+    return result, PATH_AGENT
 
 
 # ============================================================================
@@ -178,7 +170,7 @@ def create_filename_from_input(user_input, max_length=25):
     Args:
         user_input: The user's question/prompt
         max_length: Maximum length of the filename part
-        
+    
     Returns:
         A sanitized, concise filename string
     """
@@ -228,7 +220,7 @@ def extract_relevant_data(result, user_input):
     Args:
         result: The agent's full response
         user_input: The user's original question
-        
+    
     Returns:
         Dictionary with structured relevant data
     """
@@ -286,7 +278,7 @@ def extract_relevant_data(result, user_input):
     return data
 
 
-def save_result_to_file(user_input, result):
+def save_result_to_file(user_input, result, path=PATH_AGENT):
     """
     Save the conversation result to a CSV file with only relevant data.
     The filename is based on the user's question for easy identification.
@@ -294,6 +286,7 @@ def save_result_to_file(user_input, result):
     Args:
         user_input: The user's original question
         result: The agent's response
+        path: How the response was produced ('fast_path' or 'agent')
     """
     # Create output directory if it doesn't exist
     output_dir = os.path.join(os.path.dirname(__file__), "output")
@@ -309,7 +302,7 @@ def save_result_to_file(user_input, result):
     
     # Prepare CSV with relevant data only
     csv_data = [
-        ["timestamp", "question", "country", "currency_code", "currency_name", "exchange_rate", "base_currency"],
+        ["timestamp", "question", "country", "currency_code", "currency_name", "exchange_rate", "base_currency", "path"],
         [
             datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             user_input,
@@ -317,7 +310,8 @@ def save_result_to_file(user_input, result):
             data['currency_code'],
             data['currency_name'],
             data['exchange_rate'],
-            data['base_currency']
+            data['base_currency'],
+            path
         ]
     ]
     
@@ -331,11 +325,428 @@ def save_result_to_file(user_input, result):
     return output_file
 
 
+# ============================================================================
+# STEP 5: Batch Mode (Many Questions, One Output File)
+# ============================================================================
+
+# Columns of the consolidated batch output file
+BATCH_COLUMNS = ["id", "timestamp", "question", "country", "currency_code", "currency_name",
+                 "exchange_rate", "base_currency", "path", "seconds", "answer", "error"]
+
+
+class ConcurrencyLimitedClient:
+    """
+    Wraps the Claude client so at most `limit` LLM requests run at once,
+    however many batch workers there are (workers answered by the fast
+    path or waiting on tools do not hold a slot).
+    """
+    def __init__(self, llm_client, limit):
+        self.messages = _LimitedMessages(llm_client.messages, threading.BoundedSemaphore(limit))
+
+
+class _LimitedMessages:
+    """
+    `client.messages` with create() and stream() gated by a semaphore;
+    everything else (count_tokens(), batches, ...) is passed through.
+    """
+    def __init__(self, messages, semaphore):
+        self._messages = messages
+        self._semaphore = semaphore
+    
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+    
+    def create(self, **request):
+        with self._semaphore:
+            return self._messages.create(**request)
+    
+    @contextmanager
+    def stream(self, **request):
+        with self._semaphore:
+            with self._messages.stream(**request) as response_stream:
+                yield response_stream
+
+
+def read_batch_questions(source):
+    """
+    Read batch questions from a file or stdin.
+    
+    Each non-empty line is either a plain question or a JSON object with a
+    "question" field and an optional "id". Plain lines get their line
+    number as id. Ids key the output rows and the checkpoint, so they
+    must be unique.
+    
+    Args:
+        source: Path of the input file, or '-' for stdin
+    
+    Returns:
+        List of (id, question) tuples
+    
+    Raises:
+        ValueError: If two questions have the same id
+    """
+    handle = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    questions = []
+    seen = set()
+    try:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                item = json.loads(line)
+                question = str(item.get("question", "")).strip()
+                question_id = str(item.get("id", line_number))
+            else:
+                question, question_id = line, str(line_number)
+            if question:
+                if question_id in seen:
+                    raise ValueError(f"Duplicate question id {question_id!r} on line {line_number}; question ids must be unique")
+                seen.add(question_id)
+                questions.append((question_id, question))
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return questions
+
+
+def load_batch_checkpoint(output_file):
+    """
+    Find the questions already answered in an existing batch output file.
+    
+    Rows with an error are not counted, so a resumed run retries them.
+    
+    Args:
+        output_file: Path of the consolidated output file
+    
+    Returns:
+        Set of question ids that already have an answer
+    """
+    if not os.path.exists(output_file):
+        return set()
+    with open(output_file, encoding="utf-8", newline="") as f:
+        return {row["id"] for row in csv.DictReader(f) if not row.get("error")}
+
+
+def compact_batch_output(output_file):
+    """
+    Drop rows superseded by a later run from a batch output file.
+    
+    A resumed run retries failed questions and appends their new rows, so
+    an id can appear more than once. The last row of each id is kept, at
+    the position of its first row. The file is only rewritten when there
+    are duplicates, and is replaced atomically.
+    
+    Args:
+        output_file: Path of the consolidated output file
+    
+    Returns:
+        Number of rows removed
+    """
+    if not os.path.exists(output_file):
+        return 0
+    with open(output_file, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    latest = {}
+    for row in rows:
+        latest[row["id"]] = row
+    if len(latest) == len(rows):
+        return 0
+    
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(latest.values())
+    os.replace(tmp_file, output_file)
+    return len(rows) - len(latest)
+
+
+def answer_batch_question(question_id, question, llm_client, model):
+    """
+    Answer one batch question and build its output row.
+    
+    Returns:
+        Dictionary with one value per BATCH_COLUMNS entry
+    """
+    started = time.perf_counter()
+    row = {"id": question_id, "question": question, "answer": "", "error": "", "path": ""}
+    try:
+        result, path = run_agent(question, llm_client, model, stream=False, verbose=False)
+        row.update(extract_relevant_data(result, question))
+        row["answer"] = result
+        row["path"] = path
+    except Exception as e:
+        row.update({"country": "", "currency_code": "", "currency_name": "", "exchange_rate": "", "base_currency": ""})
+        row["error"] = str(e)
+    row["seconds"] = round(time.perf_counter() - started, 3)
+    row["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return row
+
+
+def percentile(values, fraction):
+    """Return the value at `fraction` (0-1) of the sorted values (nearest rank)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_batch(source, llm_client, model, output_file=None, workers=8, llm_concurrency=4):
+    """
+    Answer many questions concurrently into one consolidated CSV file.
+    
+    Rows are appended as soon as each question finishes, so the output file
+    doubles as a checkpoint: running the same batch again with the same
+    output file skips questions that already have an answer and retries
+    failed ones, whose old rows are dropped at the end of the run.
+    
+    Args:
+        source: Path of the input file (one question per line, or JSONL), or '-' for stdin
+        llm_client: The Claude LLM client
+        model: The model name to use
+        output_file: Path of the consolidated CSV (default: output/batch_<timestamp>.csv)
+        workers: Number of questions processed at the same time
+        llm_concurrency: Maximum number of LLM requests in flight at once
+    
+    Returns:
+        Dictionary with the run summary
+    """
+    questions = read_batch_questions(source)
+    
+    if output_file is None:
+        output_dir = os.path.join(os.path.dirname(__file__), "output")
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    
+    # Resume: skip questions answered by an earlier run into the same file
+    done = load_batch_checkpoint(output_file)
+    pending = [(question_id, question) for question_id, question in questions if question_id not in done]
+    print(f"\n📦 Batch: {len(questions)} questions, {len(questions) - len(pending)} already done, "
+          f"{len(pending)} to run ({workers} workers, {llm_concurrency} concurrent LLM requests)")
+    
+    limited_client = ConcurrencyLimitedClient(llm_client, llm_concurrency)
+    write_header = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+    latencies = []
+    paths = {}
+    errors = 0
+    started = time.perf_counter()
+    
+    with open(output_file, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as executor:
+            futures = [
+                executor.submit(answer_batch_question, question_id, question, limited_client, model)
+                for question_id, question in pending
+            ]
+            # Results are written by this thread only, in completion order
+            for completed, future in enumerate(as_completed(futures), start=1):
+                row = future.result()
+                writer.writerow(row)
+                f.flush()
+                
+                latencies.append(row["seconds"])
+                if row["error"]:
+                    errors += 1
+                else:
+                    paths[row["path"]] = paths.get(row["path"], 0) + 1
+                print(f"   [{completed}/{len(pending)}] {'✗' if row['error'] else '✓'} #{row['id']} ({row['seconds']:.2f}s)")
+    
+    compact_batch_output(output_file)
+    return print_batch_summary(len(questions), len(pending), errors, paths, latencies,
+                               time.perf_counter() - started, output_file)
+
+
+def run_bulk(source, llm_client, model, output_file=None, poll_interval=POLL_INTERVAL):
+    """
+    Answer many questions through the Message Batches API.
+    
+    Cheaper than run_batch() for large offline question sets, but slower:
+    each agent turn of all questions is sent as one message batch (see
+    agent/batch_agent.py). Questions the fast path can answer never reach
+    the LLM. Output file and resume work as in run_batch().
+    
+    Args:
+        source: Path of the input file (one question per line, or JSONL), or '-' for stdin
+        llm_client: The Claude LLM client
+        model: The model name to use
+        output_file: Path of the consolidated CSV (default: output/batch_<timestamp>.csv)
+        poll_interval: Seconds between batch status checks
+    
+    Returns:
+        Dictionary with the run summary
+    """
+    questions = read_batch_questions(source)
+    
+    if output_file is None:
+        output_dir = os.path.join(os.path.dirname(__file__), "output")
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    
+    done = load_batch_checkpoint(output_file)
+    pending = [(question_id, question) for question_id, question in questions if question_id not in done]
+    print(f"\n📦 Bulk: {len(questions)} questions, {len(questions) - len(pending)} already done, {len(pending)} to run")
+    
+    currency_rates_tool = get_shared_rates_tool()
+    country_currency_tool = CountryCurrencyTool()
+    tools, tool_handler = create_backend_tools(country_currency_tool, currency_rates_tool)
+    tool_cache = get_shared_tool_cache()
+    cached_tool_handler = tool_cache.wrap(tool_handler)
+    router = get_shared_router(country_currency_tool, currency_rates_tool) if TOOL_BACKEND != "mcp" else None
+    if router is not None:
+        tool_cache.set_country_names(router.country_names())
+    
+    write_header = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+    latencies = []
+    paths = {}
+    errors = 0
+    started = time.perf_counter()
+    
+    def write_row(writer, question_id, question, answer, path, error, seconds):
+        row = {key: "" for key in BATCH_COLUMNS}
+        if not error:
+            row.update(extract_relevant_data(answer, question))
+        row.update({
+            "id": question_id,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "question": question,
+            "path": path if not error else "",
+            "seconds": seconds,
+            "answer": answer,
+            "error": error
+        })
+        writer.writerow(row)
+        latencies.append(row["seconds"])
+    
+    with open(output_file, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        
+        # Fast path first: those questions never reach the LLM
+        for_llm = []
+        use_fast_path = FAST_PATH_ENABLED and router is not None
+        for question_id, question in pending:
+            question_started = time.perf_counter()
+            answer = router.answer(question, cached_tool_handler) if use_fast_path else None
+            if answer is not None:
+                write_row(writer, question_id, question, answer, PATH_FAST, "",
+                          round(time.perf_counter() - question_started, 3))
+                paths[PATH_FAST] = paths.get(PATH_FAST, 0) + 1
+            else:
+                for_llm.append((question_id, question))
+        f.flush()
+        
+        if for_llm:
+            if use_fast_path:
+                for _ in for_llm:
+                    router.record(PATH_AGENT)
+            results = run_batch_conversations(llm_client, model, tools, for_llm, cached_tool_handler,
+                                              poll_interval=poll_interval)
+            for question_id, question in for_llm:
+                result = results[question_id]
+                write_row(writer, question_id, question, result["answer"], PATH_AGENT, result["error"],
+                          result["seconds"])
+                if result["error"]:
+                    errors += 1
+                else:
+                    paths[PATH_AGENT] = paths.get(PATH_AGENT, 0) + 1
+            f.flush()
+    
+    compact_batch_output(output_file)
+    return print_batch_summary(len(questions), len(pending), errors, paths, latencies,
+                               time.perf_counter() - started, output_file)
+
+
+def print_batch_summary(total, run, errors, paths, latencies, elapsed, output_file):
+    """
+    Print and return the throughput/latency summary of a batch run.
+    
+    Args:
+        total: Number of questions in the input
+        run: Number of questions answered in this run
+        errors: Number of questions that failed
+        paths: Dictionary of path name -> number of answers
+        latencies: List of per-question seconds
+        elapsed: Wall-clock seconds of the run
+        output_file: Path of the consolidated output file
+    
+    Returns:
+        Dictionary with the run summary
+    """
+    summary = {
+        "questions": run,
+        "skipped": total - run,
+        "errors": errors,
+        "paths": paths,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(run / elapsed, 3) if elapsed and run else 0.0,
+        "latency_p50": percentile(latencies, 0.50) if latencies else None,
+        "latency_p95": percentile(latencies, 0.95) if latencies else None,
+        "latency_max": max(latencies) if latencies else None,
+        "output_file": output_file
+    }
+    
+    print("\n" + "="*70)
+    print("📊 Batch summary")
+    print("="*70)
+    print(f"Questions run: {summary['questions']} (skipped {summary['skipped']} from checkpoint, {errors} errors)")
+    print(f"Paths: " + (", ".join(f"{name} {count}" for name, count in sorted(paths.items())) or "none"))
+    print(f"Elapsed: {summary['elapsed_seconds']:.2f}s | Throughput: {summary['throughput_per_second']:.2f} questions/s")
+    if latencies:
+        print(f"Latency: p50 {summary['latency_p50']:.2f}s | p95 {summary['latency_p95']:.2f}s | max {summary['latency_max']:.2f}s")
+    print(f"LLM tokens: {format_usage(get_session_usage())}")
+    print(f"✓ Results saved to: {output_file}")
+    print("="*70 + "\n")
+    
+    return summary
+
+
 # ============================================================================
 # Main Execution Flow
 # ============================================================================
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options (all optional; no options = one interactive question)."""
+    parser = argparse.ArgumentParser(description="Country & currency AI agent")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Answer every question in FILE (one per line, or JSONL); '-' reads stdin")
+    parser.add_argument("--output", metavar="CSV",
+                        help="Consolidated batch output file; reuse it to resume an interrupted batch")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("BATCH_WORKERS", 8)),
+                        help="Questions processed at the same time in batch mode (default 8)")
+    parser.add_argument("--llm-concurrency", type=int, default=int(os.environ.get("BATCH_LLM_CONCURRENCY", 4)),
+                        help="Maximum LLM requests in flight at once in batch mode (default 4)")
+    parser.add_argument("--bulk", action="store_true",
+                        help="With --batch: send questions through the Message Batches API (cheaper, slower)")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL,
+                        help=f"Seconds between batch status checks with --bulk (default {POLL_INTERVAL})")
+    parser.add_argument(PROFILE_FLAG, action="store_true",
+                        help="Report the import time of each module at startup, then exit")
+    return parser.parse_args(argv)
+
+
+def wait_for_llm_client(llm_client_future, model):
+    """
+    Get the LLM client being created in the background.
+    
+    Errors of create_llm_client() (e.g. a missing SDK) are raised here.
+    
+    Args:
+        llm_client_future: Future of create_llm_client()
+        model: The model name (for the message)
+    
+    Returns:
+        The Claude LLM client
+    """
+    llm_client = llm_client_future.result()
+    print(f"✓ Claude client ready ({model})")
+    return llm_client
+
+
+def main(argv=None):
     """
     Main execution flow of the application.
     
@@ -344,15 +755,39 @@ def main():
     2. Get user input
     3. Run agent
     4. Save result
+    
+    With --batch, steps 2-4 run for every question in the batch instead.
     """
+    args = parse_args(argv)
+    if args.startup_profile:
+        print_startup_profile("main")
+        return
+    
     try:
         # STEP 1: Load environment variables
         print("\n📋 Setting up environment...")
         api_key, model = setup_environment()
         
-        # Create LLM client
-        llm_client = create_llm_client(api_key)
-        print(f"✓ Connected to Claude ({model})")
+        # Create LLM client (importing the SDK takes a moment, so this runs
+        # in the background while the user types)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-client")
+        llm_client_future = executor.submit(create_llm_client, api_key)
+        executor.shutdown(wait=False)
+        print(f"⏳ Connecting to Claude ({model}) in the background...")
+        
+        # Start fetching exchange rates in the background while the user types
+        get_shared_rates_tool()
+        if TOOL_BACKEND == "mcp":
+            # Start the MCP server now; it stays up for every question
+            get_shared_mcp_manager()
+            print("✓ MCP server ready")
+        
+        if args.batch and args.bulk:
+            run_bulk(args.batch, wait_for_llm_client(llm_client_future, model), model, args.output, args.poll_interval)
+            return
+        if args.batch:
+            run_batch(args.batch, wait_for_llm_client(llm_client_future, model), model, args.output, args.workers, args.llm_concurrency)
+            return
         
         # STEP 2: Get user input
         user_input = get_user_input()
@@ -361,15 +796,15 @@ def main():
             return
         
         # STEP 3: Run agent and get result
-        result = run_agent(user_input, llm_client, model)
+        result, path = run_agent(user_input, wait_for_llm_client(llm_client_future, model), model)
         
         # STEP 4: Save result to output file
-        output_file = save_result_to_file(user_input, result)
+        output_file = save_result_to_file(user_input, result, path)
         
         print("\n" + "="*70)
         print("✅ Process completed successfully!")
         print("="*70 + "\n")
-        
+    
     except Exception as e:
         print(f"\n❌ Error: {str(e)}\n")
         
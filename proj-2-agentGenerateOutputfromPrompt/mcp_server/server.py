@@ -1,52 +1,189 @@
 """
-MCP Server with Claude AI integration and all tools.
+MCP Server with all country, currency and exchange rate tools.
 This server provides country, currency, and exchange rate tools via MCP protocol.
+
+It never calls the LLM itself (the agent does), so it does not import the
+LLM SDK: a new server process is started for every MCP client, and
+everything imported here adds to that start-up time. Run it with
+--startup-profile to see the import time of each module.
 """
 
 import os
 import sys
 import json
+import time
+import asyncio
 from typing import Any, Dict
-from anthropic import Anthropic
-from dotenv import load_dotenv
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
 
 # Add parent directory to path to import tools
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Only import the tools we need (limited to 3 tools)
-from tools.country_currency_tool import CountryCurrencyTool
-from tools.currency_rates_tool import CurrencyRatesTool
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    from startup_profile import print_startup_profile
+    print_startup_profile("server", extra_path=os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(0)
+
+from dotenv import load_dotenv
+from mcp.server import Server
+from mcp.server.stdio import stdio_server
+from mcp.types import Tool, TextContent, Resource
 
-# Load environment variables
+# Only import the tools we need
+from tools.country_currency_tool import AsyncCountryCurrencyTool
+from tools.currency_rates_tool import AsyncCurrencyRatesTool, get_shared_rates_tool
+
+# Load environment variables (API URLs, limits)
 base_dir = os.path.dirname(__file__)
 private_env_dir = os.path.abspath(os.path.join(base_dir, "..", "..", "donotcheckin-personalkeyinfo"))
 dotenv_path = os.path.join(private_env_dir, ".env")
 if os.path.exists(dotenv_path):
     load_dotenv(dotenv_path)
-    print(f"✓ Loaded environment from: {dotenv_path}")
+    print(f"✓ Loaded environment from: {dotenv_path}", file=sys.stderr)
 else:
     load_dotenv()
-    print("Loaded environment from default locations")
+    print("Loaded environment from default locations", file=sys.stderr)
+
+# Initialize tool instances (2 tool classes for all tools)
+# Async tools are awaited on the server's event loop, so one slow upstream
+# does not stall other in-flight tool calls. The rates tool shares the
+# process-wide snapshot that is refreshed in the background.
+country_currency_tool = AsyncCountryCurrencyTool(os.environ.get("COUNTRY_API_URL", "http://127.0.0.1:5003"))
+currency_rates_tool = AsyncCurrencyRatesTool(get_shared_rates_tool())
 
-LLM_API_KEY = os.environ.get("LLM_API_KEY")
-if not LLM_API_KEY:
-    raise ValueError("LLM_API_KEY environment variable is not set. Please add it to your .env file.")
-MODEL = os.environ.get("LLM_MODEL", "claude-sonnet-4-20250514")
+# Calls of one tool that may run at the same time (further calls wait in a
+# queue), and seconds a call may take, queue wait included. History lookups
+# may import snapshots from SQLite, so fewer of them run at once.
+DEFAULT_TOOL_CONCURRENCY = int(os.environ.get("MCP_TOOL_CONCURRENCY", 16))
+TOOL_CONCURRENCY = {
+    "get_exchange_rate_history": 4
+}
+TOOL_TIMEOUT = float(os.environ.get("MCP_TOOL_TIMEOUT", 20))
 
-# Initialize Anthropic client
-anthropic_client = Anthropic(api_key=LLM_API_KEY)
+# URI of the resource that reports in-flight and queued calls
+STATS_URI = "stats://tools"
 
-# Initialize tool instances (2 tool classes for 2 tools)
-country_currency_tool = CountryCurrencyTool()
-currency_rates_tool = CurrencyRatesTool()
+
+class ToolLimiter:
+    """
+    Per-tool concurrency limits and timeouts for calls on the server's event loop.
+    
+    Tool calls from all clients run concurrently; calls over a tool's limit
+    wait for a free slot. The counters (in flight, queued, timeouts) are
+    only touched from the event loop, so they need no lock.
+    """
+    def __init__(self, limits=None, default_limit=DEFAULT_TOOL_CONCURRENCY, timeout=TOOL_TIMEOUT):
+        """
+        Initialize the limiter.
+        
+        Args:
+            limits (dict): Concurrent calls allowed, per tool name (optional).
+            default_limit (int): Limit for tools not listed in `limits`.
+            timeout (float): Seconds a call may take, waiting included.
+        """
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.timeout = timeout
+        self._semaphores = {}
+        self._stats = {}
+    
+    def _tool_stats(self, tool_name):
+        """Get (creating if needed) the counters for one tool."""
+        stats = self._stats.get(tool_name)
+        if stats is None:
+            stats = {"in_flight": 0, "queued": 0, "max_in_flight": 0, "max_queued": 0,
+                     "completed": 0, "timeouts": 0, "total_seconds": 0.0}
+            self._stats[tool_name] = stats
+        return stats
+    
+    async def run(self, tool_name, call):
+        """
+        Run one tool call under the tool's concurrency limit and timeout.
+        
+        Args:
+            tool_name (str): Name of the tool.
+            call: Function returning the coroutine that does the work.
+        
+        Returns:
+            The coroutine's result.
+        
+        Raises:
+            asyncio.TimeoutError: If the call (waiting included) took too long.
+        """
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limits.get(tool_name, self.default_limit))
+            self._semaphores[tool_name] = semaphore
+        
+        stats = self._tool_stats(tool_name)
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+        waiting = True
+        
+        async def limited():
+            nonlocal waiting
+            async with semaphore:
+                waiting = False
+                stats["queued"] -= 1
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+                try:
+                    return await call()
+                finally:
+                    stats["in_flight"] -= 1
+        
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(limited(), self.timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise
+        finally:
+            if waiting:
+                stats["queued"] -= 1
+            stats["completed"] += 1
+            stats["total_seconds"] += time.perf_counter() - started
+    
+    def get_stats(self):
+        """
+        Get the load of the server.
+        
+        Returns:
+            dict: 'in_flight' and 'queued' over all tools, and per tool:
+                  its limit, current and peak in-flight/queued calls,
+                  completed calls, timeouts and average seconds.
+        """
+        tools = {}
+        for tool_name, stats in self._stats.items():
+            completed = stats["completed"]
+            tools[tool_name] = {
+                **{key: value for key, value in stats.items() if key != "total_seconds"},
+                "limit": self.limits.get(tool_name, self.default_limit),
+                "avg_seconds": round(stats["total_seconds"] / completed, 4) if completed else 0.0
+            }
+        return {
+            "in_flight": sum(stats["in_flight"] for stats in self._stats.values()),
+            "queued": sum(stats["queued"] for stats in self._stats.values()),
+            "tools": tools
+        }
+
+
+tool_limiter = ToolLimiter(TOOL_CONCURRENCY)
 
 # Initialize MCP Server
 mcp_server = Server("mcp-country-currency-server")
 
-# Define only 2 essential MCP tools (no live data conversion)
+# Define the MCP tools (no live data conversion). The list variants answer
+# questions about several countries or currencies in one tool call, so
+# Claude does not need one call (or one turn) per item.
+MAX_BULK_ITEMS = 50
+
+_NAME_LIST = {
+    "type": "array",
+    "items": {"type": "string"},
+    "minItems": 1,
+    "maxItems": MAX_BULK_ITEMS,
+    "description": "Country names (e.g., ['India', 'Japan', 'Germany'])"
+}
 TOOLS = [
     {
         "name": "get_currency_by_country",
@@ -64,7 +201,7 @@ TOOLS = [
     },
     {
         "name": "get_exchange_rate",
-        "description": "Get the current exchange rate for a specific currency relative to USD.",
+        "description": "Get the current exchange rate for a specific currency relative to USD. The result includes 'age_seconds' (how long ago the rates were fetched) and 'stale' (True while a refresh is pending).",
         "input_schema": {
             "type": "object",
             "properties": {
@@ -75,18 +212,107 @@ TOOLS = [
             },
             "required": ["currency_code"]
         }
+    },
+    {
+        "name": "get_exchange_rate_history",
+        "description": "Get how a currency's exchange rate (relative to USD) moved over a date range. Returns first/last/min/max, percent change and a short downsampled series.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "currency_code": {
+                    "type": "string",
+                    "description": "The currency code (e.g., 'EUR', 'INR', 'GBP', 'JPY')"
+                },
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format (optional, defaults to earliest available)"
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format (optional, defaults to latest available)"
+                },
+                "max_points": {
+                    "type": "integer",
+                    "description": "Maximum number of points in the series (default 20)"
+                }
+            },
+            "required": ["currency_code"]
+        }
+    },
+    {
+        "name": "get_currencies_by_countries",
+        "description": "Get the official currency of several countries at once. Use this instead of calling get_currency_by_country once per country.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "country_names": _NAME_LIST
+            },
+            "required": ["country_names"]
+        }
+    },
+    {
+        "name": "get_exchange_rates",
+        "description": "Get the current exchange rates of several currencies relative to USD at once. Use this instead of calling get_exchange_rate once per currency.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "currency_codes": {
+                    **_NAME_LIST,
+                    "description": "Currency codes (e.g., ['EUR', 'INR', 'JPY'])"
+                }
+            },
+            "required": ["currency_codes"]
+        }
+    },
+    {
+        "name": "get_country_currency_rates",
+        "description": "For several countries at once, get each country's currency and that currency's current exchange rate relative to USD.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "country_names": _NAME_LIST
+            },
+            "required": ["country_names"]
+        }
     }
 ]
 
 
-def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+def _bulk_items(values):
+    """Clean up the list input of a bulk tool: strings only, no duplicates, at most MAX_BULK_ITEMS."""
+    if isinstance(values, str):
+        values = [values]
+    items = [str(value).strip() for value in values or [] if str(value).strip()]
+    return list(dict.fromkeys(items))[:MAX_BULK_ITEMS]
+
+
+def _bulk_result(requested, found, missing_message):
     """
-    Route tool calls to appropriate handlers (Limited to 2 tools only).
+    Build the result of a bulk tool.
+    
+    Args:
+        requested (list): Items asked for, in order.
+        found (dict): Result per item that was found.
+        missing_message (str): Error prefix when nothing was found.
+    
+    Returns:
+        dict: 'data' (item -> result, in request order) and 'not_found'.
+    """
+    data = {item: found[item] for item in requested if item in found}
+    not_found = [item for item in requested if item not in found]
+    if not data:
+        return {"success": False, "error": f"{missing_message} {', '.join(repr(item) for item in requested)}"}
+    return {"success": True, "data": data, "not_found": not_found}
+
+
+async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Route tool calls to appropriate handlers.
     
     Args:
         tool_name: Name of the tool to execute
         arguments: Arguments for the tool
-        
+    
     Returns:
         Result from the tool execution
     """
@@ -94,7 +320,7 @@ def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any
         # Tool 1: Get Currency by Country
         if tool_name == "get_currency_by_country":
             country = arguments.get("country_name", "")
-            result = country_currency_tool.get_by_country_name(country)
+            result = await country_currency_tool.get_by_country_name(country)
             if result:
                 return {"success": True, "data": result}
             else:
@@ -103,20 +329,63 @@ def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any
         # Tool 2: Get Exchange Rate
         elif tool_name == "get_exchange_rate":
             code = arguments.get("currency_code", "")
-            result = currency_rates_tool.get_rate(code)
+            result = await currency_rates_tool.get_rate(code)
             if result:
                 return {"success": True, "data": result}
             else:
                 return {"success": False, "error": f"Exchange rate for '{code}' not found"}
         
+        # Tool 3: Get Exchange Rate History
+        elif tool_name == "get_exchange_rate_history":
+            code = arguments.get("currency_code", "")
+            result = await currency_rates_tool.get_rate_history(
+                code,
+                start=arguments.get("start_date"),
+                end=arguments.get("end_date"),
+                max_points=arguments.get("max_points") or 20
+            )
+            if result:
+                return {"success": True, "data": result}
+            else:
+                return {"success": False, "error": f"No exchange rate history for '{code}' in that date range"}
+        
+        # Tool 4: Get Currencies of Several Countries (one API request)
+        elif tool_name == "get_currencies_by_countries":
+            names = _bulk_items(arguments.get("country_names"))
+            records = await country_currency_tool.get_by_country_names(names)
+            found = {record["country_name"]: record for record in records}
+            return _bulk_result(names, found, "No currency data found for")
+        
+        # Tool 5: Get Exchange Rates of Several Currencies (one snapshot lookup)
+        elif tool_name == "get_exchange_rates":
+            codes = [code.upper() for code in _bulk_items(arguments.get("currency_codes"))]
+            rates = await currency_rates_tool.get_multiple_rates(codes)
+            return _bulk_result(codes, rates, "Exchange rates not found for")
+        
+        # Tool 6: Country -> Currency -> Rate for Several Countries
+        elif tool_name == "get_country_currency_rates":
+            names = _bulk_items(arguments.get("country_names"))
+            records = await country_currency_tool.get_by_country_names(names)
+            rates = await currency_rates_tool.get_multiple_rates({record["currency_code"] for record in records})
+            found = {}
+            for record in records:
+                rate = rates.get(record["currency_code"], {})
+                found[record["country_name"]] = {
+                    **record,
+                    "rate": rate.get("rate"),
+                    "base": rate.get("base"),
+                    "timestamp": rate.get("timestamp"),
+                    "stale": rate.get("stale")
+                }
+            return _bulk_result(names, found, "No currency data found for")
+        
         else:
-            return {"success": False, "error": f"Unknown tool: {tool_name}. Only 2 tools are available."}
-            
+            return {"success": False, "error": f"Unknown tool: {tool_name}. Only {len(TOOLS)} tools are available."}
+    
     except Exception as e:
         return {"success": False, "error": f"Error executing {tool_name}: {str(e)}"}
 
 
-@mcp_server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools for the MCP server."""
     return [
@@ -129,28 +398,99 @@ async def list_tools() -> list[Tool]:
     ]
 
 
-@mcp_server.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls from the MCP client."""
+    """
+    Handle tool calls from the MCP client.
+    
+    Each request runs in its own task, so calls from several clients (or
+    several calls from one client) run at the same time, within the
+    per-tool limits of tool_limiter.
+    """
     try:
-        result = handle_tool_call(name, arguments)
+        result = await tool_limiter.run(name, lambda: handle_tool_call(name, arguments or {}))
         return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    except asyncio.TimeoutError:
+        error_result = {"success": False, "error": f"Error executing {name}: timed out after {tool_limiter.timeout}s"}
+        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
     except Exception as e:
         error_result = {"success": False, "error": str(e)}
         return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
 
 
+async def list_resources() -> list[Resource]:
+    """List the server's resources (only the load statistics)."""
+    return [
+        Resource(
+            uri=STATS_URI,
+            name="tool_stats",
+            description="Tool calls in flight and queued, per tool and in total",
+            mimeType="application/json"
+        )
+    ]
+
+
+async def read_resource(uri: Any) -> str:
+    """Return the load statistics as JSON."""
+    if str(uri) == STATS_URI:
+        return json.dumps(tool_limiter.get_stats(), indent=2)
+    raise ValueError(f"Unknown resource: {uri}")
+
+
+def register_handlers(server):
+    """
+    Register the tool and resource handlers on the MCP server.
+    
+    mcp 2.x registers request handlers by method name and passes them the
+    request context and parameters; 1.x used decorators. Both are supported,
+    like the client does (agent/mcp_client.py).
+    """
+    if not hasattr(server, "add_request_handler"):
+        server.list_tools()(list_tools)
+        server.call_tool()(call_tool)
+        server.list_resources()(list_resources)
+        server.read_resource()(read_resource)
+        return
+    
+    from mcp import types
+    
+    async def on_list_tools(context, params):
+        return types.ListToolsResult(tools=await list_tools())
+    
+    async def on_call_tool(context, params):
+        return types.CallToolResult(content=await call_tool(params.name, params.arguments))
+    
+    async def on_list_resources(context, params):
+        return types.ListResourcesResult(resources=await list_resources())
+    
+    async def on_read_resource(context, params):
+        text = await read_resource(params.uri)
+        return types.ReadResourceResult(
+            contents=[types.TextResourceContents(uri=str(params.uri), mimeType="application/json", text=text)]
+        )
+    
+    server.add_request_handler("tools/list", types.PaginatedRequestParams, on_list_tools)
+    server.add_request_handler("tools/call", types.CallToolRequestParams, on_call_tool)
+    server.add_request_handler("resources/list", types.PaginatedRequestParams, on_list_resources)
+    server.add_request_handler("resources/read", types.ReadResourceRequestParams, on_read_resource)
+
+
+register_handlers(mcp_server)
+
+
 async def main():
-    """Main entry point for the MCP server."""
-    print("=" * 70)
-    print("🚀 MCP Country & Currency Server")
-    print("=" * 70)
-    print(f"Model: {MODEL}")
-    print(f"Available Tools: {len(TOOLS)}")
+    """
+    Main entry point for the MCP server.
+    
+    stdout carries the MCP protocol, so messages are printed to stderr.
+    """
+    print("=" * 70, file=sys.stderr)
+    print("🚀 MCP Country & Currency Server", file=sys.stderr)
+    print("=" * 70, file=sys.stderr)
+    print(f"Available Tools: {len(TOOLS)}", file=sys.stderr)
     for tool in TOOLS:
-        print(f"  • {tool['name']}")
-    print("=" * 70)
-    print("Server ready and waiting for connections...\n")
+        print(f"  • {tool['name']}", file=sys.stderr)
+    print("=" * 70, file=sys.stderr)
+    print("Server ready and waiting for connections...\n", file=sys.stderr)
     
     # Run the MCP server using stdio
     async with stdio_server() as (read_stream, write_stream):
@@ -0,0 +1,113 @@
+"""
+Startup Profiler - Shows which imports make an entry point slow to start
+
+Used by the --startup-profile option of main.py, app.py and
+mcp_server/server.py. The entry module is imported in a fresh Python
+process with `-X importtime`, so the report covers everything that
+happens before the program can do its first piece of work (imports and
+module-level setup), without running the program itself.
+
+Only the standard library is imported here, so profiling does not change
+what is being measured.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+PROFILE_FLAG = "--startup-profile"
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+    
+    Returns:
+        list: (module, self microseconds, cumulative microseconds, depth) tuples.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def profile_startup(module, extra_path=None):
+    """
+    Import a module in a fresh interpreter and time every import.
+    
+    Args:
+        module (str): Module to import (e.g. 'main', 'app', 'server').
+        extra_path (str): Directory to put first on the module path (optional).
+    
+    Returns:
+        dict: 'wall_seconds' (interpreter start to import done),
+              'import_seconds' (sum of all import times), 'modules'
+              ((module, self us, cumulative us, depth) per import) and
+              'errors' (the import's error output if it failed).
+    """
+    env = dict(os.environ)
+    paths = [path for path in (extra_path, PROJECT_DIR, env.get("PYTHONPATH")) if path]
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    
+    modules = _parse_importtime(completed.stderr)
+    errors = []
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if line and not line.startswith("import time:")]
+        errors = errors or [f"Import of {module} failed with exit code {completed.returncode}"]
+    return {
+        "wall_seconds": wall,
+        "import_seconds": sum(entry[1] for entry in modules) / 1e6,
+        "modules": modules,
+        "errors": errors
+    }
+
+
+def print_startup_profile(module, extra_path=None, top=20):
+    """
+    Print a startup profile: time per top-level package and the slowest modules.
+    
+    Args:
+        module (str): Module to import (e.g. 'main', 'app', 'server').
+        extra_path (str): Directory to put first on the module path (optional).
+        top (int): Number of rows in each table.
+    """
+    profile = profile_startup(module, extra_path)
+    
+    print(f"\n⏱  Startup profile of '{module}'")
+    print(f"   Interpreter start + imports: {profile['wall_seconds'] * 1000:.0f} ms "
+          f"(imports: {profile['import_seconds'] * 1000:.0f} ms, {len(profile['modules'])} modules)")
+    for line in profile["errors"][-5:]:
+        print(f"   ❌ {line}")
+    
+    # Self time summed per top-level package (anthropic, mcp, numpy, ...)
+    packages = {}
+    for name, self_us, _, _ in profile["modules"]:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print(f"\n   {'package':<32} {'ms':>9} {'share':>7}")
+    total = sum(packages.values()) or 1
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {package:<32} {self_us / 1000:>9.1f} {self_us / total:>7.1%}")
+    
+    # Slowest single modules, including what they import
+    print(f"\n   {'module (cumulative)':<48} {'ms':>9}")
+    for name, _, cumulative_us, depth in sorted(profile["modules"], key=lambda entry: -entry[2])[:top]:
+        print(f"   {('  ' * min(depth, 4) + name)[:48]:<48} {cumulative_us / 1000:>9.1f}")
+    print()
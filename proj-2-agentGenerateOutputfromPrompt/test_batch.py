@@ -0,0 +1,103 @@
+"""
+Tests for the batch mode of main.py (input parsing and checkpoint resume).
+
+run_agent is replaced by a stand-in, so no LLM or data service is needed.
+"""
+
+import csv
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def questions_file(tmp_path):
+    path = tmp_path / "questions.jsonl"
+    lines = [
+        json.dumps({"id": "a", "question": "What currency does India use?"}),
+        "",
+        "What is the exchange rate for EUR?",
+        json.dumps({"id": "c", "question": "What currency does Japan use?"}),
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_read_batch_questions(questions_file):
+    assert main.read_batch_questions(str(questions_file)) == [
+        ("a", "What currency does India use?"),
+        ("3", "What is the exchange rate for EUR?"),
+        ("c", "What currency does Japan use?"),
+    ]
+
+
+def test_read_batch_questions_rejects_duplicate_ids(tmp_path):
+    path = tmp_path / "questions.jsonl"
+    path.write_text('{"id": "a", "question": "q1"}\n{"id": "a", "question": "q2"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="Duplicate question id 'a' on line 2"):
+        main.read_batch_questions(str(path))
+
+
+def test_resume_skips_answered_and_retries_failed(questions_file, tmp_path, monkeypatch):
+    output_file = tmp_path / "batch.csv"
+    calls = []
+    failing = {"3"}
+    
+    def fake_run_agent(question, llm_client, model, stream=True, verbose=True):
+        question_id = {"What currency does India use?": "a",
+                       "What is the exchange rate for EUR?": "3",
+                       "What currency does Japan use?": "c"}[question]
+        calls.append(question_id)
+        if question_id in failing:
+            raise RuntimeError("rate limited")
+        return f"Answer {question_id}", main.PATH_AGENT
+    
+    monkeypatch.setattr(main, "run_agent", fake_run_agent)
+    llm_client = SimpleNamespace(messages=None)
+    
+    summary = main.run_batch(str(questions_file), llm_client, "model", output_file=str(output_file), workers=2)
+    assert sorted(calls) == ["3", "a", "c"]
+    assert summary["errors"] == 1
+    assert main.load_batch_checkpoint(str(output_file)) == {"a", "c"}
+    
+    # Second run: only the failed question is asked again
+    calls.clear()
+    failing.clear()
+    summary = main.run_batch(str(questions_file), llm_client, "model", output_file=str(output_file), workers=2)
+    assert calls == ["3"]
+    assert summary["skipped"] == 2
+    
+    # The failed row was replaced
+    rows = read_rows(output_file)
+    assert [row["id"] for row in rows].count("3") == 1
+    assert {row["id"]: row["answer"] for row in rows} == {"a": "Answer a", "3": "Answer 3", "c": "Answer c"}
+    assert all(not row["error"] for row in rows)
+    
+    # A third run has nothing left to do
+    calls.clear()
+    main.run_batch(str(questions_file), llm_client, "model", output_file=str(output_file))
+    assert calls == []
+    assert len(read_rows(output_file)) == 3
+
+
+def test_compact_batch_output_keeps_last_row_per_id(tmp_path):
+    output_file = tmp_path / "batch.csv"
+    with open(output_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=main.BATCH_COLUMNS, restval="")
+        writer.writeheader()
+        writer.writerow({"id": "1", "answer": "", "error": "timeout"})
+        writer.writerow({"id": "2", "answer": "two"})
+        writer.writerow({"id": "1", "answer": "one"})
+    
+    assert main.compact_batch_output(str(output_file)) == 1
+    rows = read_rows(output_file)
+    assert [(row["id"], row["answer"], row["error"]) for row in rows] == [("1", "one", ""), ("2", "two", "")]
+    assert main.compact_batch_output(str(output_file)) == 0
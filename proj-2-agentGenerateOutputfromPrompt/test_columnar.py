@@ -0,0 +1,95 @@
+"""
+Tests for tools/columnar.py: a compiled table answers exactly like the CSV.
+"""
+
+import json
+import os
+
+import pytest
+
+from tools.columnar import MappedTable, columnar_path, compile_table
+from tools.table_index import IndexedTable
+from tools.table_reload import TableSource
+
+CSV_TEXT = (
+    "country_name,currency_name,currency_code\n"
+    "United States,US Dollar,USD\n"
+    "Côte d'Ivoire,West African CFA franc,XOF\n"
+    "\"Korea, Republic of\",Won,KRW\n"
+    "Ecuador,US Dollar,USD\n"
+    "Senegal,West African CFA franc,XOF\n"
+    "Antarctica,,\n"
+    "São Tomé and Príncipe,Dobra,STN\n"
+    "El Salvador,US Dollar,USD\n"
+)
+
+
+@pytest.fixture
+def tables(tmp_path):
+    csv_path = tmp_path / "country_currency.csv"
+    csv_path.write_text(CSV_TEXT, encoding="utf-8")
+    indexed = IndexedTable.from_csv(str(csv_path))
+    mapped = MappedTable(compile_table(str(csv_path)))
+    return indexed, mapped
+
+
+def test_rows_and_json_match_the_csv(tables):
+    indexed, mapped = tables
+    assert mapped.columns == indexed.columns
+    assert len(mapped.rows) == len(indexed.rows)
+    assert list(mapped.rows) == indexed.rows
+    assert mapped.rows[-1] == indexed.rows[-1]
+    assert mapped.rows[2:4] == indexed.rows[2:4]
+    assert json.loads(bytes(mapped.full_json())) == indexed.rows
+    assert [json.loads(bytes(mapped.row_json(row_id))) for row_id in range(len(indexed.rows))] == indexed.rows
+
+
+def test_lookups_match_the_indexed_table(tables):
+    indexed, mapped = tables
+    for column in indexed.columns:
+        values = sorted(indexed.indexes[column])
+        for value in values + ["missing", "us dollar"]:
+            assert mapped.lookup(column, [value]) == indexed.lookup(column, [value])
+        several = values[::-1] + values[:1]
+        assert mapped.lookup(column, several) == indexed.lookup(column, several)
+
+
+def test_prepared_replies_are_byte_identical(tables):
+    pytest.importorskip("fastapi")
+    from api.prepared_responses import PreparedMappedTable, PreparedTable
+    
+    indexed, mapped = tables
+    from_csv, compiled = PreparedTable(indexed), PreparedMappedTable(mapped)
+    assert bytes(compiled.full.body) == from_csv.full.body
+    assert compiled.full.etag == from_csv.full.etag
+    for values in (["USD"], ["XOF", "KRW"], ["", "USD", "XXX"], ["XXX"]):
+        assert compiled.lookup("currency_code", values).body == from_csv.lookup("currency_code", values).body
+
+
+def test_auto_format_skips_a_stale_compiled_file(tmp_path):
+    csv_path = tmp_path / "country_currency.csv"
+    csv_path.write_text(CSV_TEXT, encoding="utf-8")
+    os.utime(csv_path, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+    
+    # No compiled file yet: the CSV is loaded
+    source = TableSource(str(csv_path), data_format="auto")
+    assert source.loaded_format == "csv"
+    
+    compile_table(str(csv_path))
+    assert os.path.exists(columnar_path(str(csv_path)))
+    assert source.changed() and source.reload()
+    assert source.loaded_format == "columnar"
+    assert source.current.lookup("currency_code", ["KRW"]) == [
+        {"country_name": "Korea, Republic of", "currency_name": "Won", "currency_code": "KRW"}
+    ]
+    
+    # Editing the CSV after compiling makes the compiled file stale
+    csv_path.write_text(CSV_TEXT + "Japan,Yen,JPY\n", encoding="utf-8")
+    edited = os.stat(columnar_path(str(csv_path))).st_mtime_ns + 1_000_000_000
+    os.utime(csv_path, ns=(edited, edited))
+    assert source.changed() and source.reload()
+    assert source.loaded_format == "csv"
+    assert source.current.lookup("currency_code", ["JPY"])
+    
+    with pytest.raises(ValueError, match="not a compiled table"):
+        MappedTable(str(csv_path))
@@ -0,0 +1,115 @@
+"""
+Tests for the country APIs (api/country_currency.py, api/countries.py),
+run in-process with FastAPI's TestClient.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from api import countries, country_currency
+from api.prepared_responses import decode_cursor, encode_cursor, make_etag
+
+
+@pytest.fixture(scope="module")
+def client():
+    # The tables stay as loaded; no watcher threads during the tests
+    country_currency.source.stop_watching()
+    countries.source.stop_watching()
+    return TestClient(country_currency.app)
+
+
+def test_full_table_and_lookup_carry_etags(client):
+    full = client.get("/")
+    assert full.status_code == 200
+    assert full.headers["cache-control"] == "no-cache"
+    assert {row["country_name"] for row in full.json()} >= {"India", "Japan"}
+    
+    india = client.get("/", params={"column": "country_name", "value": "India"})
+    assert india.json() == [{"country_name": "India", "currency_name": "Indian Rupee", "currency_code": "INR"}]
+    assert india.headers["etag"] != full.headers["etag"]
+
+
+def test_if_none_match_gets_304(client):
+    params = {"column": "country_name", "value": "India"}
+    etag = client.get("/", params=params).headers["etag"]
+    
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        reply = client.get("/", params=params, headers={"If-None-Match": header})
+        assert reply.status_code == 304
+        assert reply.content == b""
+        assert reply.headers["etag"] == etag
+    
+    assert client.get("/", params=params, headers={"If-None-Match": '"other"'}).status_code == 200
+    # The ETag belongs to this reply only
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_is_stable_and_content_based(client):
+    params = [("column", "currency_code"), ("value", "USD"), ("value", "INR")]
+    first = client.get("/", params=params)
+    second = client.get("/", params=params)
+    assert first.headers["etag"] == second.headers["etag"] == make_etag(first.content)
+    assert [row["currency_code"] for row in first.json()] == ["USD", "INR"]
+    
+    # No match is an empty list, with its own ETag
+    empty = client.get("/", params={"column": "country_name", "value": "Atlantis"})
+    assert empty.json() == []
+    assert empty.headers["etag"]
+
+
+def test_unknown_column(client):
+    assert client.get("/", params={"column": "capital", "value": "Paris"}).json() == {"error": "Column 'capital' does not exist"}
+
+
+def test_cursor_pages_cover_the_table_once(client):
+    full = client.get("/").json()
+    
+    seen = []
+    params = {"limit": 4}
+    while True:
+        page = client.get("/", params=params).json()
+        assert len(page["items"]) <= 4
+        seen.extend(page["items"])
+        if page["next_cursor"] is None:
+            break
+        params = {"limit": 4, "cursor": page["next_cursor"]}
+    assert seen == full
+    
+    assert encode_cursor(5) == client.get("/", params={"limit": 5}).json()["next_cursor"]
+    assert decode_cursor(encode_cursor(12345)) == 12345
+
+
+def test_fields_project_rows(client):
+    reply = client.get("/", params=[("column", "currency_code"), ("value", "INR"), ("value", "JPY"),
+                                    ("fields", "currency_code, country_name")])
+    assert reply.json() == [{"currency_code": "INR", "country_name": "India"},
+                            {"currency_code": "JPY", "country_name": "Japan"}]
+    assert client.get("/", params={"fields": "capital"}).json() == {"error": "Field(s) capital do not exist"}
+
+
+def test_invalid_cursor(client):
+    for cursor in ("not-a-cursor", encode_cursor(1).swapcase()):
+        assert "Invalid cursor" in client.get("/", params={"limit": 2, "cursor": cursor}).json()["error"]
+    with pytest.raises(ValueError):
+        decode_cursor("cm93Oi0x")  # "row:-1"
+
+
+def test_ndjson_streams_one_row_per_line(client):
+    full = client.get("/").json()
+    
+    reply = client.get("/", params={"format": "ndjson"})
+    assert reply.headers["content-type"].startswith("application/x-ndjson")
+    assert "x-next-cursor" not in reply.headers
+    assert [json.loads(line) for line in reply.text.splitlines()] == full
+    
+    # Pages of NDJSON carry the next cursor in a header
+    first = client.get("/", params={"format": "ndjson", "limit": 2, "fields": "country_name"})
+    assert [json.loads(line) for line in first.text.splitlines()] == [{"country_name": row["country_name"]} for row in full[:2]]
+    rest = client.get("/", params={"format": "ndjson", "cursor": first.headers["x-next-cursor"]})
+    assert [json.loads(line) for line in rest.text.splitlines()] == full[2:]
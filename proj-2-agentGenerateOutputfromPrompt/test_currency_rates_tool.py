@@ -0,0 +1,145 @@
+"""
+Tests for tools/currency_rates_tool.py, run offline against fixed payloads.
+"""
+
+import time
+
+import pytest
+
+from tools.currency_rates_tool import CurrencyRatesTool
+
+
+def make_payload(next_update=None, rates=None):
+    """A small open.er-api.com style payload."""
+    payload = {
+        "result": "success",
+        "base_code": "USD",
+        "time_last_update_utc": "Mon, 01 Jan 2024 00:00:01 +0000",
+        "rates": rates or {"USD": 1.0, "EUR": 0.92, "INR": 83.1, "JPY": 148.5}
+    }
+    if next_update is not None:
+        payload["time_next_update_unix"] = next_update
+    return payload
+
+
+class FakeRatesTool(CurrencyRatesTool):
+    """CurrencyRatesTool that serves queued payloads instead of calling the API."""
+    def __init__(self, *payloads, **kwargs):
+        super().__init__(**kwargs)
+        self.payloads = list(payloads)
+        self.fetches = 0
+    
+    def _fetch_data(self):
+        self.fetches += 1
+        # The last payload keeps being served; {} stands for a failed fetch
+        return self.payloads.pop(0) if len(self.payloads) > 1 else self.payloads[0]
+
+
+def test_snapshot_expires_at_next_upstream_update():
+    next_update = int(time.time()) + 7200
+    tool = FakeRatesTool(make_payload(next_update), ttl=60, min_ttl=10)
+    
+    assert tool.get_rate("EUR")["rate"] == 0.92
+    assert tool._snapshot.expires_at == next_update
+    
+    tool.get_rate("INR")
+    tool.get_multiple_rates(["EUR", "JPY"])
+    assert tool.fetches == 1
+    assert tool.get_cache_stats()["hits"] == 2
+
+
+def test_min_ttl_floor_for_a_past_next_update():
+    tool = FakeRatesTool(make_payload(int(time.time()) - 3600), ttl=3600, min_ttl=120)
+    
+    tool.get_rate("EUR")
+    snapshot = tool._snapshot
+    assert snapshot.expires_at == pytest.approx(snapshot.fetched_at + 120)
+    assert snapshot.is_fresh()
+    
+    tool.get_rate("EUR")
+    assert tool.fetches == 1
+
+
+def test_ttl_without_next_update():
+    tool = FakeRatesTool(make_payload(), ttl=900, min_ttl=10)
+    
+    tool.get_rate("EUR")
+    snapshot = tool._snapshot
+    assert snapshot.expires_at == pytest.approx(snapshot.fetched_at + 900)
+
+
+def test_expired_snapshot_is_refetched():
+    # A next update in the past with no floor expires at once
+    past = int(time.time()) - 1
+    tool = FakeRatesTool(make_payload(past), make_payload(past, {"USD": 1.0, "EUR": 0.95}), ttl=60, min_ttl=0)
+    
+    assert tool.get_rate("EUR")["rate"] == 0.92
+    assert tool.get_rate("EUR")["rate"] == 0.95
+    assert tool.fetches == 2
+
+
+def test_failed_refresh_keeps_previous_snapshot_until_min_ttl(capsys):
+    tool = FakeRatesTool(make_payload(int(time.time()) - 1), {}, ttl=60, min_ttl=0)
+    tool.get_rate("EUR")
+    
+    tool.min_ttl = 300
+    result = tool.get_rate("EUR")
+    assert result["rate"] == 0.92
+    assert result["stale"] is True
+    assert "Serving previous exchange rate snapshot" in capsys.readouterr().err
+    
+    # No new fetch until min_ttl has passed
+    tool.get_rate("EUR")
+    assert tool.fetches == 2
+
+
+def test_round_like_python_matches_round():
+    np = pytest.importorskip("numpy")
+    from tools.currency_rates_tool import _round_like_python
+    
+    # Values next to a .5 boundary, where scaling by 10**n alone goes wrong
+    values = [1.005, 2.675, 0.125, -1.005, 1.115, 8.345, 1234.5649999, 0.0]
+    values += np.random.default_rng(7).uniform(-1e6, 1e6, 2000).tolist()
+    for ndigits in (2, 6):
+        rounded = _round_like_python(np.array(values), ndigits)
+        assert rounded.tolist() == [round(value, ndigits) for value in values]
+
+
+def test_convert_many_matches_scalar_convert():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(42)
+    codes = ["USD"] + [f"A{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(60)]
+    rates = {code: float(rate) for code, rate in zip(codes, rng.uniform(0.01, 20000, len(codes)))}
+    rates["USD"] = 1.0
+    tool = FakeRatesTool(make_payload(int(time.time()) + 3600, rates))
+    
+    amounts = np.round(rng.uniform(0, 100000, 3000), 2)
+    from_codes = rng.choice(codes, 3000)
+    to_codes = rng.choice(codes, 3000)
+    batch = tool.convert_many(amounts, from_codes, to_codes)
+    
+    scalar = [tool.convert(amount, from_code, to_code)
+              for amount, from_code, to_code in zip(amounts.tolist(), from_codes.tolist(), to_codes.tolist())]
+    assert batch["converted_amount"].tolist() == [row["converted_amount"] for row in scalar]
+    assert batch["exchange_rate"].tolist() == [row["exchange_rate"] for row in scalar]
+    assert batch["base_currency"] == "USD"
+    
+    # Integer indexes from get_currency_index() give the same result
+    index = tool.get_currency_index()
+    by_index = tool.convert_many(amounts, [index[c] for c in from_codes.tolist()], [index[c] for c in to_codes.tolist()])
+    assert by_index["converted_amount"].tolist() == batch["converted_amount"].tolist()
+
+
+def test_convert_many_unknown_codes_are_nan(capsys):
+    np = pytest.importorskip("numpy")
+    tool = FakeRatesTool(make_payload(int(time.time()) + 3600))
+    
+    result = tool.convert_many([100, 100, 100], ["usd", " EUR", "XXX"], ["INR", "jpy", "EUR"])
+    converted = result["converted_amount"]
+    assert converted[0] == tool.convert(100, "USD", "INR")["converted_amount"]
+    assert converted[1] == tool.convert(100, "EUR", "JPY")["converted_amount"]
+    assert np.isnan(converted[2])
+    assert "1 row(s) have unknown currency codes" in capsys.readouterr().err
+    
+    with pytest.raises(ValueError):
+        tool.convert_many([1, 2], ["USD"], ["EUR"])
@@ -0,0 +1,90 @@
+"""
+Tests for agent/mcp_client.py against the real MCP server (mcp_server/server.py).
+
+The server's country tool is pointed at a stand-in API on a local port,
+so no other service needs to be running.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from agent import mcp_client, tools_registry
+from agent.mcp_client import MCPClientManager
+
+
+@pytest.fixture
+def country_api(monkeypatch):
+    """Stand-in country currency API; the server process inherits its URL."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            value = parse_qs(urlparse(self.path).query).get("value", ["Testland"])[0]
+            body = json.dumps([{"country_name": value, "currency_name": "Test dollar", "currency_code": "TSD"}])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode())
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("COUNTRY_API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    yield server
+    server.shutdown()
+
+
+def test_manager_calls_tools_on_real_server(country_api):
+    pytest.importorskip("mcp")
+    manager = MCPClientManager(pool_size=1, start_timeout=60, health_interval=0).start()
+    try:
+        names = {tool["name"] for tool in manager.get_tools()}
+        assert {"get_currency_by_country", "get_exchange_rate", "get_country_currency_rates"} <= names
+        
+        result = json.loads(manager.call_tool("get_currency_by_country", {"country_name": "Testland"}))
+        assert result["success"] is True
+        assert "TSD" in json.dumps(result["data"])
+        
+        # The stats resource is read through resources/read
+        stats = manager.get_server_stats()
+        assert stats[0]["tools"]["get_currency_by_country"]["completed"] >= 1
+    finally:
+        manager.close()
+
+
+def test_shared_manager_does_not_retry_failed_start(monkeypatch):
+    starts = []
+    
+    def failing_start(self):
+        starts.append(self)
+        raise RuntimeError("Could not start the MCP server")
+    
+    monkeypatch.setattr(MCPClientManager, "start", failing_start)
+    monkeypatch.setattr(mcp_client, "_shared_manager", None)
+    monkeypatch.setattr(mcp_client, "_shared_manager_error", None)
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Could not start"):
+            mcp_client.get_shared_mcp_manager()
+    assert len(starts) == 1
+
+
+def test_backend_tools_fall_back_to_local(monkeypatch, capsys):
+    def unavailable():
+        raise RuntimeError("Could not start the MCP server")
+    
+    monkeypatch.setattr(tools_registry, "TOOL_BACKEND", "mcp")
+    monkeypatch.setattr(tools_registry, "get_shared_mcp_manager", unavailable)
+    monkeypatch.setattr(tools_registry, "_mcp_fallback_warned", False)
+    
+    tools, handler = tools_registry.create_backend_tools(None, None)
+    local_tools, _ = tools_registry.create_tools(None, None)
+    assert [tool["name"] for tool in tools] == [tool["name"] for tool in local_tools]
+    assert callable(handler)
+    
+    tools_registry.create_backend_tools(None, None)
+    assert capsys.readouterr().out.count("MCP tool backend unavailable") == 1
@@ -0,0 +1,76 @@
+"""
+Tests for tools/rate_history.py (range queries and downsampling).
+"""
+
+import math
+
+from tools.rate_history import RateHistory, parse_time
+
+DAY = 86400
+START = parse_time("2026-01-01")
+
+
+def make_history(days=100):
+    """One snapshot a day from 2026-01-01; INR rises by 0.1 a day, EUR joins on day 10."""
+    history = RateHistory()
+    for day in range(days):
+        rates = {"USD": 1.0, "INR": round(80 + day * 0.1, 4)}
+        if day >= 10:
+            rates["EUR"] = 0.9
+        history.append({"base_code": "USD", "time_last_update_unix": START + day * DAY, "rates": rates})
+    return history
+
+
+def test_append_ignores_out_of_order_snapshots():
+    history = make_history(3)
+    assert not history.append({"time_last_update_unix": START + DAY, "rates": {"INR": 1.0}})
+    assert not history.append({"time_last_update_unix": START + 10 * DAY, "rates": {}})
+    assert len(history) == 3
+
+
+def test_range_is_inclusive_of_whole_days():
+    history = make_history()
+    
+    timestamps, rates = history.get_range("inr", "2026-01-05", "2026-01-07")
+    assert list(timestamps) == [START + 4 * DAY, START + 5 * DAY, START + 6 * DAY]
+    assert list(rates) == [80.4, 80.5, 80.6]
+    
+    timestamps, _ = history.get_range("INR", start=START + 98 * DAY)
+    assert len(timestamps) == 2
+    timestamps, _ = history.get_range("INR", end="2026-01-01")
+    assert list(timestamps) == [START]
+
+
+def test_unknown_currency_and_empty_range():
+    history = make_history()
+    assert len(history.get_range("XXX")[0]) == 0
+    assert len(history.get_range("INR", "2027-01-01")[0]) == 0
+    assert history.get_series("XXX") == {}
+
+
+def test_late_currency_is_padded_with_nan():
+    history = make_history(20)
+    _, rates = history.get_range("EUR")
+    assert len(rates) == 20
+    assert all(math.isnan(rate) for rate in rates[:10])
+    
+    # The series skips the missing days
+    series = history.get_series("EUR")
+    assert series["samples"] == 10
+    assert series["start"] == "2026-01-11"
+
+
+def test_series_downsamples_to_last_rate_per_bucket():
+    history = make_history()
+    series = history.get_series("INR", max_points=10)
+    
+    assert series["samples"] == 100
+    assert len(series["points"]) == 10
+    # Each bucket of 10 days keeps its last day, so the range end is included
+    assert series["points"][0] == ["2026-01-10", 80.9]
+    assert series["points"][-1] == ["2026-04-10", 89.9]
+    assert (series["first"], series["last"], series["min"], series["max"]) == (80.0, 89.9, 80.0, 89.9)
+    assert series["change_pct"] == round((89.9 - 80.0) / 80.0 * 100, 4)
+    
+    short = history.get_series("INR", "2026-01-01", "2026-01-03", max_points=10)
+    assert [rate for _, rate in short["points"]] == [80.0, 80.1, 80.2]
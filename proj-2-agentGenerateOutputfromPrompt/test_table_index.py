@@ -0,0 +1,62 @@
+"""
+Tests for tools/table_index.py (indexed lookups match a full scan).
+"""
+
+import os
+
+import pytest
+
+from tools.table_index import IndexedTable
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "table.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def scan(table, column, values):
+    """Reference answer: scan every row once per requested value."""
+    return [row for value in dict.fromkeys(values) for row in table.rows if row[column] == value]
+
+
+def test_lookup_matches_full_scan():
+    table = IndexedTable.from_csv(os.path.join(DATA_DIR, "country_currency.csv"))
+    assert table.columns == ["country_name", "currency_name", "currency_code"]
+    
+    for column in table.columns:
+        values = sorted({row[column] for row in table.rows})
+        for value in values:
+            assert table.lookup(column, [value]) == scan(table, column, [value])
+        assert table.lookup(column, values + values[:1]) == scan(table, column, values)
+
+
+def test_lookup_groups_by_value_in_the_order_given(tmp_path):
+    table = IndexedTable.from_csv(write_csv(tmp_path, (
+        "country_name,currency_code\n"
+        "France,EUR\n"
+        "India,INR\n"
+        "Germany,EUR\n"
+    )))
+    assert [row["country_name"] for row in table.lookup("currency_code", ["INR", "EUR", "INR"])] == ["India", "France", "Germany"]
+    assert table.lookup("currency_code", ["XXX"]) == []
+    assert table.lookup("country_name", ["india"]) == []
+    assert table.has_column("currency_code")
+    assert not table.has_column("capital")
+
+
+def test_from_csv_rejects_ragged_rows(tmp_path):
+    with pytest.raises(ValueError, match="line 3"):
+        IndexedTable.from_csv(write_csv(tmp_path, "a,b\n1,2\n3\n"))
+    with pytest.raises(ValueError, match="line 2"):
+        IndexedTable.from_csv(write_csv(tmp_path, "a,b\n1,2,3\n"))
+
+
+def test_from_csv_strips_byte_order_mark(tmp_path):
+    path = tmp_path / "bom.csv"
+    path.write_bytes("\ufeffcode,name\nINR,Rupee\n".encode("utf-8"))
+    table = IndexedTable.from_csv(str(path))
+    assert table.columns == ["code", "name"]
+    assert table.lookup("code", ["INR"]) == [{"code": "INR", "name": "Rupee"}]
@@ -0,0 +1,101 @@
+"""
+Tests for tools/table_reload.py (table swap when the CSV changes).
+"""
+
+import os
+import time
+
+import pytest
+
+from tools.table_reload import TableSource
+
+HEADER = "country_name,currency_name,currency_code\n"
+
+
+def write_table(path, *rows, mtime=None):
+    path.write_text(HEADER + "".join(row + "\n" for row in rows), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "country_currency.csv"
+    write_table(path, "India,Indian Rupee,INR", mtime=1_000_000_000_000_000_000)
+    return path
+
+
+def test_reload_swaps_in_a_new_table(csv_path):
+    source = TableSource(str(csv_path), data_format="csv")
+    old = source.current
+    assert not source.changed()
+    
+    write_table(csv_path, "India,Indian Rupee,INR", "Japan,Japanese Yen,JPY", mtime=1_000_000_001_000_000_000)
+    assert source.changed()
+    assert source.reload()
+    
+    # Readers holding the old table keep a complete, unchanged view
+    assert [row["country_name"] for row in old.rows] == ["India"]
+    assert source.current is not old
+    assert source.current.lookup("currency_code", ["JPY"])[0]["country_name"] == "Japan"
+    assert not source.changed()
+    
+    status = source.get_status()
+    assert (status["rows"], status["format"], status["etag"]) == (2, "csv", None)
+    assert status["reloads"] == source.version
+
+
+def test_failed_reload_keeps_the_current_table(csv_path):
+    source = TableSource(str(csv_path), data_format="csv")
+    current = source.current
+    
+    write_table(csv_path, "India,Indian Rupee", mtime=1_000_000_002_000_000_000)
+    assert not source.reload()
+    assert source.current is current
+    status = source.get_status()
+    assert status["failures"] == 1
+    assert "line 2" in status["last_error"]
+    # The broken file is not retried until it changes again
+    assert not source.changed()
+    
+    write_table(csv_path, "Japan,Japanese Yen,JPY", mtime=1_000_000_003_000_000_000)
+    assert source.reload()
+    assert source.get_status()["last_error"] is None
+
+
+def test_load_errors_are_raised_on_start(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TableSource(str(tmp_path / "missing.csv"), data_format="csv")
+    with pytest.raises(ValueError, match="Unknown data format"):
+        TableSource(str(tmp_path / "missing.csv"), data_format="xml")
+
+
+def test_prepare_step_is_applied_on_every_load(csv_path):
+    prepared = []
+    
+    def prepare(table, data_format):
+        prepared.append(data_format)
+        return {"table": table}
+    
+    source = TableSource(str(csv_path), prepare=prepare, data_format="csv")
+    write_table(csv_path, "Japan,Japanese Yen,JPY", mtime=1_000_000_004_000_000_000)
+    source.reload()
+    assert prepared == ["csv", "csv"]
+    assert source.current["table"].rows[0]["currency_code"] == "JPY"
+
+
+def test_watcher_picks_up_changes(csv_path):
+    source = TableSource(str(csv_path), data_format="csv")
+    assert source.start_watching(interval=0) is None
+    
+    watcher = source.start_watching(interval=0.02)
+    try:
+        write_table(csv_path, "Japan,Japanese Yen,JPY", mtime=1_000_000_005_000_000_000)
+        deadline = time.monotonic() + 5
+        while source.version < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert source.version == 2
+        assert source.get_status()["watching"]
+    finally:
+        source.stop_watching()
+    assert not watcher.is_alive()
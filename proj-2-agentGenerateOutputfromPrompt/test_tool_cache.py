@@ -0,0 +1,131 @@
+"""
+Tests for agent/tool_cache.py (TTLs, LRU eviction, negative entries, key folding).
+"""
+
+import pytest
+
+from agent import tool_cache
+from agent.tool_cache import ToolResultCache
+
+
+class Clock:
+    """Stand-in for the time module with a monotonic clock moved by hand."""
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(tool_cache, "time", clock)
+    return clock
+
+
+class RecordingHandler:
+    """Tool handler that records its calls and answers from a dict."""
+    def __init__(self, replies=None):
+        self.replies = replies or {}
+        self.calls = []
+    
+    def __call__(self, tool_name, tool_input):
+        self.calls.append((tool_name, tool_input))
+        return self.replies.get(tool_name, f"{tool_name} result")
+
+
+def test_results_expire_after_their_tool_ttl(clock):
+    cache = ToolResultCache(ttls={"get_exchange_rate": 60, "get_currency_by_country": 3600})
+    handler = RecordingHandler()
+    cached = cache.wrap(handler)
+    
+    cached("get_exchange_rate", {"currency": "EUR"})
+    cached("get_currency_by_country", {"country": "India"})
+    clock.now += 59
+    cached("get_exchange_rate", {"currency": "EUR"})
+    assert len(handler.calls) == 2
+    
+    clock.now += 2
+    cached("get_exchange_rate", {"currency": "EUR"})
+    cached("get_currency_by_country", {"country": "India"})
+    assert [name for name, _ in handler.calls] == ["get_exchange_rate", "get_currency_by_country", "get_exchange_rate"]
+    
+    stats = cache.get_stats()["get_exchange_rate"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ToolResultCache(max_entries=2)
+    handler = RecordingHandler()
+    cached = cache.wrap(handler)
+    
+    cached("get_exchange_rate", {"currency": "EUR"})
+    cached("get_exchange_rate", {"currency": "INR"})
+    cached("get_exchange_rate", {"currency": "EUR"})  # EUR is now the most recent
+    cached("get_exchange_rate", {"currency": "JPY"})  # evicts INR
+    assert len(handler.calls) == 3
+    
+    cached("get_exchange_rate", {"currency": "EUR"})
+    assert len(handler.calls) == 3
+    cached("get_exchange_rate", {"currency": "INR"})
+    assert len(handler.calls) == 4
+    assert cache.get_stats()["get_exchange_rate"]["evictions"] == 2
+
+
+def test_negative_entries_use_the_negative_ttl(clock):
+    cache = ToolResultCache(ttls={"get_currency_by_country": 3600}, negative_ttl=30)
+    handler = RecordingHandler({"get_currency_by_country": "Could not find currency information for 'Atlantis'."})
+    cached = cache.wrap(handler)
+    
+    cached("get_currency_by_country", {"country": "Atlantis"})
+    clock.now += 29
+    cached("get_currency_by_country", {"country": "Atlantis"})
+    assert len(handler.calls) == 1
+    assert cache.get_stats()["get_currency_by_country"]["negative_hits"] == 1
+    
+    clock.now += 2
+    cached("get_currency_by_country", {"country": "Atlantis"})
+    assert len(handler.calls) == 2
+
+
+def test_errors_are_not_cached(clock):
+    cache = ToolResultCache()
+    handler = RecordingHandler({"get_exchange_rate": "Error executing get_exchange_rate: timed out"})
+    cached = cache.wrap(handler)
+    
+    cached("get_exchange_rate", {"currency": "EUR"})
+    cached("get_exchange_rate", {"currency": "EUR"})
+    assert len(handler.calls) == 2
+    assert cache.get_stats()["get_exchange_rate"]["uncached_errors"] == 2
+
+
+def test_keys_fold_case_and_whitespace(clock):
+    cache = ToolResultCache()
+    cache.set_country_names(["India", "United States"])
+    handler = RecordingHandler()
+    cached = cache.wrap(handler)
+    
+    for country in ("India", "india ", " INDIA", "Bharat"):
+        cached("get_currency_by_country", {"country": country})
+    for currency in ("INR", " inr", "Inr "):
+        cached("get_exchange_rate", {"currency": currency})
+    cached("get_currencies_by_countries", {"countries": ["india", "USA", "India"]})
+    cached("get_currencies_by_countries", {"countries": ["India", "united  states"]})
+    
+    assert handler.calls == [
+        ("get_currency_by_country", {"country": "India"}),
+        ("get_exchange_rate", {"currency": "INR"}),
+        ("get_currencies_by_countries", {"countries": ["India", "United States", "India"]}),
+    ]
+
+
+def test_unknown_names_are_passed_on_unchanged(clock):
+    cache = ToolResultCache()
+    cache.set_country_names(["India"])
+    handler = RecordingHandler()
+    cached = cache.wrap(handler)
+    
+    cached("get_currency_by_country", {"country": "atlantis"})
+    cached("get_currency_by_country", {"country": "Atlantis"})
+    assert [tool_input["country"] for _, tool_input in handler.calls] == ["atlantis", "Atlantis"]
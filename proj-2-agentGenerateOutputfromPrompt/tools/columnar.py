@@ -0,0 +1,240 @@
+"""
+Compiled columnar format for the reference CSVs, loaded with mmap.
+
+Parsing a CSV and building its indexes costs time and memory in every
+process that serves it (each API worker, each agent with the embedded
+backend). `python -m tools.columnar` compiles data/*.csv once into .cols
+files holding the columns, a sorted lookup index per column and the
+encoded JSON of every row. Processes then memory-map the file read-only:
+opening it is independent of the table size, nothing is parsed, and the
+pages are shared by every process through the OS page cache.
+
+Layout (integers in the byte order recorded in the header):
+- 8 bytes magic, 4 bytes header length, then a JSON header with the
+  columns, row count, byte order and the [offset, length] of each section
+- 'json': '[row0,row1,...]', the whole table as a JSON array; 'json_offsets'
+  (uint64, one (start, end) pair per row) locates each row inside it
+- per column: 'text:<column>' (the UTF-8 values back to back),
+  'offsets:<column>' (uint64, rows + 1 boundaries) and 'index:<column>'
+  (uint32 row ids sorted by (value bytes, row id)); a lookup is a binary
+  search over the index
+Sections start on 8-byte boundaries.
+
+Recompile after editing a CSV; the file is replaced atomically and
+running services pick it up (see tools/table_reload.py).
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+from tools.table_index import IndexedTable
+
+MAGIC = b"COLTAB01"
+EXTENSION = ".cols"
+
+
+def columnar_path(csv_path):
+    """Path of the compiled file for a CSV file."""
+    return os.path.splitext(csv_path)[0] + EXTENSION
+
+
+def _encode_row(row):
+    """Compact JSON of one record, the same bytes the API encoder produces."""
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compile_table(csv_path, out_path=None):
+    """
+    Compile a CSV file into the columnar format.
+    
+    Args:
+        csv_path (str): CSV file (header row first).
+        out_path (str): Output file (optional, default: next to the CSV with a .cols extension).
+    
+    Returns:
+        str: Path of the written file.
+    """
+    out_path = out_path or columnar_path(csv_path)
+    table = IndexedTable.from_csv(csv_path)
+    rows = table.rows
+    
+    sections = []
+    row_json = [_encode_row(row) for row in rows]
+    json_offsets = array("Q")
+    position = 1
+    for encoded in row_json:
+        json_offsets.extend((position, position + len(encoded)))
+        position += len(encoded) + 1
+    full_json = b"[" + b",".join(row_json) + b"]"
+    sections.append(("json", full_json))
+    sections.append(("json_offsets", json_offsets.tobytes()))
+    
+    for column in table.columns:
+        values = [row[column].encode("utf-8") for row in rows]
+        offsets = array("Q", [0])
+        for value in values:
+            offsets.append(offsets[-1] + len(value))
+        index = array("I", sorted(range(len(rows)), key=lambda row_id: (values[row_id], row_id)))
+        sections.append((f"text:{column}", b"".join(values)))
+        sections.append((f"offsets:{column}", offsets.tobytes()))
+        sections.append((f"index:{column}", index.tobytes()))
+    
+    # Offsets in the header depend on the header's own length: lay out the
+    # sections after a header padded to a fixed size
+    header = {
+        "columns": table.columns,
+        "rows": len(rows),
+        "byteorder": sys.byteorder,
+        "source": os.path.basename(csv_path),
+        "etag": f'"{hashlib.blake2b(full_json, digest_size=16).hexdigest()}"',
+        "sections": {}
+    }
+    # (each entry: quoted name plus at most '": [<20 digits>, <20 digits>], ')
+    header_size = len(json.dumps(header)) + sum(len(json.dumps(name)) + 48 for name, _ in sections)
+    position = _align(len(MAGIC) + 4 + header_size)
+    for name, data in sections:
+        header["sections"][name] = [position, len(data)]
+        position = _align(position + len(data))
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+    
+    # Write next to the target and rename, so readers never see a partial file
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + len(header_bytes).to_bytes(4, "little") + header_bytes)
+        for name, data in sections:
+            f.seek(header["sections"][name][0])
+            f.write(data)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def _align(position):
+    return (position + 7) & ~7
+
+
+class MappedRows:
+    """Read-only sequence of a MappedTable's records, decoded on access."""
+    def __init__(self, table):
+        self._table = table
+    
+    def __len__(self):
+        return self._table.row_count
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._table.row(row_id) for row_id in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("row index out of range")
+        return self._table.row(item)
+    
+    def __iter__(self):
+        for row_id in range(len(self)):
+            yield self._table.row(row_id)
+
+
+class MappedTable:
+    """
+    A compiled table, memory-mapped read-only.
+    
+    Same lookup interface as IndexedTable (columns, rows, has_column(),
+    lookup()); records are decoded from the mapping when accessed, so
+    each call returns new dicts.
+    """
+    def __init__(self, path):
+        """
+        Map a compiled file.
+        
+        Args:
+            path (str): Path of a file written by compile_table().
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a compiled table")
+        header_length = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 4], "little")
+        header_start = len(MAGIC) + 4
+        self.header = json.loads(bytes(self._mmap[header_start:header_start + header_length]))
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was compiled on a {self.header['byteorder']}-endian machine; recompile it")
+        
+        self.columns = self.header["columns"]
+        self.row_count = self.header["rows"]
+        self.etag = self.header["etag"]
+        self.rows = MappedRows(self)
+        view = memoryview(self._mmap)
+        self._sections = {name: view[start:start + length] for name, (start, length) in self.header["sections"].items()}
+        self._json_offsets = self._sections["json_offsets"].cast("Q")
+        self._text = {column: self._sections[f"text:{column}"] for column in self.columns}
+        self._offsets = {column: self._sections[f"offsets:{column}"].cast("Q") for column in self.columns}
+        self._index = {column: self._sections[f"index:{column}"].cast("I") for column in self.columns}
+    
+    def value(self, column, row_id):
+        """UTF-8 bytes of one cell."""
+        offsets = self._offsets[column]
+        return self._text[column][offsets[row_id]:offsets[row_id + 1]].tobytes()
+    
+    def row(self, row_id):
+        """Decode one record."""
+        return {column: self.value(column, row_id).decode("utf-8") for column in self.columns}
+    
+    def row_json(self, row_id):
+        """Encoded JSON of one record (a view into the mapping)."""
+        return self._sections["json"][self._json_offsets[2 * row_id]:self._json_offsets[2 * row_id + 1]]
+    
+    def full_json(self):
+        """Encoded JSON array of the whole table (a view into the mapping)."""
+        return self._sections["json"]
+    
+    def has_column(self, column):
+        """Return True if the table has this column."""
+        return column in self._index
+    
+    def lookup_ids(self, column, values):
+        """
+        Get the row ids whose `column` equals any of `values`.
+        
+        Args:
+            column (str): Column to match (must exist, see has_column()).
+            values (list): Values to match; duplicates are ignored.
+        
+        Returns:
+            list: Row ids, grouped by value in the order given (file order within a value).
+        """
+        index = self._index[column]
+        text = self._text[column]
+        offsets = self._offsets[column]
+        cell = lambda row_id: text[offsets[row_id]:offsets[row_id + 1]].tobytes()
+        row_ids = []
+        for value in dict.fromkeys(values):
+            key = value.encode("utf-8")
+            # Matches are adjacent in the index; most values have only a few
+            position = bisect_left(index, key, key=cell)
+            while position < len(index) and cell(index[position]) == key:
+                row_ids.append(index[position])
+                position += 1
+        return row_ids
+    
+    def lookup(self, column, values):
+        """Same as IndexedTable.lookup(): the matching records."""
+        return [self.row(row_id) for row_id in self.lookup_ids(column, values)]
+
+
+if __name__ == "__main__":
+    # Compile the given CSV files, or every CSV in data/
+    # Run from the project folder: python -m tools.columnar [file.csv ...]
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    paths = sys.argv[1:] or sorted(
+        os.path.join(data_dir, name) for name in os.listdir(data_dir) if name.endswith(".csv")
+    )
+    for csv_path in paths:
+        out_path = compile_table(csv_path)
+        table = MappedTable(out_path)
+        print(f"{csv_path} -> {out_path} ({table.row_count} rows, {os.path.getsize(out_path)} bytes)")
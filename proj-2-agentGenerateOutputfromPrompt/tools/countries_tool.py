@@ -0,0 +1,217 @@
+import requests
+
+from tools.http_pool import async_get_json, async_iter_ndjson, get_json, iter_ndjson
+from tools.embedded_data import iter_embedded, query_embedded, resolve_backend
+
+class CountriesTool:
+    """
+    Tool to query country data from the local FastAPI endpoint.
+    """
+    def __init__(self, base_url="http://127.0.0.1:5002", backend=None):
+        """
+        Initialize the CountriesTool with the API endpoint URL.
+        
+        Args:
+            base_url (str): Base URL of the country API endpoint.
+            backend (str): 'http' (ask the API) or 'embedded' (load the data
+                           in this process, see tools/embedded_data.py);
+                           default COUNTRY_DATA_BACKEND.
+        """
+        self.base_url = base_url
+        self.backend = resolve_backend(backend)
+    
+    def _fetch_countries(self, query_params=None):
+        """
+        Fetch countries from the API.
+        
+        Args:
+            query_params (dict): Query parameters for filtering (optional).
+        
+        Returns:
+            list: List of dictionaries containing country data or error dict.
+        """
+        try:
+            params = query_params or {}
+            if self.backend == "embedded":
+                # Same tables and results as the API, without the round trip
+                data = query_embedded("countries", params)
+            else:
+                # Pooled keep-alive session shared by all tools; unchanged
+                # data comes back as an empty 304 and the cached body is reused
+                data = get_json(f"{self.base_url}/", params=params)
+            
+            # Handle error responses
+            if isinstance(data, dict) and 'error' in data:
+                print(f"API Error: {data['error']}")
+                return []
+            
+            return data
+        except requests.exceptions.ConnectionError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.countries:app --port 5002")
+            return []
+        except Exception as e:
+            print(f"Error fetching countries: {e}")
+            return []
+    
+    def get_all_countries(self):
+        """
+        Get all countries.
+        
+        Returns:
+            list: List of all country records.
+        """
+        return self._fetch_countries()
+    
+    def iter_countries(self, fields=None, page_size=None):
+        """
+        Stream all countries without loading the whole table.
+        
+        Args:
+            fields (list): Columns to return, e.g. ['country_name'] (optional, default all).
+            page_size (int): Records per request (optional, default one streamed request).
+        
+        Yields:
+            dict: One country record.
+        """
+        params = {"fields": ",".join(fields)} if fields else None
+        try:
+            if self.backend == "embedded":
+                yield from iter_embedded("countries", fields)
+            else:
+                yield from iter_ndjson(f"{self.base_url}/", params=params, page_size=page_size)
+        except requests.exceptions.ConnectionError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.countries:app --port 5002")
+        except Exception as e:
+            print(f"Error fetching countries: {e}")
+    
+    def get_country_by_column(self, column, value):
+        """
+        Get countries filtered by a specific column value.
+        
+        Args:
+            column (str): Column name to filter by (e.g., 'country_code', 'country_name').
+            value (str): Value to filter by.
+        
+        Returns:
+            list: List of matching countries.
+        """
+        return self._fetch_countries(query_params={"column": column, "value": value})
+    
+    def get_country_by_code(self, country_code):
+        """
+        Get country information by country code.
+        
+        Args:
+            country_code (str): The country code (e.g., 'US', 'IN').
+        
+        Returns:
+            list: List containing the country if found.
+        """
+        return self.get_country_by_column("country_code", country_code)
+    
+    def get_country_by_name(self, country_name):
+        """
+        Get country information by country name.
+        
+        Args:
+            country_name (str): The country name (e.g., 'India', 'United States').
+        
+        Returns:
+            list: List containing the country if found.
+        """
+        return self.get_country_by_column("country_name", country_name)
+
+
+class AsyncCountriesTool:
+    """
+    Async counterpart of CountriesTool for use inside event loops.
+    
+    Same methods and results, but every call is awaited on the shared
+    async connection pool instead of blocking the loop.
+    """
+    def __init__(self, base_url="http://127.0.0.1:5002", backend=None):
+        """
+        Initialize the AsyncCountriesTool with the API endpoint URL.
+        
+        Args:
+            base_url (str): Base URL of the country API endpoint.
+            backend (str): 'http' (ask the API) or 'embedded' (load the data
+                           in this process, see tools/embedded_data.py);
+                           default COUNTRY_DATA_BACKEND.
+        """
+        self.base_url = base_url
+        self.backend = resolve_backend(backend)
+    
+    async def _fetch_countries(self, query_params=None):
+        """
+        Fetch countries from the API.
+        
+        Args:
+            query_params (dict): Query parameters for filtering (optional).
+        
+        Returns:
+            list: List of dictionaries containing country data or error dict.
+        """
+        import httpx
+        try:
+            params = query_params or {}
+            if self.backend == "embedded":
+                data = query_embedded("countries", params)
+            else:
+                data = await async_get_json(f"{self.base_url}/", params=params)
+            
+            # Handle error responses
+            if isinstance(data, dict) and 'error' in data:
+                print(f"API Error: {data['error']}")
+                return []
+            
+            return data
+        except httpx.ConnectError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.countries:app --port 5002")
+            return []
+        except Exception as e:
+            print(f"Error fetching countries: {e}")
+            return []
+    
+    async def get_all_countries(self):
+        """Async version of CountriesTool.get_all_countries()."""
+        return await self._fetch_countries()
+    
+    async def iter_countries(self, fields=None, page_size=None):
+        """Async version of CountriesTool.iter_countries()."""
+        import httpx
+        params = {"fields": ",".join(fields)} if fields else None
+        try:
+            if self.backend == "embedded":
+                for record in iter_embedded("countries", fields):
+                    yield record
+            else:
+                async for record in async_iter_ndjson(f"{self.base_url}/", params=params, page_size=page_size):
+                    yield record
+        except httpx.ConnectError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.countries:app --port 5002")
+        except Exception as e:
+            print(f"Error fetching countries: {e}")
+    
+    async def get_country_by_column(self, column, value):
+        """Async version of CountriesTool.get_country_by_column()."""
+        return await self._fetch_countries(query_params={"column": column, "value": value})
+    
+    async def get_country_by_code(self, country_code):
+        """Async version of CountriesTool.get_country_by_code()."""
+        return await self.get_country_by_column("country_code", country_code)
+    
+    async def get_country_by_name(self, country_name):
+        """Async version of CountriesTool.get_country_by_name()."""
+        return await self.get_country_by_column("country_name", country_name)
+
+
+# Example usage:
+# from tools.countries_tool import CountriesTool
+# tool = CountriesTool()
+# all_countries = tool.get_all_countries()
+# india = tool.get_country_by_name("India")
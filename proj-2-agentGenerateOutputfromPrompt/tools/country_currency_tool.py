@@ -1,17 +1,24 @@
 import requests
 
+from tools.http_pool import async_get_json, async_iter_ndjson, get_etag_stats, get_json, get_pool_stats, iter_ndjson
+from tools.embedded_data import iter_embedded, query_embedded, resolve_backend
+
 class CountryCurrencyTool:
     """
     Tool to query country currency data from the local FastAPI endpoint.
     """
-    def __init__(self, base_url="http://127.0.0.1:5003"):
+    def __init__(self, base_url="http://127.0.0.1:5003", backend=None):
         """
         Initialize the CountryCurrencyTool with the API endpoint URL.
         
         Args:
             base_url (str): Base URL of the country currency API endpoint.
+            backend (str): 'http' (ask the API) or 'embedded' (load the data
+                           in this process, see tools/embedded_data.py);
+                           default COUNTRY_DATA_BACKEND.
         """
         self.base_url = base_url
+        self.backend = resolve_backend(backend)
     
     def _fetch_data(self, query_params=None):
         """
@@ -25,9 +32,13 @@ class CountryCurrencyTool:
         """
         try:
             params = query_params or {}
-            response = requests.get(f"{self.base_url}/", params=params)
-            response.raise_for_status()
-            data = response.json()
+            if self.backend == "embedded":
+                # Same tables and results as the API, without the round trip
+                data = query_embedded("country_currency", params)
+            else:
+                # Pooled keep-alive session shared by all tools; unchanged
+                # data comes back as an empty 304 and the cached body is reused
+                data = get_json(f"{self.base_url}/", params=params)
             
             # Handle error responses
             if isinstance(data, dict) and 'error' in data:
@@ -37,7 +48,7 @@ class CountryCurrencyTool:
             return data
         except requests.exceptions.ConnectionError:
             print(f"Error: Could not connect to API at {self.base_url}")
-            print("Make sure the API is running: python -m uvicorn api.country_currency:app --reload --port 5003")
+            print("Make sure the API is running: python -m uvicorn api.country_currency:app --port 5003")
             return []
         except Exception as e:
             print(f"Error fetching data: {e}")
@@ -52,13 +63,39 @@ class CountryCurrencyTool:
         """
         return self._fetch_data()
     
+    def iter_country_currencies(self, fields=None, page_size=None):
+        """
+        Stream all country currency records without loading the whole table.
+        
+        Records are yielded as they arrive from the API (NDJSON), so large
+        tables can be processed with flat memory.
+        
+        Args:
+            fields (list): Columns to return, e.g. ['country_name', 'currency_code'] (optional, default all).
+            page_size (int): Records per request (optional, default one streamed request).
+        
+        Yields:
+            dict: One country currency record.
+        """
+        params = {"fields": ",".join(fields)} if fields else None
+        try:
+            if self.backend == "embedded":
+                yield from iter_embedded("country_currency", fields)
+            else:
+                yield from iter_ndjson(f"{self.base_url}/", params=params, page_size=page_size)
+        except requests.exceptions.ConnectionError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.country_currency:app --port 5003")
+        except Exception as e:
+            print(f"Error fetching data: {e}")
+    
     def get_by_column(self, column, value):
         """
         Get country currency data filtered by a specific column value.
         
         Args:
             column (str): Column name to filter by (e.g., 'country_name', 'currency_code').
-            value (str): Value to filter by.
+            value (str or list): Value to filter by, or a list of values to match any of.
         
         Returns:
             list: List of matching records.
@@ -77,6 +114,20 @@ class CountryCurrencyTool:
         """
         return self.get_by_column("country_name", country_name)
     
+    def get_by_country_names(self, country_names):
+        """
+        Get currency information for several countries in one request.
+        
+        Args:
+            country_names (list): Country names (e.g., ['India', 'Japan']).
+        
+        Returns:
+            list: Currency records of the countries that were found.
+        """
+        if not country_names:
+            return []
+        return self.get_by_column("country_name", list(country_names))
+    
     def get_by_currency_code(self, currency_code):
         """
         Get country information by currency code.
@@ -102,8 +153,105 @@ class CountryCurrencyTool:
         return self.get_by_column("currency_name", currency_name)
 
 
+class AsyncCountryCurrencyTool:
+    """
+    Async counterpart of CountryCurrencyTool for use inside event loops.
+    
+    Same methods and results, but every call is awaited on the shared
+    async connection pool instead of blocking the loop.
+    """
+    def __init__(self, base_url="http://127.0.0.1:5003", backend=None):
+        """
+        Initialize the AsyncCountryCurrencyTool with the API endpoint URL.
+        
+        Args:
+            base_url (str): Base URL of the country currency API endpoint.
+            backend (str): 'http' (ask the API) or 'embedded' (load the data
+                           in this process, see tools/embedded_data.py);
+                           default COUNTRY_DATA_BACKEND.
+        """
+        self.base_url = base_url
+        self.backend = resolve_backend(backend)
+    
+    async def _fetch_data(self, query_params=None):
+        """
+        Fetch country currency data from the API.
+        
+        Args:
+            query_params (dict): Query parameters for filtering (optional).
+        
+        Returns:
+            list: List of dictionaries containing country currency data or error dict.
+        """
+        import httpx
+        try:
+            params = query_params or {}
+            if self.backend == "embedded":
+                data = query_embedded("country_currency", params)
+            else:
+                data = await async_get_json(f"{self.base_url}/", params=params)
+            
+            # Handle error responses
+            if isinstance(data, dict) and 'error' in data:
+                print(f"API Error: {data['error']}")
+                return []
+            
+            return data
+        except httpx.ConnectError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.country_currency:app --port 5003")
+            return []
+        except Exception as e:
+            print(f"Error fetching data: {e}")
+            return []
+    
+    async def get_all_country_currencies(self):
+        """Async version of CountryCurrencyTool.get_all_country_currencies()."""
+        return await self._fetch_data()
+    
+    async def iter_country_currencies(self, fields=None, page_size=None):
+        """Async version of CountryCurrencyTool.iter_country_currencies()."""
+        import httpx
+        params = {"fields": ",".join(fields)} if fields else None
+        try:
+            if self.backend == "embedded":
+                for record in iter_embedded("country_currency", fields):
+                    yield record
+            else:
+                async for record in async_iter_ndjson(f"{self.base_url}/", params=params, page_size=page_size):
+                    yield record
+        except httpx.ConnectError:
+            print(f"Error: Could not connect to API at {self.base_url}")
+            print("Make sure the API is running: python -m uvicorn api.country_currency:app --port 5003")
+        except Exception as e:
+            print(f"Error fetching data: {e}")
+    
+    async def get_by_column(self, column, value):
+        """Async version of CountryCurrencyTool.get_by_column()."""
+        return await self._fetch_data(query_params={"column": column, "value": value})
+    
+    async def get_by_country_name(self, country_name):
+        """Async version of CountryCurrencyTool.get_by_country_name()."""
+        return await self.get_by_column("country_name", country_name)
+    
+    async def get_by_country_names(self, country_names):
+        """Async version of CountryCurrencyTool.get_by_country_names()."""
+        if not country_names:
+            return []
+        return await self.get_by_column("country_name", list(country_names))
+    
+    async def get_by_currency_code(self, currency_code):
+        """Async version of CountryCurrencyTool.get_by_currency_code()."""
+        return await self.get_by_column("currency_code", currency_code)
+    
+    async def get_by_currency_name(self, currency_name):
+        """Async version of CountryCurrencyTool.get_by_currency_name()."""
+        return await self.get_by_column("currency_name", currency_name)
+
+
 if __name__ == "__main__":
     # Example usage - works with country currency data
+    # Run from the project folder: python -m tools.country_currency_tool
     tool = CountryCurrencyTool()
     
     print("=== Testing CountryCurrencyTool ===")
@@ -125,3 +273,14 @@ if __name__ == "__main__":
     print("\n4. Get countries using Euro:")
     euro_countries = tool.get_by_currency_name("Euro")
     print(euro_countries)
+    
+    print("\n5. Connection pool stats (one connection reused for all calls):")
+    print(get_pool_stats())
+    
+    print("\n6. Stream country names and codes, 2 records per request:")
+    for item in tool.iter_country_currencies(fields=["country_name", "currency_code"], page_size=2):
+        print(f"  {item['country_name']}: {item['currency_code']}")
+    
+    print("\n7. Repeat lookup (answered with 304 Not Modified, no body sent):")
+    tool.get_by_country_name("India")
+    print(get_etag_stats())
@@ -1,43 +1,396 @@
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
 import requests
 
+from tools.http_pool import async_get, get_session, get_timeout
+from tools.rate_history import RateHistory
+from tools.rate_store import RateSnapshotStore
+
+# NumPy is only needed for bulk conversions (convert_many() and the cross-rate
+# matrix), and httpx only by AsyncCurrencyRatesTool, so they are imported
+# there instead of on every startup of the agent and the MCP server
+
+
+# (tool, snapshot) pinned by AsyncCurrencyRatesTool while it calls the sync
+# methods, so they read the snapshot it already resolved without fetching
+_pinned_snapshot = contextvars.ContextVar("pinned_rate_snapshot", default=None)
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """
+    Immutable view of one rates payload downloaded from the public API.
+    
+    Every public method of CurrencyRatesTool reads from a single snapshot,
+    so a call like convert() sees one consistent set of rates.
+    """
+    data: MappingProxyType
+    rates: MappingProxyType
+    base: str
+    timestamp: str
+    fetched_at: float
+    expires_at: float
+    
+    def is_fresh(self, now=None):
+        """Return True while the snapshot is still within its TTL."""
+        now = time.time() if now is None else now
+        return now < self.expires_at
+    
+    def age_seconds(self, now=None):
+        """Seconds elapsed since the snapshot was fetched."""
+        now = time.time() if now is None else now
+        return max(0.0, now - self.fetched_at)
+
+
+@dataclass(frozen=True)
+class CrossRateMatrix:
+    """
+    Precomputed cross rates for one RateSnapshot.
+    
+    `matrix[i, j]` is the rate to convert currency `codes[i]` into `codes[j]`,
+    so bulk conversions become integer-index lookups instead of dict lookups.
+    """
+    snapshot: RateSnapshot
+    codes: tuple
+    index: MappingProxyType
+    rates: "np.ndarray"
+    matrix: "np.ndarray"
+    letter_lookup: "np.ndarray"
+
+
+def _round_like_python(values, ndigits):
+    """
+    Round a float array exactly like Python's built-in round().
+    
+    np.round() scales by 10**ndigits first, which can tip values sitting next
+    to a .5 boundary the other way. Those few values are re-rounded in Python
+    so bulk results match the scalar methods bit for bit.
+    """
+    import numpy as np
+    
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.round(scaled) / scale
+    
+    fraction = scaled - np.floor(scaled)
+    near_half = np.abs(fraction - 0.5) <= np.abs(scaled) * 1e-15 + 1e-12
+    positions = np.nonzero(near_half)[0]
+    if len(positions):
+        rounded[positions] = [round(v, ndigits) for v in values[positions].tolist()]
+    return rounded
+
+
+def _letter_code_slots(code_points):
+    """
+    Map an (n, 3) array of Unicode code points to slots in a 26**3 lookup table.
+    
+    Case is ignored, so 'usd' and 'USD' share a slot.
+    Rows that are not exactly three ASCII letters get slot -1.
+    """
+    import numpy as np
+    
+    # Setting bit 0x20 folds ASCII upper case onto lower case
+    letters = (code_points.astype(np.int32) | 0x20) - ord("a")
+    is_code = ((letters >= 0) & (letters < 26)).all(axis=1)
+    slots = letters[:, 0] * 676 + letters[:, 1] * 26 + letters[:, 2]
+    return np.where(is_code, slots, -1)
+
+
 class CurrencyRatesTool:
     """
     Tool to fetch live currency exchange rates directly from the public API.
+    
+    The API payload only changes once a day, so the tool keeps the last
+    response as a RateSnapshot and serves every method from it until the
+    snapshot expires (at the payload's `time_next_update_unix`, or after
+    `ttl` seconds when the payload does not say).
+    
+    With start_background_refresh() a RateRefresher thread keeps the snapshot
+    warm: calls are answered from memory, and an expired snapshot is served
+    as-is (stale-while-revalidate) while the refresher fetches a new one.
+    
+    With a RateSnapshotStore, every fetched snapshot is also saved to disk,
+    and a new tool starts from the latest stored snapshot. If the API is
+    unreachable, that snapshot keeps being served. The stored snapshots
+    also feed a RateHistory for get_rate_history().
     """
-    def __init__(self, api_url="https://open.er-api.com/v6/latest/USD"):
+    def __init__(self, api_url="https://open.er-api.com/v6/latest/USD", ttl=3600, min_ttl=60, store=None):
         """
         Initialize the CurrencyRatesTool with the public API URL.
         
         Args:
             api_url (str): URL of the currency exchange rates API.
+            ttl (int): Seconds to keep a snapshot when the payload has no
+                       `time_next_update_unix` field.
+            min_ttl (int): Lower bound on a snapshot's lifetime, so a late
+                           upstream update does not cause a fetch per call.
+                           Also the wait before retrying a failed refresh.
+            store (RateSnapshotStore): On-disk snapshot store (optional).
         """
         self.api_url = api_url
+        self.ttl = ttl
+        self.min_ttl = min_ttl
+        self.store = store
+        self._store_checked = False
+        self._next_retry_at = 0.0
+        
+        # Rate history, bulk-imported from the store on first use
+        self.history = RateHistory()
+        self._history_ready = store is None
+        
+        # Snapshot cache state
+        self._snapshot = None
+        self._cross_rates = None
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.stale_hits = 0
+        
+        # Validators from the last response, for conditional requests
+        self._etag = None
+        self._last_modified = None
+        
+        # Background refresher (see start_background_refresh)
+        self._refresher = None
     
     def _fetch_data(self):
         """
         Fetch currency rate data from the public API.
         
+        When a snapshot is already held, the request is conditional
+        (If-None-Match / If-Modified-Since). A 304 reply means the held
+        payload is still current, so it is returned again.
+        
         Returns:
             dict: Complete API response with rates and metadata, or empty dict on error.
         """
         try:
-            response = requests.get(self.api_url, timeout=10)
+            snapshot = self._snapshot
+            # Pooled keep-alive session: repeat refreshes skip the TLS handshake
+            response = get_session().get(
+                self.api_url,
+                headers=self._conditional_headers(snapshot),
+                timeout=get_timeout(read_timeout=10)
+            )
+            if response.status_code == 304 and snapshot is not None:
+                return dict(snapshot.data)
             response.raise_for_status()
+            
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
             return response.json()
         except requests.exceptions.Timeout:
-            print(f"Error: Request timed out while fetching from {self.api_url}")
+            print(f"Error: Request timed out while fetching from {self.api_url}", file=sys.stderr)
             return {}
         except requests.exceptions.ConnectionError:
-            print(f"Error: Could not connect to API at {self.api_url}")
-            print("Please check your internet connection.")
+            print(f"Error: Could not connect to API at {self.api_url}", file=sys.stderr)
+            print("Please check your internet connection.", file=sys.stderr)
             return {}
         except requests.exceptions.HTTPError as e:
-            print(f"HTTP Error: {e}")
+            print(f"HTTP Error: {e}", file=sys.stderr)
             return {}
         except Exception as e:
-            print(f"Error fetching currency rates: {e}")
+            print(f"Error fetching currency rates: {e}", file=sys.stderr)
             return {}
     
+    def _conditional_headers(self, snapshot):
+        """Validator headers for a conditional refresh of `snapshot`."""
+        headers = {}
+        if snapshot is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        return headers
+    
+    def _build_snapshot(self, data, fetched_at=None):
+        """
+        Wrap an API payload in an immutable RateSnapshot.
+        
+        Args:
+            data (dict): Raw API response.
+            fetched_at (float): Unix time the payload was fetched (default: now).
+        
+        Returns:
+            RateSnapshot: Snapshot with its expiry computed from the payload.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        
+        # Honour the upstream schedule, but never expire sooner than min_ttl
+        next_update = data.get("time_next_update_unix")
+        if next_update:
+            expires_at = max(float(next_update), fetched_at + self.min_ttl)
+        else:
+            expires_at = fetched_at + self.ttl
+        
+        rates = MappingProxyType(dict(data.get("rates", {})))
+        payload = dict(data)
+        payload["rates"] = rates
+        
+        return RateSnapshot(
+            data=MappingProxyType(payload),
+            rates=rates,
+            base=data.get("base_code", "Unknown"),
+            timestamp=data.get("time_last_update_utc", "Unknown"),
+            fetched_at=fetched_at,
+            expires_at=expires_at
+        )
+    
+    def _get_snapshot(self):
+        """
+        Return the current snapshot, fetching a new one only when it has expired.
+        
+        If the API cannot be reached, the previous snapshot (if any) keeps
+        being served rather than failing the call. While the background
+        refresher runs, an expired snapshot is returned immediately and the
+        refresher is asked to revalidate it.
+        
+        Returns:
+            RateSnapshot or None: Current snapshot, or None if no data is available.
+        """
+        pinned = _pinned_snapshot.get()
+        if pinned is not None and pinned[0] is self:
+            return pinned[1]
+        
+        snapshot = self._snapshot
+        if snapshot is None and self.store is not None and not self._store_checked:
+            self._load_from_store()
+            snapshot = self._snapshot
+        
+        if snapshot is not None and snapshot.is_fresh():
+            self.cache_hits += 1
+            return snapshot
+        
+        refresher = self._refresher
+        if snapshot is not None and refresher is not None and refresher.is_alive():
+            self.stale_hits += 1
+            refresher.wake()
+            return snapshot
+        
+        # A refresh failed recently (e.g. offline): keep serving what we have
+        if snapshot is not None and time.time() < self._next_retry_at:
+            self.stale_hits += 1
+            return snapshot
+        
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.is_fresh():
+                self.cache_hits += 1
+                return snapshot
+            
+            self.cache_misses += 1
+            return self._refresh_locked()
+    
+    def _load_from_store(self):
+        """Install the latest snapshot from the on-disk store, once per tool."""
+        with self._lock:
+            if self._store_checked:
+                return
+            self._store_checked = True
+            if self._snapshot is not None:
+                return
+            
+            data, fetched_at = self.store.load_latest()
+            if data:
+                self._snapshot = self._build_snapshot(data, fetched_at=fetched_at)
+    
+    def _refresh_locked(self):
+        """Fetch and install a new snapshot. Caller must hold self._lock."""
+        return self._install_locked(self._fetch_data())
+    
+    def _install_locked(self, data):
+        """
+        Install a fetched payload as the new snapshot. Caller must hold self._lock.
+        
+        Returns:
+            RateSnapshot or None: The new snapshot, or the previous one if
+            `data` is empty (the fetch failed).
+        """
+        if not data or "rates" not in data:
+            self._next_retry_at = time.time() + self.min_ttl
+            if self._snapshot is not None:
+                print("Warning: Serving previous exchange rate snapshot (refresh failed)", file=sys.stderr)
+            return self._snapshot
+        
+        self._snapshot = self._build_snapshot(data)
+        if self.store is not None:
+            self.store.save(data, fetched_at=self._snapshot.fetched_at)
+        if self._history_ready:
+            self.history.append(data)
+        return self._snapshot
+    
+    def refresh(self):
+        """
+        Force a fetch from the API, ignoring the TTL.
+        
+        Returns:
+            bool: True if a new snapshot was installed.
+        """
+        with self._lock:
+            previous = self._snapshot
+            return self._refresh_locked() is not previous
+    
+    def invalidate(self):
+        """Drop the cached snapshot so the next call fetches fresh data."""
+        with self._lock:
+            self._snapshot = None
+            self._store_checked = True
+            self._next_retry_at = 0.0
+            self._etag = None
+            self._last_modified = None
+    
+    def start_background_refresh(self, check_interval=30):
+        """
+        Start a daemon thread that keeps the rate snapshot warm.
+        
+        Args:
+            check_interval (int): Longest time in seconds between freshness checks.
+        
+        Returns:
+            RateRefresher: The running refresher thread.
+        """
+        # Load the stored snapshot first so calls can be served while the first fetch runs
+        if self.store is not None and not self._store_checked:
+            self._load_from_store()
+        
+        if self._refresher is None or not self._refresher.is_alive():
+            self._refresher = RateRefresher(self, check_interval=check_interval)
+            self._refresher.start()
+        return self._refresher
+    
+    def stop_background_refresh(self):
+        """Stop the background refresher thread, if running."""
+        refresher = self._refresher
+        self._refresher = None
+        if refresher is not None:
+            refresher.stop()
+    
+    def get_cache_stats(self):
+        """
+        Get snapshot cache statistics.
+        
+        Returns:
+            dict: Hit/miss counters, hit ratio and the current snapshot's age.
+        """
+        snapshot = self._snapshot
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": round(self.cache_hits / total, 4) if total else 0.0,
+            "has_snapshot": snapshot is not None,
+            "age_seconds": round(snapshot.age_seconds(), 3) if snapshot else None,
+            "expires_in_seconds": round(snapshot.expires_at - time.time(), 3) if snapshot else None
+        }
+    
     def get_all_rates(self):
         """
         Get all currency exchange rate data including metadata.
@@ -46,7 +399,14 @@ class CurrencyRatesTool:
             dict: Complete response with base currency, rates, timestamp, etc.
                   Example: {'result': 'success', 'base_code': 'USD', 'rates': {...}}
         """
-        return self._fetch_data()
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return {}
+        
+        # Hand out a copy so callers cannot mutate the shared snapshot
+        data = dict(snapshot.data)
+        data["rates"] = dict(snapshot.rates)
+        return data
     
     def get_rates_only(self):
         """
@@ -56,8 +416,10 @@ class CurrencyRatesTool:
             dict: Dictionary of currency codes and their exchange rates relative to base.
                   Example: {'USD': 1.0, 'EUR': 0.85, 'INR': 83.12, ...}
         """
-        data = self._fetch_data()
-        return data.get("rates", {})
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return {}
+        return dict(snapshot.rates)
     
     def get_base_currency(self):
         """
@@ -66,8 +428,10 @@ class CurrencyRatesTool:
         Returns:
             str: Base currency code (e.g., 'USD').
         """
-        data = self._fetch_data()
-        return data.get("base_code", "Unknown")
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return "Unknown"
+        return snapshot.base
     
     def get_rate(self, currency_code):
         """
@@ -77,25 +441,29 @@ class CurrencyRatesTool:
             currency_code (str): The currency code (e.g., 'EUR', 'INR', 'GBP').
         
         Returns:
-            dict: Dictionary with currency, rate, and base information.
+            dict: Dictionary with currency, rate, and base information, plus
+                  'age_seconds' (time since the rates were last fetched or
+                  revalidated) and 'stale' (True if past the snapshot's TTL).
                   Returns empty dict if currency not found.
         """
-        data = self._fetch_data()
-        if not data:
+        snapshot = self._get_snapshot()
+        if snapshot is None:
             return {}
         
-        rates = data.get("rates", {})
-        currency_upper = currency_code.upper()
+        rates = snapshot.rates
+        currency_upper = currency_code.strip().upper()
         
         if currency_upper in rates:
             return {
                 "currency": currency_upper,
                 "rate": rates[currency_upper],
-                "base": data.get("base_code", "Unknown"),
-                "timestamp": data.get("time_last_update_utc", "Unknown")
+                "base": snapshot.base,
+                "timestamp": snapshot.timestamp,
+                "age_seconds": round(snapshot.age_seconds(), 1),
+                "stale": not snapshot.is_fresh()
             }
         else:
-            print(f"Currency '{currency_code}' not found in available rates")
+            print(f"Currency '{currency_code}' not found in available rates", file=sys.stderr)
             return {}
     
     def get_multiple_rates(self, currency_codes):
@@ -110,26 +478,28 @@ class CurrencyRatesTool:
                   Example: {'EUR': {'currency': 'EUR', 'rate': 0.85, ...}, ...}
         """
         results = {}
-        data = self._fetch_data()
+        snapshot = self._get_snapshot()
         
-        if not data:
+        if snapshot is None:
             return results
         
-        rates = data.get("rates", {})
-        base = data.get("base_code", "Unknown")
-        timestamp = data.get("time_last_update_utc", "Unknown")
+        rates = snapshot.rates
+        age_seconds = round(snapshot.age_seconds(), 1)
+        stale = not snapshot.is_fresh()
         
         for code in currency_codes:
-            currency_upper = code.upper()
+            currency_upper = code.strip().upper()
             if currency_upper in rates:
                 results[currency_upper] = {
                     "currency": currency_upper,
                     "rate": rates[currency_upper],
-                    "base": base,
-                    "timestamp": timestamp
+                    "base": snapshot.base,
+                    "timestamp": snapshot.timestamp,
+                    "age_seconds": age_seconds,
+                    "stale": stale
                 }
             else:
-                print(f"Warning: Currency '{code}' not found")
+                print(f"Warning: Currency '{code}' not found", file=sys.stderr)
         
         return results
     
@@ -140,8 +510,10 @@ class CurrencyRatesTool:
         Returns:
             list: List of currency codes available in the API.
         """
-        rates = self.get_rates_only()
-        return list(rates.keys())
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return []
+        return list(snapshot.rates.keys())
     
     def convert(self, amount, from_currency, to_currency):
         """
@@ -155,16 +527,18 @@ class CurrencyRatesTool:
         Returns:
             dict: Conversion result with details, or empty dict on error.
         """
-        rates = self.get_rates_only()
+        # One snapshot for both the rates and the base currency
+        snapshot = self._get_snapshot()
         
-        if not rates:
+        if snapshot is None or not snapshot.rates:
             return {}
         
-        from_curr = from_currency.upper()
-        to_curr = to_currency.upper()
+        rates = snapshot.rates
+        from_curr = from_currency.strip().upper()
+        to_curr = to_currency.strip().upper()
         
         if from_curr not in rates or to_curr not in rates:
-            print(f"Error: One or both currencies not found ({from_curr}, {to_curr})")
+            print(f"Error: One or both currencies not found ({from_curr}, {to_curr})", file=sys.stderr)
             return {}
         
         # Convert to base currency first, then to target currency
@@ -178,12 +552,461 @@ class CurrencyRatesTool:
             "to_currency": to_curr,
             "converted_amount": round(converted_amount, 2),
             "exchange_rate": round(rates[to_curr] / rates[from_curr], 6),
-            "base_currency": self.get_base_currency()
+            "base_currency": snapshot.base
+        }
+    
+    
+    def get_rate_history(self, currency_code, start=None, end=None, max_points=30):
+        """
+        Get how a currency's rate has moved over a date range.
+        
+        Args:
+            currency_code (str): The currency code (e.g., 'INR').
+            start: Start date ('2026-07-01') or Unix time (optional).
+            end: End date or Unix time, inclusive (optional).
+            max_points (int): Maximum number of points in the returned series.
+        
+        Returns:
+            dict: Summary (first/last/min/max/change_pct) and a downsampled
+                  'points' list of [date, rate] pairs, or empty dict if no data.
+        """
+        if not self._history_ready:
+            with self._lock:
+                if not self._history_ready:
+                    self.history.import_from_store(self.store)
+                    self._history_ready = True
+        
+        # Make sure the snapshot currently being served is part of the series
+        snapshot = self._get_snapshot()
+        if snapshot is not None:
+            self.history.append(snapshot.data)
+        
+        try:
+            return self.history.get_series(currency_code.strip().upper(), start, end, max_points)
+        except ValueError as e:
+            print(f"Error: Invalid date range ({e})", file=sys.stderr)
+            return {}
+    
+    def _get_cross_rates(self):
+        """
+        Return the cross-rate matrix for the current snapshot.
+        
+        The matrix is built once per snapshot and reused until the
+        snapshot changes.
+        
+        Returns:
+            CrossRateMatrix or None: Matrix for the current snapshot, or None if no data.
+        """
+        import numpy as np
+        
+        snapshot = self._get_snapshot()
+        if snapshot is None or not snapshot.rates:
+            return None
+        
+        cross_rates = self._cross_rates
+        if cross_rates is not None and cross_rates.snapshot is snapshot:
+            return cross_rates
+        
+        codes = tuple(snapshot.rates.keys())
+        rates = np.array([snapshot.rates[code] for code in codes], dtype=np.float64)
+        # Same division as convert(): rates[to] / rates[from]
+        matrix = rates[np.newaxis, :] / rates[:, np.newaxis]
+        
+        # 26**3 table from a three-letter code's slot straight to its matrix index
+        letter_lookup = np.full(26 ** 3, -1, dtype=np.intp)
+        for i, code in enumerate(codes):
+            if len(code) == 3:
+                slot = _letter_code_slots(np.array([[ord(c) for c in code]]))[0]
+                if slot >= 0:
+                    letter_lookup[slot] = i
+        
+        cross_rates = CrossRateMatrix(
+            snapshot=snapshot,
+            codes=codes,
+            index=MappingProxyType({code: i for i, code in enumerate(codes)}),
+            rates=rates,
+            matrix=matrix,
+            letter_lookup=letter_lookup
+        )
+        self._cross_rates = cross_rates
+        return cross_rates
+    
+    def get_currency_index(self):
+        """
+        Get the integer index used for each currency in the cross-rate matrix.
+        
+        Callers converting the same ledger repeatedly can encode their
+        currency columns once and pass the integer arrays to convert_many().
+        
+        Returns:
+            dict: Mapping of currency code to matrix index, e.g. {'USD': 0, 'EUR': 1, ...}.
+        """
+        cross_rates = self._get_cross_rates()
+        if cross_rates is None:
+            return {}
+        return dict(cross_rates.index)
+    
+    def _encode_currencies(self, codes, cross_rates):
+        """
+        Turn a sequence of currency codes (or integer indexes) into matrix indexes.
+        
+        Unknown codes are encoded as -1.
+        """
+        import numpy as np
+        
+        codes = np.asarray(codes)
+        if np.issubdtype(codes.dtype, np.integer):
+            valid = (codes >= 0) & (codes < len(cross_rates.codes))
+            return np.where(valid, codes, -1).astype(np.intp).reshape(-1)
+        
+        codes = codes.astype(str).reshape(-1)
+        encoded = np.full(len(codes), -1, dtype=np.intp)
+        remaining = np.arange(len(codes))
+        
+        if codes.dtype.itemsize // 4 == 3:
+            # Three-letter codes go straight through the lookup table,
+            # with no per-row Python work or string sorting
+            slots = _letter_code_slots(codes.view(np.uint32).reshape(len(codes), 3))
+            is_code = slots >= 0
+            encoded[is_code] = cross_rates.letter_lookup[slots[is_code]]
+            remaining = np.nonzero(~is_code)[0]
+        
+        if len(remaining):
+            # Anything else: look up each distinct string once in Python
+            unique_codes, inverse = np.unique(codes[remaining], return_inverse=True)
+            lookup = np.array(
+                [cross_rates.index.get(code.strip().upper(), -1) for code in unique_codes.tolist()],
+                dtype=np.intp
+            )
+            encoded[remaining] = lookup[inverse.reshape(-1)]
+        
+        return encoded
+    
+    def convert_many(self, amounts, from_codes=None, to_codes=None,
+                     amount_column="amount", from_column="from_currency", to_column="to_currency"):
+        """
+        Convert a whole batch of amounts in one vectorized pass.
+        
+        Results are identical to calling convert() row by row: the same
+        division order is used and rounding matches Python's round().
+        Rows with an unknown currency get NaN.
+        
+        Args:
+            amounts (array-like or DataFrame): Amounts to convert, or a pandas
+                DataFrame holding amount/from/to columns.
+            from_codes (array-like): Source currency codes or integer indexes
+                from get_currency_index(). Ignored for DataFrame input.
+            to_codes (array-like): Target currency codes or integer indexes.
+                Ignored for DataFrame input.
+            amount_column (str): DataFrame column with the amounts.
+            from_column (str): DataFrame column with the source currency codes.
+            to_column (str): DataFrame column with the target currency codes.
+        
+        Returns:
+            dict or DataFrame: For array input, a dict with 'converted_amount' and
+                'exchange_rate' NumPy arrays plus 'base_currency'. For DataFrame
+                input, a copy of the frame with those two columns added.
+                Returns empty dict if no rates are available.
+        """
+        import numpy as np
+        
+        frame = None
+        if hasattr(amounts, "columns"):
+            frame = amounts
+            amounts = frame[amount_column].to_numpy()
+            from_codes = frame[from_column].to_numpy()
+            to_codes = frame[to_column].to_numpy()
+        
+        cross_rates = self._get_cross_rates()
+        if cross_rates is None:
+            return {}
+        
+        amounts = np.asarray(amounts, dtype=np.float64).reshape(-1)
+        from_index = self._encode_currencies(from_codes, cross_rates).reshape(-1)
+        to_index = self._encode_currencies(to_codes, cross_rates).reshape(-1)
+        
+        if not (len(amounts) == len(from_index) == len(to_index)):
+            raise ValueError("amounts, from_codes and to_codes must have the same length")
+        
+        valid = (from_index >= 0) & (to_index >= 0)
+        if not valid.all():
+            print(f"Warning: {int((~valid).sum())} row(s) have unknown currency codes", file=sys.stderr)
+        from_safe = np.where(valid, from_index, 0)
+        to_safe = np.where(valid, to_index, 0)
+        
+        # Same arithmetic as convert(): amount / rate[from] * rate[to]
+        rates = cross_rates.rates
+        converted = amounts / rates[from_safe] * rates[to_safe]
+        exchange_rate = cross_rates.matrix[from_safe, to_safe]
+        
+        converted = np.where(valid, _round_like_python(converted, 2), np.nan)
+        exchange_rate = np.where(valid, _round_like_python(exchange_rate, 6), np.nan)
+        
+        if frame is not None:
+            return frame.assign(converted_amount=converted, exchange_rate=exchange_rate)
+        
+        return {
+            "converted_amount": converted,
+            "exchange_rate": exchange_rate,
+            "base_currency": cross_rates.snapshot.base
         }
 
 
+
+class AsyncCurrencyRatesTool:
+    """
+    Async counterpart of CurrencyRatesTool for use inside event loops.
+    
+    It shares the snapshot, store and history of a CurrencyRatesTool (the
+    process-wide shared one by default) and only replaces the network fetch
+    with a non-blocking httpx request, so awaiting a refresh never stalls
+    other tasks on the loop.
+    """
+    def __init__(self, tool=None):
+        """
+        Initialize the async tool.
+        
+        Args:
+            tool (CurrencyRatesTool): Tool whose snapshot to share
+                                      (default: get_shared_rates_tool()).
+        """
+        self.tool = tool if tool is not None else get_shared_rates_tool()
+        self._refresh_lock = asyncio.Lock()
+    
+    async def _fetch_data(self):
+        """
+        Fetch currency rate data from the public API without blocking the loop.
+        
+        Returns:
+            dict: Complete API response with rates and metadata, or empty dict on error.
+        """
+        import httpx
+        tool = self.tool
+        try:
+            snapshot = tool._snapshot
+            response = await async_get(
+                tool.api_url,
+                headers=tool._conditional_headers(snapshot),
+                timeout=get_timeout(read_timeout=10)
+            )
+            if response.status_code == 304 and snapshot is not None:
+                return dict(snapshot.data)
+            response.raise_for_status()
+            
+            tool._etag = response.headers.get("ETag")
+            tool._last_modified = response.headers.get("Last-Modified")
+            return response.json()
+        except httpx.TimeoutException:
+            print(f"Error: Request timed out while fetching from {tool.api_url}", file=sys.stderr)
+            return {}
+        except httpx.ConnectError:
+            print(f"Error: Could not connect to API at {tool.api_url}", file=sys.stderr)
+            print("Please check your internet connection.", file=sys.stderr)
+            return {}
+        except httpx.HTTPStatusError as e:
+            print(f"HTTP Error: {e}", file=sys.stderr)
+            return {}
+        except Exception as e:
+            print(f"Error fetching currency rates: {e}", file=sys.stderr)
+            return {}
+    
+    async def _get_snapshot(self):
+        """
+        Async version of CurrencyRatesTool._get_snapshot().
+        
+        Returns:
+            RateSnapshot or None: Current snapshot, or None if no data is available.
+        """
+        tool = self.tool
+        if tool._snapshot is None and tool.store is not None and not tool._store_checked:
+            # One-off SQLite read; it may wait on the tool's lock, so keep it off the loop
+            await asyncio.to_thread(tool._load_from_store)
+        
+        snapshot = tool._snapshot
+        if snapshot is not None and snapshot.is_fresh():
+            tool.cache_hits += 1
+            return snapshot
+        
+        refresher = tool._refresher
+        if snapshot is not None and refresher is not None and refresher.is_alive():
+            tool.stale_hits += 1
+            refresher.wake()
+            return snapshot
+        
+        if snapshot is not None and time.time() < tool._next_retry_at:
+            tool.stale_hits += 1
+            return snapshot
+        
+        async with self._refresh_lock:
+            snapshot = tool._snapshot
+            if snapshot is not None and snapshot.is_fresh():
+                tool.cache_hits += 1
+                return snapshot
+            
+            tool.cache_misses += 1
+            data = await self._fetch_data()
+            
+            # A sync refresh in another thread holds the lock: use what it installs
+            if not tool._lock.acquire(blocking=False):
+                return tool._snapshot
+            try:
+                return tool._install_locked(data)
+            finally:
+                tool._lock.release()
+    
+    async def _call(self, method, *args, **kwargs):
+        """Resolve the snapshot asynchronously, then run a sync method against it."""
+        snapshot = await self._get_snapshot()
+        if snapshot is None:
+            return None
+        
+        token = _pinned_snapshot.set((self.tool, snapshot))
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _pinned_snapshot.reset(token)
+    
+    async def get_all_rates(self):
+        """Async version of CurrencyRatesTool.get_all_rates()."""
+        result = await self._call(self.tool.get_all_rates)
+        return {} if result is None else result
+    
+    async def get_rates_only(self):
+        """Async version of CurrencyRatesTool.get_rates_only()."""
+        result = await self._call(self.tool.get_rates_only)
+        return {} if result is None else result
+    
+    async def get_base_currency(self):
+        """Async version of CurrencyRatesTool.get_base_currency()."""
+        result = await self._call(self.tool.get_base_currency)
+        return "Unknown" if result is None else result
+    
+    async def get_rate(self, currency_code):
+        """Async version of CurrencyRatesTool.get_rate()."""
+        result = await self._call(self.tool.get_rate, currency_code)
+        return {} if result is None else result
+    
+    async def get_multiple_rates(self, currency_codes):
+        """Async version of CurrencyRatesTool.get_multiple_rates()."""
+        result = await self._call(self.tool.get_multiple_rates, currency_codes)
+        return {} if result is None else result
+    
+    async def get_available_currencies(self):
+        """Async version of CurrencyRatesTool.get_available_currencies()."""
+        result = await self._call(self.tool.get_available_currencies)
+        return [] if result is None else result
+    
+    async def convert(self, amount, from_currency, to_currency):
+        """Async version of CurrencyRatesTool.convert()."""
+        result = await self._call(self.tool.convert, amount, from_currency, to_currency)
+        return {} if result is None else result
+    
+    async def convert_many(self, amounts, from_codes=None, to_codes=None, **columns):
+        """Async version of CurrencyRatesTool.convert_many()."""
+        result = await self._call(self.tool.convert_many, amounts, from_codes, to_codes, **columns)
+        return {} if result is None else result
+    
+    async def get_rate_history(self, currency_code, start=None, end=None, max_points=30):
+        """
+        Async version of CurrencyRatesTool.get_rate_history().
+        
+        The first call imports stored snapshots from SQLite, so it runs in a
+        worker thread once the current snapshot has been resolved.
+        """
+        snapshot = await self._get_snapshot()
+        
+        def read_history():
+            token = _pinned_snapshot.set((self.tool, snapshot))
+            try:
+                return self.tool.get_rate_history(currency_code, start, end, max_points)
+            finally:
+                _pinned_snapshot.reset(token)
+        
+        return await asyncio.to_thread(read_history)
+
+class RateRefresher(threading.Thread):
+    """
+    Background thread that refreshes a CurrencyRatesTool's snapshot.
+    
+    It sleeps until the snapshot is due to expire (checking at least every
+    `check_interval` seconds), then revalidates it with a conditional
+    request. Tool calls can wake it early when they see a stale snapshot.
+    
+    Fetch errors and warnings of this module go to stderr: the thread also
+    runs inside the stdio MCP server, whose stdout carries the protocol.
+    """
+    def __init__(self, tool, check_interval=30):
+        """
+        Initialize the refresher.
+        
+        Args:
+            tool (CurrencyRatesTool): Tool whose snapshot to keep warm.
+            check_interval (int): Longest time in seconds between checks.
+        """
+        super().__init__(name="rate-refresher", daemon=True)
+        self.tool = tool
+        self.check_interval = check_interval
+        self.refresh_count = 0
+        self.failure_count = 0
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+    
+    def wake(self):
+        """Ask the refresher to check the snapshot now."""
+        self._wake_event.set()
+    
+    def stop(self):
+        """Stop the refresher and wait briefly for it to exit."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=1)
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            snapshot = self.tool._snapshot
+            if snapshot is None or not snapshot.is_fresh():
+                if self.tool.refresh():
+                    self.refresh_count += 1
+                else:
+                    self.failure_count += 1
+            
+            # Sleep until the (possibly new) snapshot expires, or a caller wakes us
+            snapshot = self.tool._snapshot
+            if snapshot is not None and snapshot.is_fresh():
+                wait_seconds = min(self.check_interval, snapshot.expires_at - time.time())
+            else:
+                wait_seconds = self.check_interval
+            self._wake_event.wait(max(wait_seconds, 0.1))
+            self._wake_event.clear()
+
+
+_shared_tool = None
+_shared_tool_lock = threading.Lock()
+
+
+def get_shared_rates_tool():
+    """
+    Get the process-wide CurrencyRatesTool with its background refresher running.
+    
+    Entry points (main.py, app.py, the MCP server) share this instance so the
+    rate snapshot is fetched once per process and kept warm between questions.
+    It is backed by the default on-disk store, so a new process answers from
+    the last saved snapshot straight away.
+    
+    Returns:
+        CurrencyRatesTool: The shared tool instance.
+    """
+    global _shared_tool
+    with _shared_tool_lock:
+        if _shared_tool is None:
+            _shared_tool = CurrencyRatesTool(store=RateSnapshotStore())
+            _shared_tool.start_background_refresh()
+        return _shared_tool
+
 if __name__ == "__main__":
     # Example usage - fetches live currency rates
+    # Run from the project folder: python -m tools.currency_rates_tool
     tool = CurrencyRatesTool()
     
     print("=== Testing CurrencyRatesTool ===")
@@ -215,3 +1038,14 @@ if __name__ == "__main__":
     print("\n6. Get available currencies (first 10):")
     currencies = tool.get_available_currencies()
     print(currencies[:10])
+    
+    print("\n7. Convert a batch of amounts in one call:")
+    batch = tool.convert_many([100, 250, 1000], ["USD", "EUR", "INR"], ["EUR", "GBP", "JPY"])
+    if batch:
+        print(f"  {batch['converted_amount'].tolist()}")
+    
+    print("\n8. Rate history for INR (from stored snapshots):")
+    print(tool.get_rate_history("INR", max_points=5))
+    
+    print("\n9. Snapshot cache stats (one fetch for all calls above):")
+    print(tool.get_cache_stats())
@@ -0,0 +1,124 @@
+"""
+In-process backend for the country data tools.
+
+CountryCurrencyTool and CountriesTool (tools/countries_tool.py)
+normally ask the local FastAPI services (api/country_currency.py on
+:5003, api/countries.py on :5002) for rows of a CSV file, paying JSON encoding, a socket round trip and
+JSON decoding per lookup, and needing both services to be running. With
+the embedded backend the tools load the same CSV files into the same
+indexed tables inside the agent process (or memory-map their compiled
+.cols files, see tools/columnar.py; reloaded when the file changes, like
+the services do) and answer lookups with the exact results the API would
+have returned.
+
+The HTTP services stay available for remote use. The backend is chosen
+per tool (`backend=` argument) or for the whole process with:
+- COUNTRY_DATA_BACKEND: 'http' (default) or 'embedded'
+"""
+
+import os
+import threading
+
+from tools.table_reload import TableSource
+
+DATA_BACKEND = os.environ.get("COUNTRY_DATA_BACKEND", "http").strip().lower()
+BACKENDS = ("http", "embedded")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Dataset name -> CSV file, the same files the HTTP services load
+DATASETS = {
+    "countries": "countries.csv",
+    "country_currency": "country_currency.csv"
+}
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def resolve_backend(backend=None):
+    """
+    Get the backend a tool should use.
+    
+    Args:
+        backend (str): 'http' or 'embedded' (optional, default COUNTRY_DATA_BACKEND).
+    
+    Returns:
+        str: The backend name.
+    """
+    backend = (backend or DATA_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown data backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
+    return backend
+
+
+def get_embedded_source(dataset):
+    """
+    Get the process-wide table of a dataset, loading it on first use.
+    
+    Args:
+        dataset (str): 'countries' or 'country_currency'.
+    
+    Returns:
+        TableSource: The dataset's table, reloaded when its file changes.
+    """
+    source = _sources.get(dataset)
+    if source is None:
+        with _sources_lock:
+            source = _sources.get(dataset)
+            if source is None:
+                source = TableSource(os.path.join(DATA_DIR, DATASETS[dataset]))
+                source.start_watching()
+                _sources[dataset] = source
+    return source
+
+
+def query_embedded(dataset, query_params=None):
+    """
+    Answer an API query in-process.
+    
+    Args:
+        dataset (str): 'countries' or 'country_currency'.
+        query_params (dict): The query the HTTP API would get: 'column' and
+                             'value' (a string or a list of strings), optional.
+    
+    Returns:
+        list or dict: Same as the API's decoded JSON reply: the matching
+                      records, or {"error": ...} for an unknown column.
+    """
+    table = get_embedded_source(dataset).current
+    params = query_params or {}
+    column = params.get("column")
+    value = params.get("value")
+    if column and value:
+        if not table.has_column(column):
+            return {"error": f"Column '{column}' does not exist"}
+        values = [value] if isinstance(value, str) else list(value)
+        rows = table.lookup(column, values)
+    else:
+        rows = table.rows
+    # Copies, like a decoded reply: callers must not be able to change the table
+    return [dict(row) for row in rows]
+
+
+def iter_embedded(dataset, fields=None):
+    """
+    Iterate over a dataset's records in-process (like the NDJSON stream).
+    
+    Args:
+        dataset (str): 'countries' or 'country_currency'.
+        fields (list): Columns to return (optional, default all).
+    
+    Yields:
+        dict: One record.
+    
+    Raises:
+        ValueError: If a field does not exist.
+    """
+    table = get_embedded_source(dataset).current
+    if fields:
+        unknown = [field for field in fields if not table.has_column(field)]
+        if unknown:
+            raise ValueError(f"Field(s) {', '.join(unknown)} do not exist")
+    for row in table.rows:
+        yield {field: row[field] for field in fields} if fields else dict(row)
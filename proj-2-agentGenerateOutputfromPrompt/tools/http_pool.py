@@ -0,0 +1,456 @@
+"""
+Shared HTTP connection pool for all tool clients.
+
+Every tool used to call bare `requests.get`, paying a new TCP connection
+(and a TLS handshake for the rates API) on each call. The tools now go
+through one pooled `requests.Session` with keep-alive connections,
+per-host pool limits, default connect/read timeouts and retries with
+jittered exponential backoff.
+
+Async code (the MCP server, async agent loops) gets the same settings
+through get_async_client() / async_get(), backed by one httpx.AsyncClient
+per event loop.
+
+get_json() / async_get_json() also remember the ETag and body of each
+JSON resource and revalidate with If-None-Match, so a repeat request for
+unchanged data is answered with an empty 304. iter_ndjson() /
+async_iter_ndjson() stream NDJSON replies, yielding each row as it
+arrives.
+
+Settings come from environment variables, or can be changed at runtime
+with configure_http_pool():
+- HTTP_POOL_HOSTS: number of hosts to keep connection pools for (default 10)
+- HTTP_POOL_MAXSIZE: keep-alive connections per host (default 10)
+- HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT: seconds (default 3.05 / 10)
+- HTTP_RETRIES: retries for connection errors and 429/5xx replies (default 2)
+- HTTP_ETAG_CACHE_SIZE: JSON bodies kept for revalidation (default 256)
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from urllib.parse import urlencode
+
+# httpx is imported by the async helpers only: the sync tools and the CLI
+# never load it
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry
+
+_config = {
+    "pool_connections": int(os.environ.get("HTTP_POOL_HOSTS", 10)),
+    "pool_maxsize": int(os.environ.get("HTTP_POOL_MAXSIZE", 10)),
+    "pool_block": False,
+    "connect_timeout": float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3.05)),
+    "read_timeout": float(os.environ.get("HTTP_READ_TIMEOUT", 10)),
+    "retries": int(os.environ.get("HTTP_RETRIES", 2)),
+    "backoff_factor": 0.3,
+    "backoff_jitter": 0.3,
+}
+
+# Replies worth retrying (rate limited or transient server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+# One AsyncClient per event loop (a client cannot be shared across loops)
+_async_clients = weakref.WeakKeyDictionary()
+
+# Socket connects per host ('scheme://host:port'), for get_pool_stats()
+_connects = Counter()
+
+# (ETag, body) of the latest JSON reply per URL with query, least recently used first
+ETAG_CACHE_SIZE = int(os.environ.get("HTTP_ETAG_CACHE_SIZE", 256))
+_etag_cache = OrderedDict()
+_etag_lock = threading.Lock()
+_etag_counts = Counter()
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    """HTTPConnection that counts every socket it opens."""
+    def connect(self):
+        _connects[f"http://{self.host}:{self.port}"] += 1
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    """HTTPSConnection that counts every socket (and TLS handshake) it opens."""
+    def connect(self):
+        _connects[f"https://{self.host}:{self.port}"] += 1
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count socket connects."""
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool
+        }
+
+
+def configure_http_pool(**settings):
+    """
+    Change pool settings. The shared session is rebuilt on next use.
+    
+    Args:
+        **settings: Any of pool_connections, pool_maxsize, pool_block,
+                    connect_timeout, read_timeout, retries, backoff_factor,
+                    backoff_jitter.
+    """
+    global _session
+    unknown = set(settings) - set(_config)
+    if unknown:
+        raise ValueError(f"Unknown HTTP pool setting(s): {', '.join(sorted(unknown))}")
+    
+    with _session_lock:
+        _config.update(settings)
+        if _session is not None:
+            _session.close()
+            _session = None
+        # Async clients are rebuilt lazily; old ones close when their loop ends
+        _async_clients.clear()
+
+
+def get_http_pool_config():
+    """Return a copy of the current pool settings."""
+    return dict(_config)
+
+
+def _build_session():
+    """Create a Session with pooled, retrying adapters for http and https."""
+    retry = Retry(
+        total=_config["retries"],
+        connect=_config["retries"],
+        read=_config["retries"],
+        status=_config["retries"],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=_config["backoff_factor"],
+        backoff_jitter=_config["backoff_jitter"],
+        respect_retry_after_header=True,
+        # Hand the last response back so callers see a normal HTTPError
+        raise_on_status=False
+    )
+    adapter = _PooledAdapter(
+        pool_connections=_config["pool_connections"],
+        pool_maxsize=_config["pool_maxsize"],
+        pool_block=_config["pool_block"],
+        max_retries=retry
+    )
+    
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Get the process-wide pooled session.
+    
+    Returns:
+        requests.Session: Session shared by all tool clients.
+    """
+    global _session
+    session = _session
+    if session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+            session = _session
+    return session
+
+
+def get_timeout(read_timeout=None):
+    """
+    Get the (connect, read) timeout tuple to pass to requests.
+    
+    Args:
+        read_timeout (float): Override the configured read timeout (optional).
+    
+    Returns:
+        tuple: (connect_timeout, read_timeout) in seconds.
+    """
+    read = _config["read_timeout"] if read_timeout is None else read_timeout
+    return (_config["connect_timeout"], read)
+
+
+def get_async_client():
+    """
+    Get the pooled httpx.AsyncClient for the running event loop.
+    
+    Returns:
+        httpx.AsyncClient: Client shared by all async tool clients on this loop.
+    """
+    import httpx
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_config["pool_maxsize"] * _config["pool_connections"],
+                max_keepalive_connections=_config["pool_maxsize"]
+            ),
+            timeout=httpx.Timeout(_config["read_timeout"], connect=_config["connect_timeout"])
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _httpx_timeout(timeout):
+    """Convert a (connect, read) tuple to an httpx timeout (None: client default)."""
+    import httpx
+    if timeout is None:
+        return httpx.USE_CLIENT_DEFAULT
+    return httpx.Timeout(timeout[1], connect=timeout[0])
+
+
+async def async_get(url, params=None, headers=None, timeout=None):
+    """
+    GET a URL with the pooled async client, retrying like the sync session.
+    
+    Connection errors, timeouts and 429/5xx replies are retried up to the
+    configured number of times with jittered exponential backoff.
+    
+    Args:
+        url (str): URL to fetch.
+        params (dict): Query parameters (optional).
+        headers (dict): Extra request headers (optional).
+        timeout (tuple): (connect, read) timeout override (optional).
+    
+    Returns:
+        httpx.Response: The last response received.
+    """
+    import httpx
+    client = get_async_client()
+    timeout = _httpx_timeout(timeout)
+    
+    attempt = 0
+    while True:
+        try:
+            response = await client.get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code not in RETRY_STATUSES or attempt >= _config["retries"]:
+                return response
+        except (httpx.ConnectError, httpx.TimeoutException):
+            if attempt >= _config["retries"]:
+                raise
+        
+        delay = _config["backoff_factor"] * (2 ** attempt) + random.uniform(0, _config["backoff_jitter"])
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def _etag_lookup(url, params):
+    """Return (cache key, cached (etag, body) or None, request headers)."""
+    key = f"{url}?{urlencode(params or {}, doseq=True)}"
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+        if cached is not None:
+            _etag_cache.move_to_end(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    return key, cached, headers
+
+
+def _etag_resolve(key, cached, response):
+    """
+    Turn a (requests or httpx) response into parsed JSON.
+    
+    A 304 reuses the cached body; a 200 with an ETag replaces it.
+    """
+    _etag_counts["requests"] += 1
+    _etag_counts["bytes_received"] += len(response.content)
+    if response.status_code == 304 and cached is not None:
+        _etag_counts["not_modified"] += 1
+        return json.loads(cached[1])
+    
+    response.raise_for_status()
+    etag = response.headers.get("etag")
+    if etag and response.status_code == 200:
+        with _etag_lock:
+            _etag_cache[key] = (etag, response.content)
+            _etag_cache.move_to_end(key)
+            while len(_etag_cache) > ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+    return response.json()
+
+
+def get_json(url, params=None, timeout=None):
+    """
+    GET a JSON resource with the pooled session, revalidating by ETag.
+    
+    If an earlier reply for the same URL and query had an ETag, it is sent
+    as If-None-Match and a 304 reply reuses the earlier body.
+    
+    Args:
+        url (str): URL to fetch.
+        params (dict): Query parameters (optional).
+        timeout (tuple): (connect, read) timeout (optional, default get_timeout()).
+    
+    Returns:
+        The parsed JSON body.
+    
+    Raises:
+        requests.exceptions.RequestException: On connection errors and 4xx/5xx replies.
+    """
+    key, cached, headers = _etag_lookup(url, params)
+    response = get_session().get(url, params=params, headers=headers, timeout=timeout or get_timeout())
+    return _etag_resolve(key, cached, response)
+
+
+async def async_get_json(url, params=None, timeout=None):
+    """
+    Async version of get_json(), on the pooled async client.
+    
+    Raises:
+        httpx.HTTPError: On connection errors and 4xx/5xx replies.
+    """
+    key, cached, headers = _etag_lookup(url, params)
+    response = await async_get(url, params=params, headers=headers, timeout=timeout or get_timeout())
+    return _etag_resolve(key, cached, response)
+
+
+def _ndjson_params(params, page_size):
+    """Query parameters asking for an NDJSON stream (paged if page_size is set)."""
+    params = dict(params or {}, format="ndjson")
+    if page_size:
+        params["limit"] = page_size
+    return params
+
+
+def _ndjson_error(body):
+    """Error for a streamed request answered with JSON (an error object) instead of NDJSON."""
+    data = json.loads(body) if body else None
+    if isinstance(data, dict) and "error" in data:
+        return ValueError(data["error"])
+    return ValueError("Expected an NDJSON reply")
+
+
+def iter_ndjson(url, params=None, page_size=None, timeout=None):
+    """
+    Stream an NDJSON resource with the pooled session, one row at a time.
+    
+    Rows are parsed and yielded as their lines arrive, so the caller never
+    holds the whole reply. With page_size, each request asks for that many
+    rows and the X-Next-Cursor header of the reply is followed until the
+    last page.
+    
+    Args:
+        url (str): URL to fetch.
+        params (dict): Query parameters (optional).
+        page_size (int): Rows per request (optional, default: one request).
+        timeout (tuple): (connect, read) timeout (optional, default get_timeout()).
+    
+    Yields:
+        The parsed JSON object of each line.
+    
+    Raises:
+        requests.exceptions.RequestException: On connection errors and 4xx/5xx replies.
+        ValueError: If the server answered with an error instead of rows.
+    """
+    params = _ndjson_params(params, page_size)
+    while True:
+        with get_session().get(url, params=params, stream=True, timeout=timeout or get_timeout()) as response:
+            response.raise_for_status()
+            if "ndjson" not in response.headers.get("content-type", ""):
+                raise _ndjson_error(response.content)
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+            next_cursor = response.headers.get("x-next-cursor")
+        if not page_size or not next_cursor:
+            return
+        params["cursor"] = next_cursor
+
+
+async def async_iter_ndjson(url, params=None, page_size=None, timeout=None):
+    """
+    Async version of iter_ndjson(), on the pooled async client.
+    
+    Streamed requests are not retried.
+    
+    Raises:
+        httpx.HTTPError: On connection errors and 4xx/5xx replies.
+        ValueError: If the server answered with an error instead of rows.
+    """
+    client = get_async_client()
+    params = _ndjson_params(params, page_size)
+    while True:
+        async with client.stream("GET", url, params=params, timeout=_httpx_timeout(timeout or get_timeout())) as response:
+            response.raise_for_status()
+            if "ndjson" not in response.headers.get("content-type", ""):
+                raise _ndjson_error(await response.aread())
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+            next_cursor = response.headers.get("x-next-cursor")
+        if not page_size or not next_cursor:
+            return
+        params["cursor"] = next_cursor
+
+
+def get_etag_stats():
+    """
+    Get conditional request statistics for get_json() / async_get_json().
+    
+    Returns:
+        dict: Requests sent, 304 replies, body bytes received and cached entries.
+    """
+    return {
+        "requests": _etag_counts["requests"],
+        "not_modified": _etag_counts["not_modified"],
+        "bytes_received": _etag_counts["bytes_received"],
+        "entries": len(_etag_cache)
+    }
+
+
+def get_pool_stats():
+    """
+    Get connection reuse statistics for each host pool.
+    
+    Only hosts whose pool is still alive are reported (at most
+    `pool_connections` hosts are kept).
+    
+    Returns:
+        dict: Per host ('scheme://host:port'): requests sent, sockets
+              opened, reuse ratio and idle connections currently pooled.
+    """
+    session = _session
+    if session is None:
+        return {}
+    
+    stats = {}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            requests_sent = pool.num_requests
+            connections = _connects[host]
+            stats[host] = {
+                "requests": requests_sent,
+                "new_connections": connections,
+                "reuse_ratio": round(1 - connections / requests_sent, 4) if requests_sent else 0.0,
+                # The pool queue is padded with None placeholders
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            }
+    return stats
@@ -0,0 +1,188 @@
+import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+
+def parse_time(value, end_of_day=False):
+    """
+    Convert a date/time value to a Unix timestamp.
+    
+    Args:
+        value: Unix timestamp (int/float), ISO date string ('2026-07-01'
+               or '2026-07-01T12:00:00'), or None.
+        end_of_day (bool): For a bare date, return the last second of that
+                           day instead of midnight (used for range ends).
+    
+    Returns:
+        int or None: Unix timestamp in seconds (UTC), or None if value is None.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    
+    text = str(value).strip()
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    timestamp = int(parsed.timestamp())
+    if end_of_day and len(text) == 10:
+        timestamp += 86399
+    return timestamp
+
+
+def format_time(timestamp):
+    """Format a Unix timestamp as a short UTC date string."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class RateHistory:
+    """
+    Append-only exchange rate history with one packed column per currency.
+    
+    Timestamps (`time_last_update_unix` of each snapshot) are kept in one
+    sorted array('q'), and each currency has an array('d') of the same
+    length (NaN where the currency was missing from a snapshot). Date ranges
+    are found with a binary search, so a range query is O(log n) plus the
+    size of the slice.
+    """
+    def __init__(self):
+        """Initialize an empty history."""
+        self.timestamps = array("q")
+        self.columns = {}
+        self.base = "Unknown"
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    def append(self, data):
+        """
+        Append one API payload to the history.
+        
+        Snapshots must arrive in time order; a payload that is not newer than
+        the last one stored is ignored.
+        
+        Args:
+            data (dict): API payload with 'time_last_update_unix' and 'rates'.
+        
+        Returns:
+            bool: True if the payload was appended.
+        """
+        timestamp = data.get("time_last_update_unix")
+        rates = data.get("rates")
+        if timestamp is None or not rates:
+            return False
+        
+        with self._lock:
+            if self.timestamps and int(timestamp) <= self.timestamps[-1]:
+                return False
+            
+            row = len(self.timestamps)
+            self.timestamps.append(int(timestamp))
+            self.base = data.get("base_code", self.base)
+            
+            for code, rate in rates.items():
+                column = self.columns.get(code)
+                if column is None:
+                    # Currency seen for the first time: pad earlier rows with NaN
+                    column = array("d", [math.nan]) * row
+                    self.columns[code] = column
+                column.append(float(rate))
+            
+            # Currencies missing from this snapshot
+            for column in self.columns.values():
+                if len(column) == row:
+                    column.append(math.nan)
+        
+        return True
+    
+    def import_from_store(self, store, start=None, end=None):
+        """
+        Bulk-append stored snapshots from a RateSnapshotStore.
+        
+        Args:
+            store (RateSnapshotStore): Store to read snapshots from.
+            start: Earliest snapshot time to import (optional).
+            end: Latest snapshot time to import (optional).
+        
+        Returns:
+            int: Number of snapshots appended.
+        """
+        imported = 0
+        for data, _ in store.iter_snapshots(parse_time(start), parse_time(end, end_of_day=True)):
+            if self.append(data):
+                imported += 1
+        return imported
+    
+    def get_range(self, currency_code, start=None, end=None):
+        """
+        Get the raw series for a currency between two times (inclusive).
+        
+        Args:
+            currency_code (str): The currency code (e.g., 'INR').
+            start: Start of the range (Unix time or ISO date, optional).
+            end: End of the range (Unix time or ISO date, optional).
+        
+        Returns:
+            tuple: (timestamps array('q'), rates array('d')) for the range,
+                   both empty if the currency is unknown.
+        """
+        start, end = parse_time(start), parse_time(end, end_of_day=True)
+        
+        with self._lock:
+            column = self.columns.get(currency_code.upper())
+            if column is None:
+                return array("q"), array("d")
+            
+            low = 0 if start is None else bisect_left(self.timestamps, start)
+            high = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+            return self.timestamps[low:high], column[low:high]
+    
+    def get_series(self, currency_code, start=None, end=None, max_points=30):
+        """
+        Get a downsampled series plus summary statistics for a currency.
+        
+        The range is split into at most `max_points` equal buckets and the
+        last rate of each bucket is kept, so the payload stays small no
+        matter how long the history is.
+        
+        Args:
+            currency_code (str): The currency code (e.g., 'INR').
+            start: Start of the range (Unix time or ISO date, optional).
+            end: End of the range (Unix time or ISO date, optional).
+            max_points (int): Maximum number of points to return.
+        
+        Returns:
+            dict: Currency, base, summary (first/last/min/max/change_pct) and
+                  'points' as [date, rate] pairs. Empty dict if no data.
+        """
+        timestamps, rates = self.get_range(currency_code, start, end)
+        samples = [(t, r) for t, r in zip(timestamps, rates) if not math.isnan(r)]
+        if not samples:
+            return {}
+        
+        max_points = max(1, int(max_points))
+        if len(samples) > max_points:
+            step = len(samples) / max_points
+            points = [samples[min(len(samples) - 1, int((i + 1) * step) - 1)] for i in range(max_points)]
+        else:
+            points = samples
+        
+        values = [r for _, r in samples]
+        first, last = values[0], values[-1]
+        return {
+            "currency": currency_code.upper(),
+            "base": self.base,
+            "start": format_time(samples[0][0]),
+            "end": format_time(samples[-1][0]),
+            "samples": len(samples),
+            "first": first,
+            "last": last,
+            "min": min(values),
+            "max": max(values),
+            "change_pct": round((last - first) / first * 100, 4) if first else None,
+            "points": [[format_time(t), r] for t, r in points]
+        }
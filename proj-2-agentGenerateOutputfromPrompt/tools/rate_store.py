@@ -0,0 +1,158 @@
+import json
+import os
+import sqlite3
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+
+# Default location of the on-disk snapshot store (not checked in)
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "rates_store.sqlite3")
+
+
+class RateSnapshotStore:
+    """
+    Local SQLite store of exchange rate snapshots.
+    
+    Each payload from the rates API is stored once, keyed by its
+    `time_last_update_unix`. Rates are kept compactly: the currency codes
+    as one comma-separated string and the values as a packed array of
+    doubles, so loading the latest snapshot takes a single row read.
+    
+    A new process can start from the latest stored snapshot instead of
+    waiting on the network, and keep serving it while the API is unreachable.
+    """
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        """
+        Initialize the store, creating the database file if needed.
+        
+        Args:
+            path (str): Path of the SQLite database file.
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_snapshots (
+                    time_last_update_unix INTEGER PRIMARY KEY,
+                    base_code TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    codes TEXT NOT NULL,
+                    rates BLOB NOT NULL,
+                    metadata TEXT NOT NULL
+                )
+            """)
+    
+    @contextmanager
+    def _connect(self):
+        """
+        Open a connection for one transaction and close it afterwards.
+        
+        A connection per call lets the store be used from any thread
+        (e.g. the background rate refresher).
+        """
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def save(self, data, fetched_at=None):
+        """
+        Store one API payload. Saving the same payload again only updates
+        its `fetched_at` time.
+        
+        Args:
+            data (dict): Raw API response with 'rates' and 'time_last_update_unix'.
+            fetched_at (float): Unix time the payload was fetched or revalidated.
+        
+        Returns:
+            bool: True if the payload was stored.
+        """
+        key = data.get("time_last_update_unix")
+        rates = data.get("rates")
+        if key is None or not rates:
+            return False
+        
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        codes = list(rates.keys())
+        values = array("d", (float(rates[code]) for code in codes))
+        metadata = {k: v for k, v in data.items() if k != "rates"}
+        
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        int(key),
+                        data.get("base_code", "Unknown"),
+                        fetched_at,
+                        ",".join(codes),
+                        values.tobytes(),
+                        json.dumps(metadata)
+                    )
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving rate snapshot: {e}", file=sys.stderr)
+            return False
+    
+    def _row_to_payload(self, row):
+        """Rebuild the API payload from a stored row."""
+        _, _, fetched_at, codes, blob, metadata = row
+        values = array("d")
+        values.frombytes(blob)
+        
+        data = json.loads(metadata)
+        data["rates"] = dict(zip(codes.split(","), values))
+        return data, fetched_at
+    
+    def load_latest(self):
+        """
+        Load the most recent stored snapshot.
+        
+        Returns:
+            tuple: (payload dict, fetched_at) or (None, None) if the store is empty.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT * FROM rate_snapshots ORDER BY time_last_update_unix DESC LIMIT 1"
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error loading rate snapshot: {e}", file=sys.stderr)
+            return None, None
+        
+        if row is None:
+            return None, None
+        return self._row_to_payload(row)
+    
+    def iter_snapshots(self, start=None, end=None):
+        """
+        Iterate over stored snapshots in time order.
+        
+        Args:
+            start (int): Earliest `time_last_update_unix` to include (optional).
+            end (int): Latest `time_last_update_unix` to include (optional).
+        
+        Yields:
+            tuple: (payload dict, fetched_at) for each stored snapshot.
+        """
+        query = "SELECT * FROM rate_snapshots WHERE time_last_update_unix BETWEEN ? AND ? ORDER BY time_last_update_unix"
+        bounds = (start if start is not None else -2**63, end if end is not None else 2**63 - 1)
+        with self._connect() as conn:
+            for row in conn.execute(query, bounds):
+                yield self._row_to_payload(row)
+    
+    def count(self):
+        """
+        Get the number of stored snapshots.
+        
+        Returns:
+            int: Number of snapshots in the store.
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rate_snapshots").fetchone()[0]
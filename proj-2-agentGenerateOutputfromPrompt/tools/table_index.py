@@ -0,0 +1,80 @@
+"""
+In-memory table with a hash index on every column.
+
+The country APIs used to answer `?column=...&value=...` by scanning every
+row of their CSV on each request. The data only changes when the CSV
+does, so the rows are now grouped once at load time: each column maps
+every value to the list of records holding it, and a lookup is one dict
+access per requested value, independent of the table size.
+"""
+
+import csv
+
+
+class IndexedTable:
+    """
+    Rows of a CSV file plus a value -> records index per column.
+    
+    The records are shared between `rows` and the indexes and must be
+    treated as read-only.
+    """
+    def __init__(self, columns, rows):
+        """
+        Build the indexes.
+        
+        Args:
+            columns (list): Column names, in file order.
+            rows (list): One dict per row, keyed by column name.
+        """
+        self.columns = list(columns)
+        self.rows = rows
+        self.indexes = {column: {} for column in self.columns}
+        for row in rows:
+            for column, index in self.indexes.items():
+                index.setdefault(row[column], []).append(row)
+    
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Load a CSV file (header row first) and index it.
+        
+        Args:
+            path (str): Path of the CSV file.
+        
+        Returns:
+            IndexedTable: The loaded table.
+        """
+        # Plain csv module: pandas takes far longer to import than these
+        # files take to read
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            rows = []
+            for row in reader:
+                # DictReader files extra fields under None and fills missing ones with None
+                if None in row or None in row.values():
+                    raise ValueError(f"{path} line {reader.line_num}: expected {len(reader.fieldnames)} fields")
+                rows.append(row)
+            return cls(reader.fieldnames or [], rows)
+    
+    def has_column(self, column):
+        """Return True if the table has this column."""
+        return column in self.indexes
+    
+    def lookup(self, column, values):
+        """
+        Get the records whose `column` equals any of `values`.
+        
+        Args:
+            column (str): Column to match (must exist, see has_column()).
+            values (list): Values to match; duplicates are ignored.
+        
+        Returns:
+            list: Matching records, grouped by value in the order given.
+        """
+        index = self.indexes[column]
+        if len(values) == 1:
+            return index.get(values[0], [])
+        matches = []
+        for value in dict.fromkeys(values):
+            matches.extend(index.get(value, ()))
+        return matches
@@ -0,0 +1,225 @@
+"""
+Hot reload of the country API tables when their CSV file changes.
+
+A TableSource owns the current IndexedTable of one CSV file (see
+tools/embedded_data.py), or what a prepare step builds from it, such as
+the encoded replies the APIs serve (api/prepared_responses.py). If the
+CSV has been compiled (`python -m tools.columnar`), the compiled file is memory-mapped instead
+of parsing the CSV. A watcher thread polls the file's modification
+time and size; when they change, a complete new table is built off to the
+side and published by replacing a single reference. Requests read that
+reference once and use only what they got, so they see either the old
+table or the new one, never a half-built mix, and are never blocked by a
+reload. A file that fails to load (e.g. caught mid-write) leaves the
+current table in place and is retried on the next change.
+
+Settings come from environment variables:
+- DATA_RELOAD_INTERVAL: seconds between file checks (default 2, 0 turns watching off)
+- DATA_FORMAT: 'auto' (default: the compiled file when it is at least as
+  new as the CSV, else the CSV), 'csv' or 'columnar'
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from tools.columnar import MappedTable, columnar_path
+from tools.table_index import IndexedTable
+
+RELOAD_INTERVAL = float(os.environ.get("DATA_RELOAD_INTERVAL", 2))
+DATA_FORMAT = os.environ.get("DATA_FORMAT", "auto").strip().lower()
+DATA_FORMATS = ("auto", "csv", "columnar")
+
+
+class TableSource:
+    """
+    The current table of a CSV file, rebuilt when the file changes.
+    """
+    def __init__(self, path, prepare=None, data_format=None):
+        """
+        Load the file (errors are raised, there is nothing to serve yet).
+        
+        Args:
+            path (str): Path of the CSV file.
+            prepare (callable): Called with (table, data_format) after each
+                                load; its result is published instead of the
+                                table (e.g. api.prepared_responses.prepare_table).
+                                None publishes the IndexedTable/MappedTable alone.
+            data_format (str): 'auto', 'csv' or 'columnar' (default DATA_FORMAT).
+        """
+        data_format = (data_format or DATA_FORMAT).lower()
+        if data_format not in DATA_FORMATS:
+            raise ValueError(f"Unknown data format '{data_format}' (expected one of: {', '.join(DATA_FORMATS)})")
+        self.path = path
+        self.columnar_path = columnar_path(path)
+        self.prepare = prepare
+        self.data_format = data_format
+        self.loaded_format = None
+        self.current = None
+        self.version = 0
+        self.loaded_at = None
+        self.reload_seconds = None
+        self.reload_count = 0
+        self.failure_count = 0
+        self.last_error = None
+        self._signature = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self.reload(raise_errors=True)
+    
+    @staticmethod
+    def _stat(path):
+        """(modification time, size) of a file, None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _file_signature(self):
+        """Signatures of the CSV and (unless the format is 'csv') the compiled file."""
+        if self.data_format == "csv":
+            return (self._stat(self.path), None)
+        return (self._stat(self.path), self._stat(self.columnar_path))
+    
+    def _pick_format(self, signature):
+        """Format to load: 'csv' or 'columnar'."""
+        if self.data_format != "auto":
+            return self.data_format
+        csv_stat, columnar_stat = signature
+        # A compiled file older than the CSV is stale: serve the edited CSV
+        if columnar_stat is not None and (csv_stat is None or columnar_stat[0] >= csv_stat[0]):
+            return "columnar"
+        return "csv"
+    
+    def changed(self):
+        """Return True if the file changed since it was last loaded."""
+        signature = self._file_signature()
+        return any(signature) and signature != self._signature
+    
+    def reload(self, raise_errors=False):
+        """
+        Build a new table from the file and publish it.
+        
+        Args:
+            raise_errors (bool): Raise load errors instead of recording them.
+        
+        Returns:
+            bool: True if a new table was published.
+        """
+        with self._reload_lock:
+            # Taken before reading: if the file changes while it is read,
+            # the next check sees a new signature and loads it again
+            signature = self._file_signature()
+            data_format = self._pick_format(signature)
+            started = time.perf_counter()
+            try:
+                if data_format == "columnar":
+                    # Mapped, not read: pages are shared with other processes
+                    table = MappedTable(self.columnar_path)
+                else:
+                    table = IndexedTable.from_csv(self.path)
+                if not table.columns:
+                    raise ValueError(f"{self.path} has no header row")
+                if self.prepare is not None:
+                    table = self.prepare(table, data_format)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                self.failure_count += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._signature = signature
+                return False
+            
+            # One reference swap; requests hold on to whichever table they read
+            self.current = table
+            self.loaded_format = data_format
+            self.version += 1
+            self.loaded_at = time.time()
+            self.reload_seconds = time.perf_counter() - started
+            self.reload_count += 1
+            self.last_error = None
+            self._signature = signature
+            return True
+    
+    def start_watching(self, interval=None):
+        """
+        Start a daemon thread that reloads the table when the file changes.
+        
+        Args:
+            interval (float): Seconds between checks (default DATA_RELOAD_INTERVAL; 0 or less: no watching).
+        
+        Returns:
+            TableWatcher: The running watcher, or None if watching is off.
+        """
+        interval = RELOAD_INTERVAL if interval is None else interval
+        if interval <= 0:
+            return None
+        if self._watcher is None or not self._watcher.is_alive():
+            self._watcher = TableWatcher(self, interval)
+            self._watcher.start()
+        return self._watcher
+    
+    def stop_watching(self):
+        """Stop the watcher thread, if running."""
+        watcher = self._watcher
+        self._watcher = None
+        if watcher is not None:
+            watcher.stop()
+    
+    def get_status(self):
+        """
+        Get the loaded version and reload statistics.
+        
+        Returns:
+            dict: Version, row count, load time and duration, reload and
+                  failure counts, last error and whether the file is watched.
+        """
+        current = self.current
+        table = current.table if self.prepare is not None else current
+        watcher = self._watcher
+        return {
+            "file": os.path.basename(self.columnar_path if self.loaded_format == "columnar" else self.path),
+            "format": self.loaded_format,
+            "version": self.version,
+            "rows": len(table.rows),
+            "columns": table.columns,
+            "etag": current.full.etag if self.prepare is not None else None,
+            "loaded_at": datetime.fromtimestamp(self.loaded_at, timezone.utc).isoformat(timespec="seconds"),
+            "reload_ms": round(self.reload_seconds * 1000, 3),
+            "reloads": self.reload_count,
+            "failures": self.failure_count,
+            "last_error": self.last_error,
+            "watching": watcher is not None and watcher.is_alive(),
+            "check_interval": watcher.interval if watcher is not None else None
+        }
+
+
+class TableWatcher(threading.Thread):
+    """
+    Background thread that reloads a TableSource when its file changes.
+    """
+    def __init__(self, source, interval):
+        """
+        Initialize the watcher.
+        
+        Args:
+            source (TableSource): Table to keep in sync with its file.
+            interval (float): Seconds between file checks.
+        """
+        super().__init__(name=f"table-watcher-{os.path.basename(source.path)}", daemon=True)
+        self.source = source
+        self.interval = interval
+        self._stop_event = threading.Event()
+    
+    def stop(self):
+        """Stop the watcher and wait briefly for it to exit."""
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=1)
+    
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            if self.source.changed():
+                self.source.reload()